@@ -1,5 +1,10 @@
+import argparse
 import itertools
-from dataclasses import dataclass, field
+import json
+import multiprocessing
+import sys
+from functools import lru_cache, partial
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional
 from copy import deepcopy
 
@@ -15,6 +20,8 @@ class WorldState:
     claims: Dict[str, dict] = field(default_factory=dict)
     good_role_options: Dict[str, List[str]] = field(default_factory=dict)
     red_herring: Optional[str] = None
+    # Number of identical worlds this one stands for after deduplication.
+    multiplicity: float = 1.0
 
 
 
@@ -60,6 +67,30 @@ def _must_be_in(world: WorldState, player: str, roles: List[str]) -> bool:
         return opts and all(o in roles for o in opts)
     return False
 
+@lru_cache(maxsize=32)
+def world_skeletons(players: tuple, all_minion_roles: tuple, m_minions: int) -> tuple:
+    """Return every evil-team placement for ``players``, independent of claims.
+
+    Each skeleton is ``(minion_dict, imp_player, evil, has_baron,
+    trustworthy)``. They depend only on the player list and minion setup, so
+    they are cached and shared between every deduction over the same table.
+    """
+    skeletons = []
+    for minion_role_combo in itertools.combinations(all_minion_roles, m_minions):
+        has_baron = "Baron" in minion_role_combo
+        for minion_players in itertools.combinations(players, m_minions):
+            for minion_role_perm in itertools.permutations(minion_role_combo):
+                minion_dict = dict(zip(minion_players, minion_role_perm))
+                non_minions = [p for p in players if p not in minion_players]
+                for imp_player in non_minions:
+                    evil = frozenset(minion_players) | {imp_player}
+                    trustworthy = tuple(p for p in players if p not in evil)
+                    skeletons.append(
+                        (minion_dict, imp_player, evil, has_baron, trustworthy)
+                    )
+    return tuple(skeletons)
+
+
 def generate_all_worlds(
     player_names, all_minion_roles, m_minions, claims, TB_ROLES, outsider_count, deaths=None, pov_player=None
 ):
@@ -80,82 +111,75 @@ def generate_all_worlds(
         p1: c["roles"] for p1, c in claims.items() if "roles" in c
     }
 
-    for minion_role_combo in itertools.combinations(all_minion_roles, m_minions):
-        minion_role_combo_set = set(minion_role_combo)
-        for minion_players in itertools.combinations(players, m_minions):
-            for minion_role_perm in itertools.permutations(minion_role_combo):
-                minion_dict = dict(zip(minion_players, minion_role_perm))
-                non_minions = [p for p in players if p not in minion_players]
-                for imp_player in non_minions:
-                    evil = set(minion_players) | {imp_player}
-                    if pov_player and pov_player in evil:
-                        continue
-                    trustworthy = [p for p in players if p not in evil]
-                    num_trustworthy_outsiders = sum(
-                        1 for p in trustworthy
-                        if claims.get(p, {}).get("role") in TB_ROLES["Outsider"]
-                    )
-                    
-                    if num_trustworthy_outsiders > outsider_count:
-                        if "Baron" not in minion_role_combo_set:
-                            continue  # Skip worlds without Baron
+    skeletons = world_skeletons(tuple(players), tuple(all_minion_roles), m_minions)
+    for minion_dict, imp_player, evil, has_baron, trustworthy in skeletons:
+        if pov_player and pov_player in evil:
+            continue
+        num_trustworthy_outsiders = sum(
+            1 for p in trustworthy
+            if claims.get(p, {}).get("role") in TB_ROLES["Outsider"]
+        )
+        
+        if num_trustworthy_outsiders > outsider_count:
+            if not has_baron:
+                continue  # Skip worlds without Baron
+        else:
+            if has_baron:
+                continue # Skip worlds with Baron
+
+        if num_trustworthy_outsiders == outsider_count or num_trustworthy_outsiders == outsider_count + 2:
+            # No Drunk in evil
+            for drunk_player in [None]:  # No drunk, so no assignment
+                roles = {}
+                for p in players:
+                    if p in minion_dict:
+                        roles[p] = minion_dict[p]
+                    elif p == imp_player:
+                        roles[p] = "Imp"
                     else:
-                        if "Baron" in minion_role_combo_set:
-                            continue # Skip worlds with Baron
-
-                    if num_trustworthy_outsiders == outsider_count or num_trustworthy_outsiders == outsider_count + 2:
-                        # No Drunk in evil
-                        for drunk_player in [None]:  # No drunk, so no assignment
-                            roles = {}
-                            for p in players:
-                                if p in minion_dict:
-                                    roles[p] = minion_dict[p]
-                                elif p == imp_player:
-                                    roles[p] = "Imp"
-                                else:
-                                    role = claims.get(p, {}).get("role")
-                                    if role:
-                                        roles[p] = role
-                                    else:
-                                        roles[p] = "Good"
-                            worlds.append(
-                                WorldState(
-                                    roles=roles,
-                                    claims=parsed_claims,
-                                    good_role_options=good_role_options_cache,
-                                    deaths=list(deaths)
-                                )
-                            )
+                        role = claims.get(p, {}).get("role")
+                        if role:
+                            roles[p] = role
+                        else:
+                            roles[p] = "Good"
+                worlds.append(
+                    WorldState(
+                        roles=roles,
+                        claims=parsed_claims,
+                        good_role_options=good_role_options_cache,
+                        deaths=list(deaths)
+                    )
+                )
+        else:
+            # Outsider count doesn't match: must "remove" a trustworthy to allow Drunk as evil
+            for drunk_player in trustworthy:
+                # Only assign Drunk to someone who is not already claiming outsider
+                if claims.get(drunk_player, {}).get("role") in TB_ROLES["Outsider"]:
+                    continue
+                roles = {}
+                for p in players:
+                    if p in minion_dict:
+                        roles[p] = minion_dict[p]
+                    elif p == imp_player:
+                        roles[p] = "Imp"
+                    elif p == drunk_player:
+                        roles[p] = "Drunk"
                     else:
-                        # Outsider count doesn't match: must "remove" a trustworthy to allow Drunk as evil
-                        for drunk_player in trustworthy:
-                            # Only assign Drunk to someone who is not already claiming outsider
-                            if claims.get(drunk_player, {}).get("role") in TB_ROLES["Outsider"]:
-                                continue
-                            roles = {}
-                            for p in players:
-                                if p in minion_dict:
-                                    roles[p] = minion_dict[p]
-                                elif p == imp_player:
-                                    roles[p] = "Imp"
-                                elif p == drunk_player:
-                                    roles[p] = "Drunk"
-                                else:
-                                    role = claims.get(p, {}).get("role")
-                                    if role:
-                                        roles[p] = role
-                                    else:
-                                        roles[p] = "Good"
-                                
-                            if len(roles) == n:
-                                worlds.append(
-                                    WorldState(
-                                        roles=roles,
-                                        claims=parsed_claims,
-                                        good_role_options=good_role_options_cache,
-                                        deaths=list(deaths)
-                                    )
-                                )
+                        role = claims.get(p, {}).get("role")
+                        if role:
+                            roles[p] = role
+                        else:
+                            roles[p] = "Good"
+                    
+                if len(roles) == n:
+                    worlds.append(
+                        WorldState(
+                            roles=roles,
+                            claims=parsed_claims,
+                            good_role_options=good_role_options_cache,
+                            deaths=list(deaths)
+                        )
+                    )
     return worlds
 
 
@@ -200,11 +224,15 @@ def _max_night_from_world(world: WorldState) -> int:
 
 
 def _is_alive(world: WorldState, player: str, night: int) -> bool:
-    """Return True if player is alive at the start of the given night."""
+    """Return True if player is alive at the start of the given night.
+
+    A death record's ``night`` is the night the player died in, or the one
+    before the day they died on, so they are still alive that night.
+    """
     for d in world.deaths:
         if d.get("player") == player:
             d_n = d.get("night", 0)
-            if isinstance(d_n, int) and d_n <= night:
+            if isinstance(d_n, int) and d_n < night:
                 return False
     return True
 
@@ -249,13 +277,47 @@ def _branch_red_herring(world: WorldState, night: int, TB_ROLES) -> List[WorldSt
                     ):
                         candidates.add(cand)
     result = []
-    for cand in candidates:
+    for cand in sorted(candidates):
         w = deepcopy(world)
         w.red_herring = cand
         result.append(w)
     return result
 
 
+def world_key(world: WorldState) -> tuple:
+    """Return a canonical hashable key for the hypothesis ``world`` encodes.
+
+    Two worlds with the same key agree on every role, on the nights the
+    Poisoner was active and on the Fortune Teller red herring, so they are
+    interchangeable for all later deduction steps.
+    """
+    return (
+        tuple(sorted(world.roles.items())),
+        tuple(sorted(world.poison_nights)),
+        world.red_herring,
+    )
+
+
+def dedupe_worlds(worlds: List[WorldState]) -> List[WorldState]:
+    """Merge identical worlds, summing their multiplicities.
+
+    Branching on poison, red herrings and star-passes can reach the same
+    world along different paths. Merging keeps the world count bounded while
+    ``compute_role_probs`` still sees the same total weight.
+    """
+    merged: Dict[tuple, WorldState] = {}
+    for w in worlds:
+        key = world_key(w)
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = w
+        else:
+            merged[key] = replace(
+                existing, multiplicity=existing.multiplicity + w.multiplicity
+            )
+    return list(merged.values())
+
+
 def _alive_players(world: WorldState, night: int) -> List[str]:
     """Return list of players alive at the start of the given night."""
     return [p for p in world.roles if _is_alive(world, p, night)]
@@ -313,7 +375,7 @@ def _demon_alive(world: WorldState, night: int) -> bool:
 
 
 def _handle_imp_day(world: WorldState, night: int, TB_ROLES) -> List[WorldState]:
-    alive_before = len(_alive_players(world, night)) + 1
+    alive_before = len(_alive_players(world, night + 1)) + 1
     sw_candidates = [p for p, r in world.roles.items() if r == "Scarlet Woman" and _is_alive(world, p, night)]
     if sw_candidates and alive_before >= 5:
         w = deepcopy(world)
@@ -340,6 +402,11 @@ def _handle_imp_night(world: WorldState, night: int, TB_ROLES) -> List[WorldStat
 
 
 def _apply_imp_death(world: WorldState, night: int, TB_ROLES) -> List[WorldState]:
+    """Pass the demon on for every recorded death of a certain Imp on ``night``.
+
+    Worlds where nobody can take over are dropped, unless the death is
+    marked ``ended``: the game stopped there, so the demon stays dead.
+    """
     worlds = [world]
     for d in world.deaths:
         if d.get("night") != night:
@@ -354,20 +421,21 @@ def _apply_imp_death(world: WorldState, night: int, TB_ROLES) -> List[WorldState
                 branch = _handle_imp_day(w, night, TB_ROLES)
             else:
                 branch = _handle_imp_night(w, night, TB_ROLES)
-            for nb in branch:
-                if _demon_alive(nb, night):
-                    next_worlds.append(nb)
+            survivors = [nb for nb in branch if _demon_alive(nb, night + 1)]
+            if not survivors and d.get("ended"):
+                survivors = [w]
+            next_worlds.extend(survivors)
         worlds = next_worlds
     return worlds
 
 def process_soldier(world: WorldState, night: int, TB_ROLES) -> bool:
-    """Return True if the Soldier is recorded as dying at night."""
+    """Return False if a Soldier is recorded as dying at night."""
     for d in world.deaths:
         if d.get("night") == night and d.get("time", "night") == "night":
             player = d.get("player")
-            if player and _could_be_role(world, player, "Soldier"):
-                return True
-    return False
+            if player and _must_be_role(world, player, "Soldier"):
+                return False
+    return True
 
 
 
@@ -567,7 +635,7 @@ ROLE_STEPS = [
     process_soldier
 ]
 
-def deduction_step(worlds, step_fn, night, TB_ROLES):
+def deduction_step(worlds, step_fn, night, TB_ROLES, dedupe=False):
     """Apply a single deduction step to ``worlds``.
 
     Parameters
@@ -580,6 +648,8 @@ def deduction_step(worlds, step_fn, night, TB_ROLES):
         Night number to evaluate the step for.
     TB_ROLES : dict
         Trouble Brewing role dictionary used for branching logic.
+    dedupe : bool
+        Merge identical worlds produced by branching (see ``dedupe_worlds``).
 
     Returns
     -------
@@ -591,39 +661,45 @@ def deduction_step(worlds, step_fn, night, TB_ROLES):
         return []
 
     next_worlds = []
+    branched = False
     for w in worlds:
         if step_fn(w, night, TB_ROLES):
             next_worlds.append(w)
         else:
+            branched = True
             if step_fn is process_fortune_teller:
                 next_worlds.extend(_branch_red_herring(w, night, TB_ROLES))
             next_worlds.extend(_branch_poison(w, night))
-    return next_worlds    
+    if dedupe and branched:
+        next_worlds = dedupe_worlds(next_worlds)
+    return next_worlds
+
+def deduction_pipeline(worlds, TB_ROLES, dedupe=False):
+    """Apply deduction role by role, night by night.
 
-def deduction_pipeline(worlds, TB_ROLES):
-    """Apply deduction role by role, night by night."""
+    With ``dedupe`` set, identical worlds are merged after every branching
+    step so long games do not multiply equivalent hypotheses.
+    """
     if not worlds:
         return []
     max_night = max(_max_night_from_world(w) for w in worlds)
     current = worlds
     for night in range(1, max_night + 1):
         for step in ROLE_STEPS:
-            next_worlds = []
-            for w in current:
-                if step(w, night, TB_ROLES):
-                    next_worlds.append(w)
-                else:
-                    if step is process_fortune_teller:
-                        next_worlds.extend(_branch_red_herring(w, night, TB_ROLES))
-                    next_worlds.extend(_branch_poison(w, night))
-            current = next_worlds
+            current = deduction_step(current, step, night, TB_ROLES, dedupe=dedupe)
             if not current:
                 break
         if current:
             updated = []
+            branched = False
             for w in current:
-                updated.extend(_apply_imp_death(w, night, TB_ROLES))
+                branch = _apply_imp_death(w, night, TB_ROLES)
+                if len(branch) != 1 or branch[0] is not w:
+                    branched = True
+                updated.extend(branch)
             current = updated
+            if dedupe and branched:
+                current = dedupe_worlds(current)
         if not current:
             break
     return current
@@ -662,7 +738,7 @@ def compute_role_probs(worlds, all_players, TB_ROLES):
     total = 0.0
 
     for w in worlds:
-        weight = _world_weight(w, TB_ROLES)
+        weight = _world_weight(w, TB_ROLES) * w.multiplicity
         if weight == 0:
             continue
         total += weight
@@ -681,6 +757,118 @@ def compute_role_probs(worlds, all_players, TB_ROLES):
     return evil_probs, imp_probs
 
 
+# Multi-POV deduction ---------------------------------------------------------
+
+def pov_worlds(
+    generated,
+    deduced,
+    player_names,
+    all_minion_roles,
+    m_minions,
+    claims,
+    TB_ROLES,
+    outsider_count,
+    pov,
+    pov_claim=None,
+    deaths=None,
+):
+    """Return the worlds consistent with ``pov``'s knowledge.
+
+    ``generated`` and ``deduced`` are the public world set before and after
+    ``deduction_pipeline`` for ``claims`` (no point of view). ``pov_claim`` is
+    what ``pov`` privately knows about themself.
+
+    * No private claim, or one equal to the public claim: filter ``deduced``
+      to the worlds where ``pov`` is good. No new deduction is run.
+    * Same claimed role with extra info: reuse ``generated`` with ``pov``'s
+      claim swapped in and rerun only the pipeline.
+    * A different role: regenerate with the claim overlaid. Evil-team
+      placements still come from the shared ``world_skeletons`` cache.
+    """
+    evil_roles = set(TB_ROLES.get("Minion", []) + TB_ROLES.get("Demon", []))
+    public_claim = claims.get(pov)
+    if pov_claim is None or pov_claim == public_claim:
+        return [w for w in deduced if w.roles.get(pov) not in evil_roles]
+
+    if pov_claim.get("role") == (public_claim or {}).get("role"):
+        parsed = dict(generated[0].claims) if generated else {}
+        parsed.pop(pov, None)
+        info = construct_info_claim_dict(pov, pov_claim)
+        if info:
+            parsed[pov] = info
+        options = dict(generated[0].good_role_options) if generated else {}
+        options.pop(pov, None)
+        if "roles" in pov_claim:
+            options[pov] = pov_claim["roles"]
+        worlds = [
+            replace(w, claims=parsed, good_role_options=options)
+            for w in generated
+            if w.roles.get(pov) not in evil_roles
+        ]
+        return deduction_pipeline(worlds, TB_ROLES, dedupe=True)
+
+    overlaid = dict(claims)
+    overlaid[pov] = pov_claim
+    worlds = generate_all_worlds(
+        player_names,
+        all_minion_roles,
+        m_minions,
+        overlaid,
+        TB_ROLES,
+        outsider_count,
+        deaths=deaths,
+        pov_player=pov,
+    )
+    return deduction_pipeline(worlds, TB_ROLES, dedupe=True)
+
+
+def deduce_for_povs(
+    player_names,
+    all_minion_roles,
+    m_minions,
+    claims,
+    TB_ROLES,
+    outsider_count,
+    povs,
+    deaths=None,
+):
+    """Return ``{pov: (evil_prob, imp_prob)}`` for several points of view.
+
+    ``povs`` is a list of ``(pov, pov_claim)`` pairs, ``pov_claim`` being that
+    player's private claim overlay or ``None``. The public world set is
+    enumerated and deduced once and every POV is answered from it (see
+    ``pov_worlds``), so the cost stays close to a single deduction when the
+    overlays match what players said publicly.
+    """
+    generated = generate_all_worlds(
+        player_names,
+        all_minion_roles,
+        m_minions,
+        claims,
+        TB_ROLES,
+        outsider_count,
+        deaths=deaths,
+    )
+    deduced = deduction_pipeline(generated, TB_ROLES, dedupe=True)
+    results = {}
+    for pov, pov_claim in povs:
+        worlds = pov_worlds(
+            generated,
+            deduced,
+            player_names,
+            all_minion_roles,
+            m_minions,
+            claims,
+            TB_ROLES,
+            outsider_count,
+            pov,
+            pov_claim,
+            deaths=deaths,
+        )
+        results[pov] = compute_role_probs(worlds, player_names, TB_ROLES)
+    return results
+
+
 def deduce_game(game, pov_player=None):
     """Run deduction on a ``Game`` instance from ``game.py``.
 
@@ -690,14 +878,7 @@ def deduce_game(game, pov_player=None):
     TB_ROLES = {a.value if hasattr(a, "value") else a: roles for a, roles in game.TROUBLE_BREWING_ROLES.items()}
     player_names = [p.name for p in game.players]
     all_minion_roles = TB_ROLES["Minion"]
-    num_players = len(game.players)
-    outsider_count = (num_players - 1) % 3
-    if num_players <= 9:
-        m_minions = 1
-    elif num_players <= 12:
-        m_minions = 2
-    else:
-        m_minions = 3
+    m_minions, outsider_count = default_role_counts(len(game.players))
     claims = {p.name: p.claim for p in game.players if getattr(p, "claim", None)}
     worlds = generate_all_worlds(
         player_names,
@@ -709,11 +890,196 @@ def deduce_game(game, pov_player=None):
         deaths=[],
         pov_player=pov_player,
     )
-    deduced = deduction_pipeline(worlds, TB_ROLES)
+    deduced = deduction_pipeline(worlds, TB_ROLES, dedupe=True)
     evil_prob, imp_prob = compute_role_probs(deduced, player_names, TB_ROLES)
     return evil_prob, imp_prob
 
-if __name__ == "__main__":
+
+# Batch evaluation -----------------------------------------------------------
+
+DEFAULT_TB_ROLES = {
+    "Townsfolk": [
+        "Chef",
+        "Washerwoman",
+        "Slayer",
+        "Fortune Teller",
+        "Undertaker",
+        "Ravenkeeper",
+        "Librarian",
+        "Investigator",
+        "Monk",
+        "Virgin",
+        "Empath",
+        "Soldier",
+        "Mayor",
+    ],
+    "Outsider": ["Drunk", "Recluse", "Saint", "Butler"],
+    "Minion": ["Poisoner", "Scarlet Woman", "Baron", "Spy"],
+    "Demon": ["Imp"],
+}
+
+
+def default_role_counts(num_players: int) -> tuple:
+    """Return ``(minion_count, outsider_count)`` for a table of this size."""
+    outsider_count = (num_players - 1) % 3
+    if num_players <= 9:
+        m_minions = 1
+    elif num_players <= 12:
+        m_minions = 2
+    else:
+        m_minions = 3
+    return m_minions, outsider_count
+
+
+def evaluate_scenario(scenario: dict, TB_ROLES=None) -> dict:
+    """Run deduction for a single recorded game state.
+
+    ``scenario`` holds ``players`` (ordered names) and optionally ``claims``,
+    ``deaths``, ``pov``, ``minions``, ``outsiders``, ``minion_roles`` and an
+    ``id`` echoed back in the result. Missing counts default to the standard
+    Trouble Brewing setup for the table size. A ``povs`` list (names, or
+    ``{"pov": name, "claim": {...}}`` objects) evaluates several points of
+    view from one shared enumeration instead of a single ``pov``.
+    """
+    TB_ROLES = TB_ROLES or DEFAULT_TB_ROLES
+    players = list(scenario["players"])
+    default_minions, default_outsiders = default_role_counts(len(players))
+    m_minions = scenario.get("minions", default_minions)
+    outsider_count = scenario.get("outsiders", default_outsiders)
+    minion_roles = scenario.get("minion_roles") or TB_ROLES["Minion"]
+
+    claims = scenario.get("claims") or {}
+    deaths = scenario.get("deaths") or []
+
+    if "povs" in scenario:
+        povs = [
+            (v, None) if isinstance(v, str) else (v["pov"], v.get("claim"))
+            for v in scenario["povs"]
+        ]
+        by_pov = deduce_for_povs(
+            players,
+            minion_roles,
+            m_minions,
+            claims,
+            TB_ROLES,
+            outsider_count,
+            povs,
+            deaths=deaths,
+        )
+        return {
+            "id": scenario.get("id"),
+            "povs": {
+                pov: {"evil": evil, "imp": imp}
+                for pov, (evil, imp) in by_pov.items()
+            },
+        }
+
+    worlds = generate_all_worlds(
+        players,
+        minion_roles,
+        m_minions,
+        claims,
+        TB_ROLES,
+        outsider_count,
+        deaths=deaths,
+        pov_player=scenario.get("pov"),
+    )
+    deduced = deduction_pipeline(worlds, TB_ROLES, dedupe=True)
+    evil_prob, imp_prob = compute_role_probs(deduced, players, TB_ROLES)
+    return {
+        "id": scenario.get("id"),
+        "worlds": len(deduced),
+        "evil": evil_prob,
+        "imp": imp_prob,
+    }
+
+
+def _evaluate_or_report(scenario, TB_ROLES=None) -> dict:
+    if "_parse_error" in scenario:
+        return {
+            "id": scenario["id"],
+            "line": scenario["line"],
+            "error": scenario["_parse_error"],
+        }
+    try:
+        return evaluate_scenario(scenario, TB_ROLES)
+    except Exception as e:  # keep streaming past a single malformed scenario
+        return {"id": scenario.get("id"), "error": f"{type(e).__name__}: {e}"}
+
+
+def evaluate_scenarios(scenarios, TB_ROLES=None, jobs=1, chunksize=16):
+    """Yield results for ``scenarios`` in input order.
+
+    World skeletons are cached per process (see ``world_skeletons``), so
+    scenarios over the same table only pay for enumeration once. With
+    ``jobs`` > 1 scenarios are spread across a process pool; keeping related
+    scenarios adjacent in the input lets each chunk reuse its worker's cache.
+    """
+    fn = partial(_evaluate_or_report, TB_ROLES=TB_ROLES)
+    if jobs <= 1:
+        yield from map(fn, scenarios)
+        return
+    with multiprocessing.Pool(jobs) as pool:
+        yield from pool.imap(fn, scenarios, chunksize=chunksize)
+
+
+def _read_scenarios(stream):
+    """Yield the scenario objects of a JSONL stream.
+
+    A line that is not a JSON object yields a placeholder instead, which
+    ``_evaluate_or_report`` turns into an error record for that line, so
+    the scenarios after it still run.
+    """
+    for idx, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            scenario = json.loads(line)
+        except ValueError as e:
+            yield {"id": idx, "line": idx + 1, "_parse_error": f"invalid JSON: {e}"}
+            continue
+        if not isinstance(scenario, dict):
+            kind = type(scenario).__name__
+            yield {"id": idx, "line": idx + 1, "_parse_error": f"expected an object, got {kind}"}
+            continue
+        scenario.setdefault("id", idx)
+        yield scenario
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="BOTC deduction engine")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="JSONL file of scenarios to evaluate ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--output", metavar="FILE", help="Write JSONL results here instead of stdout"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Number of worker processes"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.batch:
+        _demo()
+        return
+
+    src = sys.stdin if args.batch == "-" else open(args.batch)
+    dst = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in evaluate_scenarios(_read_scenarios(src), jobs=args.jobs):
+            dst.write(json.dumps(result) + "\n")
+            dst.flush()
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+
+def _demo():
     player_names = ["Alice", "Bob", "Carol", "Dave", "Eve", "Frank", "Gina", "Holly"]
     all_minion_roles = ["Poisoner", "Scarlet Woman", "Baron", "Spy"]
     m_minions = 1
@@ -795,26 +1161,7 @@ if __name__ == "__main__":
             # "died": False
         }
     }
-    TB_ROLES = {
-        "Townsfolk": [
-            "Chef",
-            "Washerwoman",
-            "Slayer",
-            "Fortune Teller",
-            "Undertaker",
-            "Ravenkeeper",
-            "Librarian",
-            "Investigator",
-            "Monk",
-            "Virgin",
-            "Empath",
-            "Soldier",
-            "Mayor",
-        ],
-        "Outsider": ["Drunk", "Recluse", "Saint", "Butler"],
-        "Minion": ["Poisoner", "Scarlet Woman", "Baron", "Spy"],
-        "Demon": ["Imp"],
-    }
+    TB_ROLES = DEFAULT_TB_ROLES
     outsider_count = 1
 
     # Add deaths here 
@@ -845,4 +1192,8 @@ if __name__ == "__main__":
     evil_prob, imp_prob = compute_role_probs(deduced, player_names, TB_ROLES)
     print("\nRole probabilities:")
     for p in player_names:
-        print(f"{p}: {evil_prob[p]:.1f}% evil, {imp_prob[p]:.1f}% Imp")
\ No newline at end of file
+        print(f"{p}: {evil_prob[p]:.1f}% evil, {imp_prob[p]:.1f}% Imp")
+
+
+if __name__ == "__main__":
+    main()
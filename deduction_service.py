@@ -0,0 +1,197 @@
+"""Game-wide deduction shared by every controller."""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from deduction_engine import (
+    generate_all_worlds,
+    deduction_pipeline,
+    compute_role_probs,
+    default_role_counts,
+    pov_worlds,
+)
+from game_events import ANNOUNCED_DEATH_KINDS, EventKind
+
+
+def death_records(events, names: Mapping[int, str]) -> List[dict]:
+    """Return the deaths everyone knows of in ``events`` as engine records.
+
+    ``events`` is an ``EventLog`` or a view's ``EventCursor``. Dawn deaths,
+    executions and Slayer kills count; night kills stay secret until dawn.
+    ``night`` is the night the death happened in, or the one before its
+    day.
+    """
+    deaths = events.deaths(kinds=ANNOUNCED_DEATH_KINDS)
+    for event in events.of_kind(EventKind.ABILITY):
+        if event.detail == ("Slayer", True):
+            known = deaths.get(event.target)
+            if known is None or event.index < known.index:
+                deaths[event.target] = event
+    return [
+        {
+            "player": names[seat],
+            "night": event.night,
+            "time": "night" if event.kind is EventKind.DEATH else "day",
+        }
+        for seat, event in sorted(deaths.items(), key=lambda item: item[1].index)
+    ]
+
+
+def freeze(value):
+    """Return a hashable snapshot of nested claim or memory structures."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class DeductionService:
+    """Deduction over a game's public information, shared by all controllers.
+
+    The public world set (every claim taken at face value, from nobody's
+    point of view) is built at most once between invalidations. Per-player
+    queries condition it on that player's point of view and private claim
+    through ``deduction_engine.pov_worlds``, which answers from the shared
+    enumeration whenever it can. ``Game`` invalidates the service on phase
+    changes, claims and deaths.
+    """
+
+    def __init__(self, game, TB_ROLES: Dict[str, list]):
+        self.game = game
+        self.TB_ROLES = TB_ROLES
+        self.version = 0
+        self._public = None
+        self._queries: Dict[tuple, tuple] = {}
+
+    def fork(self, game) -> "DeductionService":
+        """Return a service for a forked ``game`` that starts with our caches."""
+        new = DeductionService(game, self.TB_ROLES)
+        new.version = self.version
+        new._public = self._public
+        new._queries = dict(self._queries)
+        return new
+
+    def __getstate__(self):
+        # World sets are large and cheap to rebuild; don't ship them around
+        state = self.__dict__.copy()
+        state["_public"] = None
+        state["_queries"] = {}
+        return state
+
+    def invalidate(self) -> None:
+        """Drop every cached world set; the next query recomputes."""
+        self.version += 1
+        self._public = None
+        self._queries.clear()
+
+    # Internals -------------------------------------------------------------
+    def _player_names(self):
+        return [p.name for p in self.game.players]
+
+    def _deaths(self) -> List[dict]:
+        """Return every announced death in ``generate_all_worlds`` form."""
+        records = death_records(self.game.state.events, self.game.seat_names)
+        if records and self.game.is_over():
+            # The last death may have ended the game: no successor needed
+            records[-1]["ended"] = True
+        return records
+
+    def _claims(self) -> Dict[str, dict]:
+        """Return every player's visible claim keyed by name."""
+        visible = self.game.public_claims()
+        return {
+            p.name: dict(visible.get(p.seat, {}) or {}) for p in self.game.players
+        }
+
+    def _public_worlds(self) -> Tuple[Dict[str, dict], list, list, list]:
+        """Return ``(claims, deaths, generated, deduced)`` for the public world set."""
+        if self._public is None:
+            claims = self._claims()
+            deaths = self._deaths()
+            m_minions, outsider_count = default_role_counts(len(self.game.players))
+            generated = generate_all_worlds(
+                self._player_names(),
+                self.TB_ROLES["Minion"],
+                m_minions,
+                claims,
+                self.TB_ROLES,
+                outsider_count,
+                deaths=deaths,
+            )
+            deduced = deduction_pipeline(generated, self.TB_ROLES, dedupe=True)
+            self._public = (claims, deaths, generated, deduced)
+            if self.game.telemetry is not None:
+                self.game.telemetry.worlds.append(len(generated))
+        return self._public
+
+    # Queries ---------------------------------------------------------------
+    def worlds(self, pov: Optional[str] = None, pov_claim: Optional[dict] = None):
+        """Return the deduced worlds as seen by ``pov``.
+
+        ``pov_claim`` is the claim ``pov`` would make with full knowledge of
+        their own role and night info. Without a ``pov`` the public world set
+        is returned unfiltered.
+        """
+        return self.beliefs(pov, pov_claim)[0]
+
+    def role_probs(self, pov: Optional[str] = None, pov_claim: Optional[dict] = None):
+        """Return ``(evil_prob, imp_prob)`` as seen by ``pov``."""
+        _, evil_prob, imp_prob = self.beliefs(pov, pov_claim)
+        return evil_prob, imp_prob
+
+    def beliefs(self, pov: Optional[str] = None, pov_claim: Optional[dict] = None):
+        """Return ``(worlds, evil_prob, imp_prob)`` as seen by ``pov``."""
+        telemetry = self.game.telemetry
+        if telemetry is not None:
+            telemetry.deduction_calls += 1
+        key = (pov, freeze(pov_claim))
+        cached = self._queries.get(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        claims, deaths, generated, deduced = self._public_worlds()
+        if pov is None:
+            worlds = deduced
+        else:
+            player_names = self._player_names()
+            m_minions, outsider_count = default_role_counts(len(player_names))
+            worlds = pov_worlds(
+                generated,
+                deduced,
+                player_names,
+                self.TB_ROLES["Minion"],
+                m_minions,
+                claims,
+                self.TB_ROLES,
+                outsider_count,
+                pov,
+                pov_claim,
+                deaths=deaths,
+            )
+
+        evil_prob, imp_prob = compute_role_probs(
+            worlds, self._player_names(), self.TB_ROLES
+        )
+        result = (worlds, evil_prob, imp_prob)
+        self._queries[key] = result
+        if telemetry is not None:
+            telemetry.deduction_seconds += time.perf_counter() - start
+            telemetry.pov_worlds.append(len(worlds))
+        return result
+
+    def role_probs_by_pov(self, povs) -> Dict[str, tuple]:
+        """Return ``{pov: (evil_prob, imp_prob)}`` for several players at once.
+
+        ``povs`` holds player names or ``(name, pov_claim)`` pairs. Every
+        answer comes from the same shared enumeration, e.g. to see how
+        suspicious an evil player looks to each good player.
+        """
+        result = {}
+        for entry in povs:
+            pov, pov_claim = (entry, None) if isinstance(entry, str) else entry
+            result[pov] = self.role_probs(pov, pov_claim)
+        return result
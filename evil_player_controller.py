@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import random
 from typing import List, Tuple
 
 from deduction_engine import generate_all_worlds, deduction_pipeline, compute_role_probs
+from deduction_service import death_records
 from game import (
     PlayerController,
     Player,
@@ -11,6 +11,7 @@ from game import (
     Alignment,
     TROUBLE_BREWING_ROLES,
     player_role_counts,
+    log,
 )
 from role_data import INFO_ROLES
 
@@ -26,6 +27,11 @@ class EvilPlayerController(PlayerController):
     # Utility ---------------------------------------------------------------
     def _evil_imp_probs(self, player_view: PlayerView) -> Tuple[dict, dict]:
         """Run deduction without filtering by POV using ``PlayerView``."""
+        if player_view.deduction is not None:
+            try:
+                return player_view.deduction.role_probs()
+            except Exception:  # pragma: no cover - fallback for early bugs
+                log.exception("Deduction error")
         TB_ROLES = {
             a.value if hasattr(a, "value") else a: roles
             for a, roles in TROUBLE_BREWING_ROLES.items()
@@ -46,14 +52,14 @@ class EvilPlayerController(PlayerController):
                 claims,
                 TB_ROLES,
                 outsider_count,
-                deaths=[],
+                deaths=death_records(player_view.events, player_view.seat_names),
             )
-            deduced = deduction_pipeline(worlds, TB_ROLES)
+            deduced = deduction_pipeline(worlds, TB_ROLES, dedupe=True)
             evil_prob, imp_prob = compute_role_probs(
                 deduced, player_names, TB_ROLES
             )
-        except Exception as e:  # pragma: no cover - fallback for early bugs
-            print(f"Deduction error: {e}")
+        except Exception:  # pragma: no cover - fallback for early bugs
+            log.exception("Deduction error")
             evil_prob = {name: 0.0 for name in player_names}
             imp_prob = {name: 0.0 for name in player_names}
         return evil_prob, imp_prob
@@ -84,15 +90,15 @@ class EvilPlayerController(PlayerController):
 
         info_roles = INFO_ROLES
         if player_view.night == 1:
-            return random.choice(goods) if goods else None
+            return self.rng.choice(goods) if goods else None
         info_claimers = [
             p
             for p in goods
             if player_view.public_claims.get(p.seat, {}).get("role") in info_roles
         ]
         if info_claimers:
-            return random.choice(info_claimers)
-        return random.choice(goods) if goods else None
+            return self.rng.choice(info_claimers)
+        return self.rng.choice(goods) if goods else None
 
     def choose_imp_kill(self, candidates, player_view):
         alive_seats = set(player_view.alive_players)
@@ -127,11 +133,11 @@ class EvilPlayerController(PlayerController):
             if score < best_score:
                 best = t
                 best_score = score
-        return best if best else (random.choice(targets) if targets else None)
+        return best if best else (self.rng.choice(targets) if targets else None)
 
     def choose_master(self, candidates, player_view):
         others = [p for p in candidates if p != self.player]
-        return random.choice(others) if others else None
+        return self.rng.choice(others) if others else None
 
     # Bluffing -------------------------------------------------------------
     def _select_bluff(self, player_view):
@@ -150,7 +156,7 @@ class EvilPlayerController(PlayerController):
             info_avail = [b for b in available if b in info_roles]
             if info_avail:
                 available = info_avail
-        return random.choice(available)
+        return self.rng.choice(available)
 
     def _fake_info(self, bluff_role, player_view):
         demon_name = None
@@ -162,32 +168,32 @@ class EvilPlayerController(PlayerController):
         others = [name for seat, name in player_view.seat_names.items() if name != self.player.name]
         assignments = self.player.memory.get("bluff_plan", {})
         if bluff_role == "Investigator":
-            seen_role = random.choice(TROUBLE_BREWING_ROLES[Alignment.MINION])
-            players = random.sample(others, 2)
+            seen_role = self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.MINION])
+            players = self.rng.sample(others, 2)
             return {"seen_role": seen_role, "seen_players": players}
         if bluff_role == "Librarian":
             buddy_opts = [n for n in team if n != self.player.name]
             if buddy_opts:
-                buddy = random.choice(buddy_opts)
-                other = random.choice([n for n in others if n != buddy])
+                buddy = self.rng.choice(buddy_opts)
+                other = self.rng.choice([n for n in others if n != buddy])
                 role = assignments.get(buddy, "Drunk")
                 if role not in TROUBLE_BREWING_ROLES[Alignment.OUTSIDER]:
                     role = "Drunk"
                 players = [buddy, other]
             else:
                 role = "Drunk"
-                players = random.sample(others, 2)
+                players = self.rng.sample(others, 2)
             return {"seen_role": role, "seen_players": players}
         if bluff_role == "Washerwoman":
             buddy_opts = [n for n in team if n != self.player.name]
             if buddy_opts:
-                buddy = random.choice(buddy_opts)
-                other = random.choice([n for n in others if n != buddy])
-                role = assignments.get(buddy, random.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK]))
+                buddy = self.rng.choice(buddy_opts)
+                other = self.rng.choice([n for n in others if n != buddy])
+                role = assignments.get(buddy, self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK]))
                 players = [buddy, other]
             else:
-                role = random.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK])
-                players = random.sample(others, 2)
+                role = self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK])
+                players = self.rng.sample(others, 2)
             return {"seen_role": role, "seen_players": players}
         if bluff_role == "Chef":
             return {"pairs": 0}
@@ -215,8 +221,8 @@ class EvilPlayerController(PlayerController):
         if bluff_role == "Fortune Teller":
             buddy_opts = [n for n in team if n != self.player.name]
             if buddy_opts:
-                buddy = random.choice(buddy_opts)
-                other = random.choice([n for n in others if n != buddy])
+                buddy = self.rng.choice(buddy_opts)
+                other = self.rng.choice([n for n in others if n != buddy])
                 players = [buddy, other]
             else:
                 players = others[:2]
@@ -241,7 +247,7 @@ class EvilPlayerController(PlayerController):
                 msg["public_claim"] = self.player.claim
 
         plan = self.player.memory.get("bluff_plan", {})
-        confirmed = self.player.memory.setdefault("confirmed_teammates", [])
+        confirmed = list(self.player.memory.get("confirmed_teammates", []))
         confirmations = []
         for seat, name in player_view.seat_names.items():
             if name == self.player.name:
@@ -251,6 +257,7 @@ class EvilPlayerController(PlayerController):
             if claim and expected and claim.get("role") == expected and name not in confirmed:
                 confirmations.append({"player": name, "role": expected})
                 confirmed.append(name)
+        self.player.memory["confirmed_teammates"] = confirmed
         if confirmations:
             msg["confirm"] = confirmations
 
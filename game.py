@@ -2,30 +2,77 @@ from __future__ import annotations
 from enum import Enum, auto
 import random
 from dataclasses import dataclass, field
-import builtins
+import copy
+import functools
+import itertools
+import logging
+import sys
+import time
 from pprint import pformat
+from types import MappingProxyType
+from typing import Mapping
 
-# Toggle detailed debug logging
-DEBUG = False
+from deduction_service import DeductionService
+from game_events import Event, EventCursor, EventKind, EventLog
+from message_bus import Message, MessageBus
+from seat_state import SeatFlags, SeatState, count_seats, iter_seats
 
-__builtin_print = builtins.print
+# Game narration and storyteller debug output. Arguments are only formatted
+# when a record is emitted, so headless runs do no string building at all.
+# For detailed storyteller output call ``log.setLevel(logging.DEBUG)``.
+log = logging.getLogger("botc")
+
+
+class _StdoutHandler(logging.Handler):
+    """Write bare messages to whatever ``sys.stdout`` is at emit time."""
+
+    def emit(self, record):
+        sys.stdout.write(self.format(record) + "\n")
+
+
+if not log.handlers:
+    log.addHandler(_StdoutHandler())
+    log.propagate = False
+log.setLevel(logging.INFO)
+
+
+class lazy:
+    """Log argument whose text is only built if the record is emitted."""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
 
 
 def debug(msg: str) -> None:
-    if DEBUG:
-        __builtin_print(f"DEBUG: {msg}")
-
-def _filtered_print(*args, **kwargs):
-    if (
-        not DEBUG
-        and args
-        and isinstance(args[0], str)
-        and args[0].startswith("DEBUG")
-    ):
-        return
-    __builtin_print(*args, **kwargs)
+    log.debug("%s", msg)
+
+
+def derive_rng(seed, label: str):
+    """Return the random stream named ``label`` under the master ``seed``.
+
+    Each label gets an independent ``random.Random`` seeded from
+    ``"{seed}:{label}"``, so a game replays identically in any process.
+    With ``seed=None`` the module-level ``random`` is returned and unseeded
+    runs behave as before.
+    """
+    if seed is None:
+        return random
+    return random.Random(f"{seed}:{label}")
+
 
-print = _filtered_print
+def fork_rng(rng):
+    """Return an independent copy of ``rng`` that continues its sequence."""
+    if rng is random:
+        return random
+    clone = random.Random()
+    clone.setstate(rng.getstate())
+    return clone
 
 
 class Phase(Enum):
@@ -41,23 +88,252 @@ class Alignment(Enum):
     DEMON = "Demon"
 
 
-@dataclass
+class StaleViewError(RuntimeError):
+    """A ``PlayerView`` field was read after the game state it shows changed."""
+
+
+class PlayerMemory(dict):
+    """A player's private memory; ``version`` counts every write to it.
+
+    ``on_write``, when set, is called with the keys of each write after it
+    happened; ``Game`` uses it to push what players learn to controllers.
+    """
+
+    __slots__ = ("version", "on_write")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self.on_write = None
+
+    def _wrote(self, keys) -> None:
+        if self.on_write is not None:
+            self.on_write(keys)
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        super().__setitem__(key, value)
+        self._wrote((key,))
+
+    def __delitem__(self, key):
+        self.version += 1
+        super().__delitem__(key)
+        self._wrote((key,))
+
+    def update(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        self.version += 1
+        super().update(items)
+        self._wrote(tuple(items))
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        self.version += 1
+        value = super().pop(key)
+        self._wrote((key,))
+        return value
+
+    def popitem(self):
+        self.version += 1
+        item = super().popitem()
+        self._wrote((item[0],))
+        return item
+
+    def clear(self):
+        keys = tuple(self)
+        self.version += 1
+        super().clear()
+        self._wrote(keys)
+
+    def append(self, key, item) -> None:
+        """Append ``item`` to the list ``self[key]``, in place."""
+        self.version += 1
+        items = super().get(key)
+        if items is None:
+            super().__setitem__(key, [item])
+        else:
+            items.append(item)
+        self._wrote((key,))
+
+    def copy(self) -> "PlayerMemory":
+        """Return a copy whose list and dict values are copies too.
+
+        The copy has no ``on_write``; its game installs its own.
+        """
+        new = PlayerMemory(
+            (k, list(v) if isinstance(v, list) else dict(v) if isinstance(v, dict) else v)
+            for k, v in self.items()
+        )
+        new.version = self.version
+        return new
+
+    def __reduce__(self):
+        # Pickle rebuilds dict subclasses through ``__setitem__``, which
+        # needs ``version`` to exist first; ``Game`` restores ``on_write``
+        return (PlayerMemory, (dict(self),), self.version)
+
+    def __setstate__(self, version: int) -> None:
+        self.version = version
+        self.on_write = None
+
+
+class MemoryView(Mapping):
+    """Read-only view of a ``PlayerMemory`` as it was at one version.
+
+    Reading after the memory has been written raises ``StaleViewError``.
+    """
+
+    __slots__ = ("_memory", "_version")
+
+    def __init__(self, memory: PlayerMemory, version: int):
+        self._memory = memory
+        self._version = version
+
+    def _live(self) -> PlayerMemory:
+        if self._memory.version != self._version:
+            raise StaleViewError("player memory changed since the view was created")
+        return self._memory
+
+    def __getitem__(self, key):
+        return self._live()[key]
+
+    def __iter__(self):
+        return iter(self._live())
+
+    def __len__(self) -> int:
+        return len(self._live())
+
+    def __repr__(self) -> str:
+        return repr(dict(self._live()))
+
+
 class PlayerView:
-    player_seat: int
-    player_name: str
-    role_name: str
-    phase: Phase
-    day: int
-    night: int
-    role_claim: dict | None
-    is_alive: bool
-    public_claims: dict
-    seat_names: dict
-    alive_players: list
-    dead_players: list
-    memory: dict
-    history: list
-    votes: dict
+    """Read-only view of the game from one player's seat.
+
+    Cheap scalar fields are captured when the view is created. The rest are
+    built on first access from snapshots that ``Game`` shares between all
+    views until its state version changes, so creating a view is O(1).
+    ``events``, ``history`` and ``votes`` are cut at their length when the
+    view was created.
+
+    A view shows the game at one state version. Snapshot fields are pinned
+    when first read; reading one for the first time, or reading ``memory``,
+    after the state or the player's memory changed raises
+    ``StaleViewError`` instead of mixing old and new state. Controllers
+    should ask for a fresh view rather than keep one across game events.
+    """
+
+    __slots__ = (
+        "_game",
+        "_player",
+        "_version",
+        "_memory_version",
+        "_pinned",
+        "_events_len",
+        "_messages_len",
+        "_votes",
+        "_votes_len",
+        "player_seat",
+        "player_name",
+        "role_name",
+        "phase",
+        "day",
+        "night",
+        "role_claim",
+        "is_alive",
+        "deduction",
+    )
+
+    def __init__(self, game: Game, player: Player):
+        state = game.state
+        self._game = game
+        self._player = player
+        self._version = game.version
+        self._memory_version = player.memory.version
+        self._pinned = None
+        self._events_len = len(state.events)
+        self._messages_len = len(state.messages)
+        self._votes = state.votes
+        self._votes_len = len(state.votes)
+        self.player_seat = player.seat
+        self.player_name = player.name
+        self.role_name = (
+            player.role.name
+            if player.role.name != "Drunk"
+            else player.role.cover_role_name
+        )
+        self.phase = state.phase
+        self.day = state.day
+        self.night = state.night
+        self.role_claim = player.claim
+        self.is_alive = player.alive
+        self.deduction = game.deduction
+
+    def _snapshot(self, key: str):
+        """Return ``Game.view_snapshot(key)`` as of this view's version."""
+        pinned = self._pinned
+        if pinned is None:
+            pinned = self._pinned = {}
+        elif key in pinned:
+            return pinned[key]
+        if self._game.version != self._version:
+            raise StaleViewError(f"{key} changed since the view was created")
+        value = pinned[key] = self._game.view_snapshot(key)
+        return value
+
+    @property
+    def version(self) -> int:
+        """The ``Game.version`` this view was built at."""
+        return self._version
+
+    @property
+    def public_claims(self) -> Mapping[int, dict]:
+        return self._snapshot("public_claims")
+
+    @property
+    def seat_names(self) -> Mapping[int, str]:
+        return self._game.seat_names
+
+    @property
+    def alive_players(self) -> tuple:
+        return self._snapshot("alive_players")
+
+    @property
+    def dead_players(self) -> tuple:
+        return self._snapshot("dead_players")
+
+    @property
+    def memory(self) -> Mapping:
+        return MemoryView(self._player.memory, self._memory_version)
+
+    @property
+    def events(self) -> EventCursor:
+        return EventCursor(self._game.state.events, self._events_len)
+
+    @property
+    def history(self) -> list:
+        return self._game.state.events.history(self.seat_names, self._events_len)
+
+    @property
+    def messages(self) -> list[Message]:
+        """Messages this player had received when the view was built."""
+        return self._game.state.messages.inbox(self.player_seat, self._messages_len)
+
+    @property
+    def received_info(self) -> list[dict]:
+        names = self.seat_names
+        return [m.as_received(names) for m in self.messages]
+
+    @property
+    def votes(self) -> dict:
+        return dict(itertools.islice(self._votes.items(), self._votes_len))
 
     def __repr__(self) -> str:
         return (
@@ -84,6 +360,9 @@ def format_player_view(pv: PlayerView) -> str:
         lines.append("Public claims: " + pformat(claims))
     if pv.memory:
         lines.append("Your memory: " + pformat(pv.memory))
+    received = pv.received_info
+    if received:
+        lines.append("Received info: " + pformat(received))
     if pv.votes:
         lines.append("Votes: " + pformat(pv.votes))
     return "\n".join(lines)
@@ -97,6 +376,17 @@ class Role:
         self.name = name
         self.alignment = alignment
 
+    def clone(self, remap):
+        """Return an independent copy of this role for ``Game.fork``.
+
+        Per-role state such as ``Slayer.has_shot`` is copied; references to
+        players, other roles and the storyteller are translated by ``remap``.
+        """
+        new = copy.copy(self)
+        for key, value in vars(new).items():
+            setattr(new, key, remap(value))
+        return new
+
     def night_action(self, player, game):
         pass  # Override in child classes
 
@@ -178,15 +468,49 @@ def player_role_counts(num_players: int) -> tuple[int, int]:
         minions = 3
     return minions, outsider_count
 
-def random_trouble_brewing_setup(player_count: int, storyteller_ai: StorytellerAI) -> list[Role]:
+def trouble_brewing_setup_strata(player_count: int) -> list[tuple]:
+    """Return every ``(minions, outsiders, probability)`` a random setup can have.
+
+    ``probability`` is the chance that ``random_trouble_brewing_setup`` deals
+    exactly that combination of minions and outsiders.
+    """
+    minion_count, outsider_count = player_role_counts(player_count)
+    minion_sets = list(
+        itertools.combinations(TROUBLE_BREWING_ROLES[Alignment.MINION], minion_count)
+    )
+    strata = []
+    for minions in minion_sets:
+        count = outsider_count + (2 if "Baron" in minions else 0)
+        outsider_sets = list(
+            itertools.combinations(TROUBLE_BREWING_ROLES[Alignment.OUTSIDER], count)
+        )
+        for outsiders in outsider_sets:
+            probability = 1 / (len(minion_sets) * len(outsider_sets))
+            strata.append((minions, outsiders, probability))
+    return strata
+
+def random_trouble_brewing_setup(
+    player_count: int,
+    storyteller_ai: StorytellerAI,
+    rng=None,
+    minions=None,
+    outsiders=None,
+) -> list[Role]:
+    """Deal a random setup; ``minions`` and ``outsiders`` fix those roles."""
+    rng = random if rng is None else rng
     minion_count, outsider_count = player_role_counts(player_count)
 
-    minion_names = random.sample(TROUBLE_BREWING_ROLES[Alignment.MINION], k=minion_count)
+    if minions is None:
+        minion_names = rng.sample(TROUBLE_BREWING_ROLES[Alignment.MINION], k=minion_count)
+    else:
+        minion_names = list(minions)
 
     if "Baron" in minion_names:
         outsider_count += 2
+    if outsiders is not None:
+        outsider_count = len(outsiders)
 
-    demon_name = random.choice(TROUBLE_BREWING_ROLES[Alignment.DEMON])
+    demon_name = rng.choice(TROUBLE_BREWING_ROLES[Alignment.DEMON])
 
     townsfolk_count = player_count - outsider_count - minion_count - 1
 
@@ -198,20 +522,23 @@ def random_trouble_brewing_setup(player_count: int, storyteller_ai: StorytellerA
     roles.append(create_role(demon_name, storyteller_ai))
 
     outsider_pool = TROUBLE_BREWING_ROLES[Alignment.OUTSIDER][:]
-    outsider_choices = (
-        random.sample(outsider_pool, k=outsider_count)
-        if outsider_count > 0
-        else []
-    )
+    if outsiders is not None:
+        outsider_choices = list(outsiders)
+    else:
+        outsider_choices = (
+            rng.sample(outsider_pool, k=outsider_count)
+            if outsider_count > 0
+            else []
+        )
 
 
     townsfolk_pool = TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK][:]
-    townsfolk_choices = random.sample(townsfolk_pool, k=townsfolk_count)
+    townsfolk_choices = rng.sample(townsfolk_pool, k=townsfolk_count)
     roles.extend(create_role(t, storyteller_ai) for t in townsfolk_choices)
 
     for o in outsider_choices:
         if o == "Drunk":
-            cover = random.choice([role for role in TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK] if role not in townsfolk_choices])
+            cover = rng.choice([role for role in TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK] if role not in townsfolk_choices])
             roles.append(Drunk(storyteller_ai, cover_role_name=cover))
         else:
             roles.append(create_role(o, storyteller_ai))
@@ -221,12 +548,36 @@ def random_trouble_brewing_setup(player_count: int, storyteller_ai: StorytellerA
 from typing import cast
 
 class PlayerController:
+    # Replaced by a per-seat stream when the game has a seed
+    rng = random
+    # Controllers that set this receive ``on_phase_start(snapshot)`` with a
+    # ``Game.fork()`` taken before each night and day, e.g. to run rollouts.
+    wants_snapshots = False
+    # Controllers that set this answer a whole vote (``cast_votes``) or round
+    # of nominations (``choose_nominees``) in one call for every player whose
+    # controller shares their ``batch_group``.
+    supports_batch = False
+    # Controllers that set this receive ``on_event`` as things happen, from
+    # the first phase that starts after they are installed.
+    wants_events = False
+
     def __init__(self):
         self.player: Player = cast(Player, None)
 
     def set_player(self, player):
         self.player = player
 
+    def fork(self, player):
+        """Return a copy of this controller driving ``player`` in a forked game.
+
+        Controllers must not mutate state shared with the copy in place;
+        subclasses with mutable state override this.
+        """
+        new = copy.copy(self)
+        new.player = player
+        new.rng = fork_rng(self.rng)
+        return new
+
     def send_info(self, player, info):
         player.receive_info(self.player, info)
 
@@ -257,6 +608,35 @@ class PlayerController:
     def share_info(self, player_view: PlayerView, context=None):
         raise NotImplementedError
 
+    def on_phase_start(self, snapshot: "Game") -> None:
+        """Receive a fork of the game taken at the start of a phase."""
+
+    def on_game_over(self) -> None:
+        """Called when ``Game.run`` returns, e.g. to release worker pools."""
+
+    def on_event(self, update) -> None:
+        """Receive a game update as it happens.
+
+        ``update`` is a public ``Event`` (claims, deaths, nominations, votes,
+        abilities, phase changes), an ``EventKind.INFO`` event with the
+        memory this player just learned, or a ``Message`` addressed to this
+        player. Every update is also visible in later ``PlayerView``s, so
+        controllers only need it to keep their own state current.
+        """
+
+    # Batch protocol -------------------------------------------------------
+    def batch_group(self):
+        """Return the key of controllers that can be answered together."""
+        return type(self)
+
+    def choose_nominees(self, candidates: list, requests: list) -> list:
+        """Return a nomination for each ``(player, player_view)`` request."""
+        return [p.controller.choose_nominee(candidates, pv) for p, pv in requests]
+
+    def cast_votes(self, nominee: "Player", requests: list) -> list:
+        """Return a vote for each ``(player, player_view)`` request."""
+        return [p.controller.cast_vote(nominee, pv) for p, pv in requests]
+
 
 class HumanPlayerController(PlayerController):
     def choose_fortune_teller_targets(self, candidates, player_view):
@@ -344,11 +724,7 @@ class HumanPlayerController(PlayerController):
                 self.player.claim = claim
                 self._last_public = claim
                 return {"public_claim": self.player.claim}
-            info = {
-                k: v
-                for k, v in self.player.memory.items()
-                if k != "received_info"
-            }
+            info = dict(self.player.memory)
             if info and info != self._last_public:
                 self._last_public = info
                 return {"public": info}
@@ -366,32 +742,93 @@ class HumanPlayerController(PlayerController):
         return None
 
 
-@dataclass
 class Player:
-    """Represents a single player (seat)."""
-
-    seat: int
-    name: str
-    controller: PlayerController
-    # role is assigned after game setup; use a placeholder Role to avoid Optional checks
-    role: Role = field(init=False)
-    alive: bool = True
-    memory: dict = field(default_factory=dict)
-    claim: dict | None = None
-    votes_today: int = 0
-    has_used_dead_vote: bool = False
+    """Represents a single player (seat).
 
-    def __hash__(self) -> int:
-        return hash(self.seat)
+    ``alive`` and the role indexes are stored in the game's ``SeatState`` so
+    seat-wide checks never have to visit every ``Player``; a player built
+    outside a game gets a private one until the game adopts it.
+    """
 
-    def __post_init__(self) -> None:
+    __slots__ = (
+        "seat",
+        "name",
+        "controller",
+        "_role",
+        "memory",
+        "claim",
+        "votes_today",
+        "has_used_dead_vote",
+        "_seats",
+        "_messages",
+    )
+
+    def __init__(
+        self,
+        seat: int,
+        name: str,
+        controller: PlayerController,
+        alive: bool = True,
+        memory: dict | None = None,
+        claim: dict | None = None,
+        votes_today: int = 0,
+        has_used_dead_vote: bool = False,
+    ):
+        self.seat = seat
+        self.name = name
+        self.controller = controller
+        self.memory = PlayerMemory() if memory is None else PlayerMemory(memory)
+        self.claim = claim
+        self.votes_today = votes_today
+        self.has_used_dead_vote = has_used_dead_vote
+        self._seats = SeatState(seat + 1)
+        self._messages = MessageBus()
+        self.alive = alive
         self.controller.set_player(self)
         # Initialize with a placeholder role until roles are assigned
         self.role = Role("Unassigned", Alignment.TOWNSFOLK)
 
+    def __hash__(self) -> int:
+        return hash(self.seat)
+
+    @property
+    def alive(self) -> bool:
+        return (self._seats.alive >> self.seat) & 1 == 1
+
+    @alive.setter
+    def alive(self, value: bool) -> None:
+        self._seats.set("alive", self.seat, value)
+
+    @property
+    def role(self) -> Role:
+        return self._role
+
+    @role.setter
+    def role(self, role: Role) -> None:
+        self._seats.move_role(self.seat, getattr(self, "_role", None), role)
+        self._role = role
+
+    def attach(self, state: GameState) -> None:
+        """Move this player's flags, role and messages into the game's ``state``."""
+        seats = state.seats
+        seats.set("alive", self.seat, self.alive)
+        seats.move_role(self.seat, None, self._role)
+        self._seats = seats
+        for m in self._messages:
+            state.messages.post(m.sender, m.info, m.recipient)
+        self._messages = state.messages
+
     def assign_role(self, role: Role) -> None:
         self.role = role
 
+    def remember(self, key: str, item) -> None:
+        """Append ``item`` to the list ``memory[key]``.
+
+        The list grows in place, so a public claim quoting it stays current;
+        ``Game.fork`` gives the fork copies of these lists.
+        """
+        self.memory.append(key, item)
+
     def kill(self) -> None:
         self.alive = False
 
@@ -399,10 +836,11 @@ class Player:
         self.alive = True
 
     def receive_info(self, from_player, info) -> None:
-        self.memory.setdefault("received_info", []).append(
-            {"from": from_player.name, "info": info}
-        )
+        """Deliver ``info`` from ``from_player`` on this player's private channel."""
+        self._messages.post(from_player.seat, info, self.seat)
+        self.show_info(from_player, info)
 
+    def show_info(self, from_player, info) -> None:
         if isinstance(self.controller, HumanPlayerController):
             print(
                 f"\nInfo received by {self.name} from {from_player.name}:"
@@ -416,32 +854,38 @@ class Player:
         return f"{self.name} ({role_name}) - {status}"
 
     def choose_fortune_teller_targets(self, game):
+        game.count_decision("fortune_teller_targets")
         return self.controller.choose_fortune_teller_targets(
             game.players, game.get_player_view(self)
         )
 
     def choose_monk_protect(self, game):
+        game.count_decision("monk_protect")
         candidates = [p for p in game.players if p != self]
         return self.controller.choose_monk_protect(
             candidates, game.get_player_view(self)
         )
 
     def choose_ravenkeeper_reveal(self, game):
+        game.count_decision("ravenkeeper_reveal")
         return self.controller.choose_ravenkeeper_reveal(
             game.players, game.get_player_view(self)
         )
 
     def choose_imp_kill(self, game):
+        game.count_decision("imp_kill")
         return self.controller.choose_imp_kill(
             game.players, game.get_player_view(self)
         )
 
     def choose_poisoner_target(self, game):
+        game.count_decision("poisoner_target")
         return self.controller.choose_poisoner_target(
             game.players, game.get_player_view(self)
         )
     
     def choose_master(self, game):
+        game.count_decision("master")
         candidates = [p for p in game.players if p != self]
         return self.controller.choose_master(candidates, game.get_player_view(self))
 
@@ -456,13 +900,34 @@ class GameState:
     phase: Phase = Phase.NIGHT
     nominees: list = field(default_factory=list)
     votes: dict = field(default_factory=dict)
-    dead_players: set = field(default_factory=set)
     grimoire: dict = field(default_factory=dict)
-    history: list = field(default_factory=list)
+    events: EventLog = field(default_factory=EventLog)
+    messages: MessageBus = field(default_factory=MessageBus)
     executed_today: Player | None = None
-    pending_deaths: set = field(default_factory=set)
     monk_protected: Player | None = None
     demon_bluffs: list[str] | None = None
+    # Alive, dead, dying, poisoned and drunk flags, one bit per seat
+    seats: SeatState = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.seats = SeatState(self.player_count)
+
+    # Set-like views of ``seats`` for code written against the old sets
+    @property
+    def dead_players(self) -> SeatFlags:
+        return SeatFlags(self.seats, "dead")
+
+    @property
+    def pending_deaths(self) -> SeatFlags:
+        return SeatFlags(self.seats, "pending")
+
+    @property
+    def poisoned(self) -> SeatFlags:
+        return SeatFlags(self.seats, "poisoned", self.grimoire)
+
+    @property
+    def drunk(self) -> SeatFlags:
+        return SeatFlags(self.seats, "drunk", self.grimoire)
 
     def queue_death(self, player):
         self.pending_deaths.add(player.seat)
@@ -473,49 +938,295 @@ class GameState:
         elif self.phase == Phase.DAY:
             self.day += 1
             self.phase = Phase.NIGHT
-        print(f"Phase: {self.phase}")
+        self.log_event(EventKind.PHASE, detail=self.phase)
+        log.info("Phase: %s", self.phase)
 
     def record_death(self, player):
         self.dead_players.add(player.seat)
 
+    def fork(self, remap) -> "GameState":
+        """Return a copy whose containers are independent of this state.
+
+        Player references, including those in attributes added by roles such
+        as ``poisoned`` and ``red_herring``, are translated by ``remap``.
+        Sets, lists and dicts (e.g. ``demon_bluffs``) are copied, so a fork
+        that changes them in place leaves this state alone.
+        """
+        new = copy.copy(self)
+        for key, value in vars(self).items():
+            if isinstance(value, (set, frozenset)):
+                setattr(new, key, {remap(v) for v in value})
+            elif isinstance(value, list):
+                setattr(new, key, [remap(v) for v in value])
+            elif isinstance(value, dict):
+                setattr(new, key, {k: remap(v) for k, v in value.items()})
+            else:
+                setattr(new, key, remap(value))
+        new.nominees = [(remap(a), remap(b)) for a, b in self.nominees]
+        new.votes = {nominee: list(names) for nominee, names in self.votes.items()}
+        new.grimoire = {seat: remap(p) for seat, p in self.grimoire.items()}
+        new.events = self.events.fork()
+        new.messages = self.messages.fork()
+        new.seats = self.seats.copy()
+        return new
+
+    def log_event(self, kind: EventKind, seat=None, target=None, detail=None):
+        """Append a public event stamped with the current day and night."""
+        return self.events.record(kind, self.day, self.night, seat, target, detail)
+
+    @property
+    def history(self) -> list:
+        """English description of every public event so far."""
+        names = {seat: p.name for seat, p in self.grimoire.items()}
+        return self.events.history(names)
+
 
 class Game:
     """
     Main controller
     """
 
-    def __init__(self, player_names, role_list):
+    def __init__(self, player_names, role_list, short_circuit_votes=False, seed=None):
         self.players = [
             Player(i, name, PlayerController())
             for i, name in enumerate(player_names)
         ]
         self.state = GameState(len(self.players))
+        for p in self.players:
+            p.attach(self.state)
+        self.deduction = DeductionService(
+            self,
+            {a.value: roles for a, roles in TROUBLE_BREWING_ROLES.items()},
+        )
         self.roles = role_list
+        # Stop asking voters once a vote can no longer change the outcome.
+        # The recorded tallies are then partial, so only headless runs use it.
+        self.short_circuit_votes = short_circuit_votes
+        # Master seed; every random stream of the game derives from it
+        self.seed = seed
+        self.rng = derive_rng(seed, "game")
+        self.seat_names = MappingProxyType({p.seat: p.name for p in self.players})
+        # Bumped whenever claims, deaths or the phase change; keys view snapshots
+        self.version = 0
+        self._view_cache: dict = {}
+        self._controllers_seeded = False
+        # seat -> controller receiving ``on_event``, see ``_refresh_listeners``
+        self._listeners: dict = {}
+        # ``telemetry.GameTelemetry`` to report timings and work counts to
+        self.telemetry = None
+        self._subscribe()
         self.assign_roles()
         self.assign_evil_info_and_bluffs()
         for p in self.players:
             self.state.grimoire[p.seat] = p
 
+    def rng_for(self, label: str):
+        """Return this game's random stream for ``label``, see ``derive_rng``."""
+        return derive_rng(self.seed, label)
+
+    def _seed_controllers(self) -> None:
+        for p in self.players:
+            p.controller.rng = self.rng_for(f"controller:{p.seat}")
+        self._controllers_seeded = True
+
+    def storytellers(self) -> list:
+        """Return the distinct storyteller AIs referenced by the players' roles."""
+        found = {}
+        for p in self.players:
+            for role in (p.role, getattr(p.role, "cover_role", None)):
+                ai = getattr(role, "storyteller_ai", None)
+                if ai is not None:
+                    found[id(ai)] = ai
+        return list(found.values())
+
+    def fork(self, seed=None) -> "Game":
+        """Return an independent copy of the game at its current point.
+
+        Players, roles, controllers, storyteller and the ``GameState``
+        containers are copied one level deep; memory values, events and
+        deduction caches are immutable in practice and shared. Random
+        streams continue from their current state, so a fork replays the
+        parent's future exactly. Pass ``seed`` to re-seed every stream of
+        the fork instead, e.g. for independent rollouts.
+        """
+        memo: dict = {}
+
+        def remap(obj):
+            if not isinstance(obj, (Player, Role, StorytellerAI)):
+                return obj
+            new = memo.get(id(obj))
+            if new is None:
+                if isinstance(obj, Role):
+                    new = memo[id(obj)] = obj.clone(remap)
+                else:
+                    new = memo[id(obj)] = obj.fork()
+            return new
+
+        game = copy.copy(self)
+        game.players = []
+        for p in self.players:
+            new_p = copy.copy(p)
+            new_p.memory = p.memory.copy()
+            if p.claim is not None:
+                # A claim quoting a memory list quotes the fork's copy of it
+                new_p.claim = {
+                    k: new_p.memory[k] if k in p.memory and v is p.memory[k] else v
+                    for k, v in p.claim.items()
+                }
+            memo[id(p)] = new_p
+            game.players.append(new_p)
+        for old, new_p in zip(self.players, game.players):
+            # The copied SeatState already indexes the role; skip the setter
+            new_p._role = remap(old.role)
+            new_p.controller = old.controller.fork(new_p)
+        game.roles = [remap(r) for r in self.roles]
+        game.state = self.state.fork(remap)
+        for p in game.players:
+            p._seats = game.state.seats
+            p._messages = game.state.messages
+        game.rng = fork_rng(self.rng)
+        game.deduction = self.deduction.fork(game)
+        game._view_cache = {}
+        # Work done in forks (e.g. rollouts) counts towards the decision
+        # that made them, not as phases of this game
+        game.telemetry = None
+        game._subscribe()
+        game._refresh_listeners()
+        if seed is not None:
+            game.reseed(seed)
+        return game
+
+    def _subscribe(self) -> None:
+        self.state.events.listeners.append(self._dispatch_event)
+        self.state.messages.listeners.append(self._dispatch_message)
+        self._watch_memory()
+
+    def _watch_memory(self) -> None:
+        for p in self.players:
+            p.memory.on_write = functools.partial(self._memory_written, p)
+
+    def _refresh_listeners(self) -> None:
+        """Pick up controllers installed since the last phase started."""
+        self._listeners = {
+            p.seat: p.controller for p in self.players if p.controller.wants_events
+        }
+
+    def _dispatch_event(self, event: Event) -> None:
+        listeners = self._listeners
+        if not listeners:
+            return
+        if event.kind is EventKind.INFO:
+            controller = listeners.get(event.seat)
+            if controller is not None:
+                controller.on_event(event)
+            return
+        for controller in listeners.values():
+            controller.on_event(event)
+
+    def _dispatch_message(self, message: Message) -> None:
+        listeners = self._listeners
+        if not listeners:
+            return
+        if message.recipient is not None:
+            controller = listeners.get(message.recipient)
+            if controller is not None:
+                controller.on_event(message)
+            return
+        for seat, controller in listeners.items():
+            if seat != message.sender:
+                controller.on_event(message)
+
+    def push(self, kind: EventKind, seat=None, target=None, detail=None) -> None:
+        """Send an update to listening controllers without logging it."""
+        state = self.state
+        self._dispatch_event(Event(None, kind, state.day, state.night, seat, target, detail))
+
+    def _memory_written(self, player: Player, keys: tuple) -> None:
+        """Push what ``player`` just wrote to their memory."""
+        if not self._listeners:
+            return
+        memory = player.memory
+        self.push(EventKind.INFO, player.seat, detail={k: memory.get(k) for k in keys})
+        claim = player.claim
+        if claim is not None and any(
+            k in memory and claim.get(k) is memory[k] for k in keys
+        ):
+            # ``remember`` kept a public claim quoting this memory current
+            self.push(EventKind.CLAIM, player.seat, detail=claim.get("role"))
+
+    def _share_snapshot(self) -> None:
+        """Give controllers that want them a fork of the game at phase start."""
+        searchers = [p.controller for p in self.players if p.controller.wants_snapshots]
+        if searchers:
+            snapshot = self.fork()
+            for controller in searchers:
+                controller.on_phase_start(snapshot)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["seat_names"] = dict(self.seat_names)
+        state["_view_cache"] = {}
+        return state
+
+    def __setstate__(self, state):
+        state["seat_names"] = MappingProxyType(state["seat_names"])
+        self.__dict__.update(state)
+        self._watch_memory()
+
+    def reseed(self, seed) -> None:
+        """Derive every random stream of the game afresh from ``seed``."""
+        self.seed = seed
+        self.rng = self.rng_for("game")
+        for ai in self.storytellers():
+            ai.rng = self.rng_for("storyteller")
+        self._seed_controllers()
+
+    def notify_state_change(self) -> None:
+        """Record that claims, deaths or the phase changed.
+
+        Drops the shared ``PlayerView`` snapshots and the deduction cache.
+        """
+        self.version += 1
+        self._view_cache.clear()
+        self.deduction.invalidate()
+
+    def view_snapshot(self, key: str):
+        """Return the shared, read-only ``PlayerView`` field ``key``."""
+        cache = self._view_cache
+        if key not in cache:
+            if key == "public_claims":
+                cache[key] = MappingProxyType(self.public_claims())
+            elif key == "alive_players":
+                cache[key] = tuple(iter_seats(self.state.seats.alive))
+            elif key == "dead_players":
+                seats = self.state.seats
+                everyone = (1 << len(self.players)) - 1
+                cache[key] = tuple(iter_seats(everyone & ~seats.alive))
+            else:
+                raise KeyError(key)
+        return cache[key]
+
     def display_state(self):
-        """Print a concise summary of the current game state."""
-        print("\nCurrent Game State:")
+        """Log a concise summary of the current game state."""
+        if not log.isEnabledFor(logging.INFO):
+            return
+        log.info("\nCurrent Game State:")
         for p in self.players:
             status = "Alive" if p.alive else "Dead"
-            print(f"  {p.name} [{p.role.name}] - {status}")
+            log.info("  %s [%s] - %s", p.name, p.role.name, status)
 
     def assign_roles(self):
         roles = self.roles.copy()
-        random.shuffle(roles)
+        self.rng.shuffle(roles)
         for player, role in zip(self.players, roles):
             player.assign_role(role)
             player.claim = None
+            self.state.seats.set("drunk", player.seat, isinstance(role, Drunk))
 
     def assign_evil_info_and_bluffs(self):
-        evil_team = [
-            p
-            for p in self.players
-            if p.role.alignment in [Alignment.MINION, Alignment.DEMON]
-        ]
+        evil_team = self.players_in(
+            self.state.seats.alignment_mask(Alignment.MINION, Alignment.DEMON)
+        )
         demon = next(
             (p for p in evil_team if p.role.alignment == Alignment.DEMON), None
         )
@@ -535,7 +1246,7 @@ class Game:
         ])
         bluff_pool = [r for r in all_good_roles if r not in in_play and r != "Drunk"]
         # Choose 3 bluffs randomly
-        bluffs = random.sample(bluff_pool, k=3) if len(bluff_pool) >= 3 else bluff_pool
+        bluffs = self.rng.sample(bluff_pool, k=3) if len(bluff_pool) >= 3 else bluff_pool
         if demon:
             demon.memory["bluffs"] = bluffs
             self.state.demon_bluffs = bluffs
@@ -548,7 +1259,7 @@ class Game:
             # Assign a specific bluff to each evil player so they can coordinate
             assignments = {}
             available = bluffs[:] if bluffs else []
-            random.shuffle(available)
+            self.rng.shuffle(available)
             for idx, p in enumerate(evil_team):
                 chosen = available[idx % len(available)] if available else None
                 assignments[p.name] = chosen
@@ -567,6 +1278,7 @@ class Game:
             p.memory["evil_team"] = evil_team_info
 
     def info_swapping_opportunity(self, context=None):
+        humans = [p for p in self.players if isinstance(p.controller, HumanPlayerController)]
         for player in self.players:
             # if player.claim is not None:
             #     claim_msg = {"from": player.name, "public_claim": player.claim}
@@ -577,26 +1289,51 @@ class Game:
 
             # Additonal Information
             pv = self.get_player_view(player)
+            self.count_decision("share_info")
             info = player.controller.share_info(pv, context)
             if info:
-                for target in self.players:
-                    if target is player:
-                        continue
-                    player.controller.send_info(target, info)
+                self.notify_state_change()
+                claim = info.get("public_claim") if isinstance(info, dict) else None
+                if claim:
+                    self.state.log_event(
+                        EventKind.CLAIM, player.seat, detail=claim.get("role")
+                    )
+                # One message on the bus reaches everyone; only people
+                # reading at the terminal need to be told about it
+                self.state.messages.post(player.seat, info)
+                for target in humans:
+                    if target is not player:
+                        target.show_info(player, info)
+
+    def is_over(self) -> bool:
+        return self.state.phase == Phase.GAME_OVER
 
     def is_player_alive(self, player: Player) -> bool:
-        return player.alive and player.seat not in self.state.pending_deaths
+        return (self.state.seats.living() >> player.seat) & 1 == 1
 
     def get_alive_players(self):
-        return [p for p in self.players if self.is_player_alive(p)]
+        return self.players_in(self.state.seats.living())
+
+    def count_decision(self, kind: str, count: int = 1) -> None:
+        """Count ``count`` controller decisions of ``kind`` in the telemetry."""
+        if self.telemetry is not None:
+            self.telemetry.decision(kind, count)
+
+    def players_in(self, mask: int) -> list:
+        """Return the players whose seats are set in ``mask``, in seat order."""
+        players = self.players
+        return [players[seat] for seat in iter_seats(mask)]
 
     def night_phase(self):
         """
         night phase for alive roles w/ abilities
         """
+        self._refresh_listeners()
+        self._share_snapshot()
 
         self.state.night += 1
-        print(f"\n==== NIGHT {self.state.night} ====")  # start of night_phase
+        self.notify_state_change()
+        log.info("\n==== NIGHT %s ====", self.state.night)  # start of night_phase
         self.display_state()
 
         
@@ -605,27 +1342,34 @@ class Game:
             if not self.is_player_alive(player):
                 continue
             player.role.night_action(player, self)
-            print(
-                f"Night summary for {player.name} ({player.role.name}): {pformat(player.memory)}"
+            log.info(
+                "Night summary for %s (%s): %s",
+                player.name,
+                player.role.name,
+                lazy(pformat, player.memory),
             )
         self.state.advance_phase()
+        self.notify_state_change()
 
     def day_phase(self):
         """
         nominations, voting, executions
         """
-        for seat in self.state.pending_deaths:
-            player = self.state.grimoire[seat]
-            player.alive = False
-            self.state.dead_players.add(player.seat)
-            self.state.history.append(f"{player.name} died last night.")
-        self.state.pending_deaths.clear()
-
-        print(f"\n==== DAY {self.state.day} ====")  # start of day_phase
+        self._refresh_listeners()
+        self._share_snapshot()
+        seats = self.state.seats
+        for seat in iter_seats(seats.pending):
+            self.state.log_event(EventKind.DEATH, seat)
+        seats.alive &= ~seats.pending
+        seats.dead |= seats.pending
+        seats.pending = 0
+        self.notify_state_change()
+
+        log.info("\n==== DAY %s ====", self.state.day)  # start of day_phase
 
         self.info_swapping_opportunity(context="wakeup")
 
-        print("Players Info:")
+        log.info("Players Info:")
         self.display_state()
         alive_players = self.get_alive_players()
 
@@ -637,6 +1381,8 @@ class Game:
         votes_per_nominee = []
         nominated = set()
         already_nominated = set()
+        # Answers from batch controllers, valid until the next nomination
+        batched_nominations = {}
         idx = 0
         passes = 0
         executed_today = None
@@ -645,23 +1391,28 @@ class Game:
             if nominator.seat in nominated:
                 passes += 1
             else:
-                pv = self.get_player_view(nominator)
-                nominee = nominator.controller.choose_nominee(self.players, pv)
+                nominee = self._ask_nominee(
+                    alive_players, idx, nominated, batched_nominations
+                )
                 if nominee is None or nominee.seat in already_nominated:
                     nominated.add(nominator.seat)
                     passes += 1
                 else:
                     passes = 0
+                    batched_nominations.clear()
                     nominated.add(nominator.seat)
                     already_nominated.add(nominee.seat)
                     self.state.nominees.append((nominator, nominee))
+                    self.state.log_event(
+                        EventKind.NOMINATION, nominator.seat, nominee.seat
+                    )
                     nominations += 1
-                    print(f"{nominator.name} nominates {nominee.name}")
+                    log.info("%s nominates %s", nominator.name, nominee.name)
 
                     if hasattr(nominee.role, "on_nominated") and nominee.alive:
                         nominee.role.on_nominated(nominee, nominator, self)
                         if not nominator.alive:
-                            print(f"{nominator.name} executed by Virgin's ability!")
+                            log.info("%s executed by Virgin's ability!", nominator.name)
                             alive_players = self.get_alive_players()
                             if not alive_players:
                                 break
@@ -669,20 +1420,9 @@ class Game:
                             executed_today = nominator
                             break
 
-                    votes = []
-                    vote_names = []
-                    voters = [p for p in self.players if p.alive or not p.has_used_dead_vote]
-                    start = (nominee.seat + 1) % len(self.players)
-                    order = [self.players[(start + i) % len(self.players)] for i in range(len(self.players))]
-                    for voter in order:
-                        if voter not in voters:
-                            continue
-                        if voter.controller.cast_vote(nominee, pv):
-                            votes.append(voter)
-                            vote_names.append(voter.name)
-                            if not voter.alive:
-                                voter.has_used_dead_vote = True
-                    print(f"Votes for {nominee.name}: {len(votes)}")
+                    votes = self._collect_votes(nominee)
+                    vote_names = [voter.name for voter in votes]
+                    log.info("Votes for %s: %s", nominee.name, len(votes))
                     votes_per_nominee.append((nominee, votes))
                     self.state.votes[nominee.name] = vote_names
 
@@ -691,15 +1431,17 @@ class Game:
         
         if executed_today:
             self.state.executed_today = executed_today
-            print("Virgin triggered, ending day")
+            log.info("Virgin triggered, ending day")
         elif self.state.nominees:
-            print("\nVoting summary:")
+            log.info("\nVoting summary:")
             for nominee, names in self.state.votes.items():
-                print(f"  {nominee}: {len(names)} votes - [{', '.join(names)}]")
+                log.info(
+                    "  %s: %s votes - [%s]", nominee, len(names), lazy(", ".join, names)
+                )
 
             alive_players = self.get_alive_players()
             required_votes = (len(alive_players) + 1) // 2
-            print(f"\nVotes required to execute: {required_votes}\n")
+            log.info("\nVotes required to execute: %s\n", required_votes)
 
             max_votes = max((len(v) for v in self.state.votes.values()), default=0)
             top_nominees = [
@@ -710,7 +1452,7 @@ class Game:
 
             if len(top_nominees) == 1:
                 executed_today = top_nominees[0]
-                print(f"\n{executed_today.name} has been chosen for execution!")
+                log.info("\n%s has been chosen for execution!", executed_today.name)
                 self.execute_player(executed_today)
                 self.state.executed_today = executed_today
                 # Saint check (with drunk/poisoned check)
@@ -720,56 +1462,157 @@ class Game:
                         ai.is_drunk_or_poisoned(executed_today, self) if ai else False
                     )
                     if not is_drunk_poisoned:
-                        print("Saint was executed! Evil wins immediately!")
+                        log.info("Saint was executed! Evil wins immediately!")
                         self.state.phase = Phase.GAME_OVER
-                        self.state.history.append(
-                            "Saint was executed. Evil wins immediately."
+                        self.notify_state_change()
+                        self.state.log_event(
+                            EventKind.ABILITY, executed_today.seat, detail=("Saint", True)
                         )
                     else:
-                        print(
+                        log.info(
                             "Saint was executed while drunk/poisoned—ability does NOT trigger."
                         )
-                        self.state.history.append(
-                            "Saint was executed while drunk/poisoned (no effect)."
+                        self.state.log_event(
+                            EventKind.ABILITY, executed_today.seat, detail=("Saint", False)
                         )
             elif len(top_nominees) > 1:
-                print("\nTie for most votes; no one is executed.")
+                log.info("\nTie for most votes; no one is executed.")
                 self.state.executed_today = None
             else:
-                print("\nNo one was executed today.")
+                log.info("\nNo one was executed today.")
                 self.state.executed_today = None
 
         else:
-            print("\nNo nominations today.")
+            log.info("\nNo nominations today.")
             self.state.executed_today = None
 
         self.state.advance_phase()
+        self.notify_state_change()
+
+    def _ask_nominee(self, alive_players, idx, nominated, answers):
+        """Return the nomination of ``alive_players[idx]``.
+
+        Controllers that support batching are asked once for every nominator
+        still to act in their ``batch_group``; the answers are kept in
+        ``answers`` and consumed in turn order until a nomination changes the
+        table and the caller clears them.
+        """
+        nominator = alive_players[idx]
+        controller = nominator.controller
+        if not controller.supports_batch:
+            self.count_decision("nominee")
+            return controller.choose_nominee(
+                self.players, self.get_player_view(nominator)
+            )
+        if nominator.seat not in answers:
+            group = controller.batch_group()
+            upcoming = alive_players[idx:] + alive_players[:idx]
+            batch = [
+                p
+                for p in upcoming
+                if p.seat not in nominated
+                and p.controller.supports_batch
+                and p.controller.batch_group() == group
+            ]
+            requests = [(p, self.get_player_view(p)) for p in batch]
+            self.count_decision("nominee", len(requests))
+            choices = controller.choose_nominees(self.players, requests)
+            answers.update(zip((p.seat for p in batch), choices))
+        return answers.pop(nominator.seat)
+
+    def _collect_votes(self, nominee):
+        """Ask every eligible voter about ``nominee``; return the yes voters.
+
+        Voting goes clockwise from the nominee's left. Each voter sees their
+        own ``PlayerView``. Batch controllers answer for their whole group in
+        one call, but votes are still applied in seat order.
+
+        With ``short_circuit_votes`` the remaining voters are skipped once
+        the nominee can no longer be executed, see ``_vote_decided``, but
+        only when every voter left is alive: a dead voter's answer spends
+        their one vote, which must happen as in a full vote.
+        """
+        n = len(self.players)
+        start = (nominee.seat + 1) % n
+        order = [self.players[(start + i) % n] for i in range(n)]
+        voters = [p for p in order if p.alive or not p.has_used_dead_vote]
+        num_alive = len(self.get_alive_players())
+        required = (num_alive + 1) // 2
+        leader = max((len(v) for v in self.state.votes.values()), default=0)
+        last_dead = max((i for i, p in enumerate(voters) if not p.alive), default=-1)
+        answers = {}
+        votes = []
+        for i, voter in enumerate(voters):
+            if (
+                self.short_circuit_votes
+                and i > last_dead
+                and self._vote_decided(len(votes), len(voters) - i, required, leader)
+            ):
+                break
+            controller = voter.controller
+            if not controller.supports_batch or self.short_circuit_votes:
+                self.count_decision("vote")
+                vote = controller.cast_vote(nominee, self.get_player_view(voter))
+            else:
+                if voter.seat not in answers:
+                    group = controller.batch_group()
+                    batch = [
+                        p
+                        for p in voters[i:]
+                        if p.controller.supports_batch
+                        and p.controller.batch_group() == group
+                    ]
+                    requests = [(p, self.get_player_view(p)) for p in batch]
+                    self.count_decision("vote", len(requests))
+                    choices = controller.cast_votes(nominee, requests)
+                    answers.update(zip((p.seat for p in batch), choices))
+                vote = answers[voter.seat]
+            if vote:
+                votes.append(voter)
+                self.state.log_event(EventKind.VOTE, voter.seat, nominee.seat)
+                if not voter.alive:
+                    voter.has_used_dead_vote = True
+        return votes
+
+    @staticmethod
+    def _vote_decided(count, remaining, required, leader):
+        """Return True if the remaining ``remaining`` votes cannot matter.
+
+        ``count`` is the nominee's tally so far and ``leader`` the best tally
+        of earlier nominees. The vote is decided once the nominee can no
+        longer reach ``required`` or tie the leader: they cannot go on the
+        block, and a tally below both never affects a later comparison.
+        """
+        return count + remaining < max(required, leader)
 
     def execute_player(self, player):
         player.kill()
         self.state.record_death(player)
-        self.state.history.append(
-            f"{player.name} was executed on day {self.state.day}."
-        )
+        self.notify_state_change()
+        self.state.log_event(EventKind.EXECUTION, player.seat)
 
         self.resolve_scarlet_woman(player)
 
     def check_win_conditions(self):
-        alive = self.get_alive_players()
-        demon_alive = any(p.role.alignment == Alignment.DEMON for p in alive)
+        seats = self.state.seats
+        living = seats.living()
+        num_alive = count_seats(living)
+        demon_alive = living & seats.alignment_mask(Alignment.DEMON) != 0
         if (
-            len(alive) == 3
-            and any(p.role.name == "Mayor" for p in alive)
+            num_alive == 3
+            and living & seats.role_mask("Mayor")
             and self.state.phase == Phase.NIGHT
             and self.state.executed_today == None
         ):
             return "Good Wins!"
         if not demon_alive:
             self.state.phase = Phase.GAME_OVER
+            self.notify_state_change()
             return "Good wins!"
 
-        if len(alive) <= 2:
+        if num_alive <= 2:
             self.state.phase = Phase.GAME_OVER
+            self.notify_state_change()
             return "Evil wins!"
         return None
 
@@ -779,31 +1622,38 @@ class Game:
         deduction step. Returns the winning team string (e.g. "Good wins!") or
         ``None`` if the game ended without a clear winner.
         """
+        if self.seed is not None and not self._controllers_seeded:
+            self._seed_controllers()
         result = None
-        if not verbose: #Stop all printing
-            saved_print = globals().get("__builtin_print")
-            globals()["__builtin_print"] = lambda *a, **k: None
-        else:
-            saved_print = None
+        saved_level = log.level
+        if not verbose:  # Stop all game output
+            log.setLevel(logging.WARNING)
         try:
             while self.state.phase != Phase.GAME_OVER:
+                telemetry = self.telemetry
+                start = time.perf_counter()
                 if self.state.phase == Phase.NIGHT:
                     self.night_phase()
+                    if telemetry is not None:
+                        telemetry.nights.append(time.perf_counter() - start)
                 elif self.state.phase == Phase.DAY:
                     self.day_phase()
+                    if telemetry is not None:
+                        telemetry.days.append(time.perf_counter() - start)
                 result = self.check_win_conditions()
                 if result or self.state.phase == Phase.GAME_OVER or self.state.night > 10:
                     if verbose:
-                        print(result)
+                        log.info("%s", result)
                     break
         finally:
-            if not verbose:
-                globals()["__builtin_print"] = saved_print  # type: ignore
+            log.setLevel(saved_level)
+            for p in self.players:
+                p.controller.on_game_over()
 
         if verbose:
-            print("\nGame over! Final state:")
+            log.info("\nGame over! Final state:")
             for p in self.players:
-                print(p)
+                log.info("%s", p)
             # After the game ends, run deduction analysis on the final game state
             self.run_deduction()
 
@@ -812,248 +1662,233 @@ class Game:
     def resolve_scarlet_woman(self, killed_player):
         if killed_player.role.name != "Imp":
             return
-        alive_before = len(self.get_alive_players()) + 1
+        seats = self.state.seats
+        living = seats.living()
+        alive_before = count_seats(living) + 1
         if alive_before < 5:
             return
-        for p in self.get_alive_players():
+        for p in self.players_in(living & seats.role_mask("Scarlet Woman")):
             if isinstance(p.role, ScarletWoman):
                 ai = p.role.storyteller_ai
                 is_drunk_poisoned = ai.is_drunk_or_poisoned(p, self)
                 if not is_drunk_poisoned:
                     p.role = Imp(ai)
-                    self.state.history.append(
-                        f"Scarlet Woman ({p.name}) becomes the new Imp after {killed_player.name} was killed."
+                    self.state.log_event(
+                        EventKind.PROMOTION, p.seat, killed_player.seat
                     )
-                    print(
-                        f"Scarlet Woman ({p.name}) becomes the new Imp after {killed_player.name} was killed."
+                    log.info(
+                        "Scarlet Woman (%s) becomes the new Imp after %s was killed.",
+                        p.name,
+                        killed_player.name,
                     )
                     return
 
-    def get_player_view(self, player):
+    def public_claims(self) -> dict:
+        """Return the claims players can currently see, keyed by seat."""
         if self.state.night == 1 and self.state.phase == Phase.NIGHT:
-            claims = {}
-        else:
-            claims = {p.seat: p.claim for p in self.players if p.claim is not None}
-        return PlayerView(
-            player_seat=player.seat,
-            player_name=player.name,
-            role_name=(
-                player.role.name
-                if player.role.name != "Drunk"
-                else player.role.cover_role_name
-            ),
-            phase=self.state.phase,
-            day=self.state.day,
-            night=self.state.night,
-            is_alive=player.alive,
-            role_claim=player.claim,
-            public_claims=claims,
-            seat_names={p.seat: p.name for p in self.players},
-            alive_players=[p.seat for p in self.players if p.alive],
-            dead_players=[p.seat for p in self.players if not p.alive],
-            memory=player.memory.copy(),
-            history=self.state.history.copy(),
-            votes=self.state.votes.copy(),
-        )
+            return {}
+        return {p.seat: p.claim for p in self.players if p.claim is not None}
+
+    def get_player_view(self, player):
+        return PlayerView(self, player)
 
     def run_deduction(self):
         """Run the deduction engine on the current game state and print results."""
-        from deduction_engine import (
-            generate_all_worlds,
-            deduction_pipeline,
-            compute_role_probs,
-        )
-
         player_names = [p.name for p in self.players]
-        TB_ROLES = {a.value if hasattr(a, "value") else a: roles for a, roles in TROUBLE_BREWING_ROLES.items()}
-
-        all_minion_roles = TB_ROLES["Minion"]
-        m_minions, outsider_count = player_role_counts(len(self.players))
-
-        claims = {p.name: p.claim for p in self.players if p.claim}
-
         try:
-            worlds = generate_all_worlds(
-                player_names,
-                all_minion_roles,
-                m_minions,
-                claims,
-                TB_ROLES,
-                outsider_count,
-                deaths=[],
-            )
-            deduced = deduction_pipeline(worlds, TB_ROLES)
-            evil_prob, imp_prob = compute_role_probs(
-                deduced, player_names, TB_ROLES
-            )
-            print("\nDeduction results:")
+            evil_prob, imp_prob = self.deduction.role_probs()
+            log.info("\nDeduction results:")
             for name in player_names:
-                print(
-                    f"{name}: {evil_prob[name]:.1f}% evil, {imp_prob[name]:.1f}% Imp"
+                log.info(
+                    "%s: %.1f%% evil, %.1f%% Imp",
+                    name,
+                    evil_prob[name],
+                    imp_prob[name],
                 )
         except Exception as e:  # pragma: no cover - fallback for early bugs
-            print(f"Deduction failed: {e}")
+            log.info("Deduction failed: %s", e)
 
 
 # TODO Insert Role implementations
 class StorytellerAI:
-    pass
+    rng = random
+
+    def fork(self):
+        """Return a copy with its own continuation of ``rng``."""
+        new = copy.copy(self)
+        new.rng = fork_rng(self.rng)
+        return new
 
 
 class DumbStorytellerAI(StorytellerAI):
 
+    def __init__(self, rng=None):
+        self.rng = random if rng is None else rng
+
     def is_drunk_or_poisoned(self, player, game):
-        result = (
-            (hasattr(player, "role") and player.role.name == "Drunk")
-            or (
-                hasattr(game.state, "drunk")
-                and player in getattr(game.state, "drunk", set())
-            )
-            or (
-                hasattr(game.state, "poisoned")
-                and player in getattr(game.state, "poisoned", set())
-            )
-        )
+        result = player.role.name == "Drunk" or game.state.seats.impaired(player.seat)
         if result:
-            print(f"DEBUG: {player.name} is drunk or poisoned.")
+            log.debug("%s is drunk or poisoned.", player.name)
         return result
 
     def choose_two_townsfolk(self, washerwoman, game):
+        seats = game.state.seats
+        townsfolk = seats.alignment_mask(Alignment.TOWNSFOLK)
         candidates = [
             (p, p.role.name)
-            for p in game.players
-            if p.role.alignment == Alignment.TOWNSFOLK and p.role.name != "Washerwoman"
+            for p in game.players_in(townsfolk & ~seats.role_mask("Washerwoman"))
         ]
-        for p in game.players:
-            if p.role.name == "Spy":
-                fake_role = random.choice(
-                    [
-                        role
-                        for role in TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK]
-                        if role != "Washerwoman"
-                    ]
-                )
-                candidates.append((p, fake_role))
-        print(
-            f"DEBUG: Washerwoman info candidates: {[(p.name, r) for p,r in candidates]}"
+        for p in game.players_in(seats.role_mask("Spy")):
+            fake_role = self.rng.choice(
+                [
+                    role
+                    for role in TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK]
+                    if role != "Washerwoman"
+                ]
+            )
+            candidates.append((p, fake_role))
+        log.debug(
+            "Washerwoman info candidates: %s",
+            lazy(lambda: [(p.name, r) for p, r in candidates]),
         )
         if not candidates:
-            print("DEBUG: No valid Washerwoman candidates.")
+            log.debug("No valid Washerwoman candidates.")
             return None, None, None
         if self.is_drunk_or_poisoned(washerwoman, game):
             fake_players = [p for p in game.players if p != washerwoman]
             fake_roles = [r for _, r in candidates]
-            fake_real = random.choice(fake_players)
-            fake_role = random.choice(fake_roles)
+            fake_real = self.rng.choice(fake_players)
+            fake_role = self.rng.choice(fake_roles)
             others = [p for p in game.players if p != washerwoman and p != fake_real]
-            other = random.choice(others)
+            other = self.rng.choice(others)
             pair = [fake_real, other]
-            random.shuffle(pair)
-            print(
-                f"DEBUG: Washerwoman (drunk/poisoned) shows role {fake_role} and players {pair[0].name}, {pair[1].name}"
+            self.rng.shuffle(pair)
+            log.debug(
+                "Washerwoman (drunk/poisoned) shows role %s and players %s, %s",
+                fake_role,
+                pair[0].name,
+                pair[1].name,
             )
             return fake_role, pair[0], pair[1]
-        real, role_to_show = random.choice(candidates)
+        real, role_to_show = self.rng.choice(candidates)
         others = [p for p in game.players if p != washerwoman and p != real]
-        other = random.choice(others)
+        other = self.rng.choice(others)
         pair = [real, other]
-        random.shuffle(pair)
-        print(
-            f"DEBUG: Washerwoman shows role {role_to_show} and players {pair[0].name}, {pair[1].name}"
+        self.rng.shuffle(pair)
+        log.debug(
+            "Washerwoman shows role %s and players %s, %s",
+            role_to_show,
+            pair[0].name,
+            pair[1].name,
         )
         return role_to_show, pair[0], pair[1]
 
     def choose_two_outsiders(self, librarian, game):
+        seats = game.state.seats
         candidates = [
             (p, p.role.name)
-            for p in game.players
-            if p.role.alignment == Alignment.OUTSIDER
+            for p in game.players_in(seats.alignment_mask(Alignment.OUTSIDER))
         ]
-        for p in game.players:
-            if p.role.name == "Spy":
-                fake_role = random.choice(TROUBLE_BREWING_ROLES[Alignment.OUTSIDER])
-                candidates.append((p, fake_role))
-        print(
-            f"DEBUG: Librarian info candidates: {[(p.name, r) for p,r in candidates]}"
+        for p in game.players_in(seats.role_mask("Spy")):
+            fake_role = self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.OUTSIDER])
+            candidates.append((p, fake_role))
+        log.debug(
+            "Librarian info candidates: %s",
+            lazy(lambda: [(p.name, r) for p, r in candidates]),
         )
         if not candidates:
-            print("DEBUG: No valid Librarian candidates.")
+            log.debug("No valid Librarian candidates.")
             return None, None, None
         if self.is_drunk_or_poisoned(librarian, game):
             fake_players = [p for p in game.players if p != librarian]
             fake_roles = [r for _, r in candidates]
-            fake_real = random.choice(fake_players)
-            fake_role = random.choice(["Saint", "Butler", "Drunk", "Recluse"])
+            fake_real = self.rng.choice(fake_players)
+            fake_role = self.rng.choice(["Saint", "Butler", "Drunk", "Recluse"])
             others = [p for p in game.players if p != librarian and p != fake_real]
-            other = random.choice(others)
+            other = self.rng.choice(others)
             pair = [fake_real, other]
-            random.shuffle(pair)
-            print(
-                f"DEBUG: Librarian (drunk/poisoned) shows role {fake_role} and players {pair[0].name}, {pair[1].name}"
+            self.rng.shuffle(pair)
+            log.debug(
+                "Librarian (drunk/poisoned) shows role %s and players %s, %s",
+                fake_role,
+                pair[0].name,
+                pair[1].name,
             )
             return fake_role, pair[0], pair[1]
-        real, role_to_show = random.choice(candidates)
+        real, role_to_show = self.rng.choice(candidates)
         others = [p for p in game.players if p != librarian and p != real]
-        other = random.choice(others)
+        other = self.rng.choice(others)
         pair = [real, other]
-        random.shuffle(pair)
-        print(
-            f"DEBUG: Librarian shows role {role_to_show} and players {pair[0].name}, {pair[1].name}"
+        self.rng.shuffle(pair)
+        log.debug(
+            "Librarian shows role %s and players %s, %s",
+            role_to_show,
+            pair[0].name,
+            pair[1].name,
         )
         return role_to_show, pair[0], pair[1]
 
     def choose_two_minions(self, investigator, game):
+        seats = game.state.seats
         minion_candidates = [
             (p, p.role.name)
-            for p in game.players
-            if p.role.alignment == Alignment.MINION
+            for p in game.players_in(seats.alignment_mask(Alignment.MINION))
         ]
-        recluse_candidates = [p for p in game.players if p.role.name == "Recluse"]
+        recluse_candidates = game.players_in(seats.role_mask("Recluse"))
         minion_role_options = ["Poisoner", "Spy", "Scarlet Woman", "Baron"]
         candidates = minion_candidates.copy()
         for p in recluse_candidates:
-            fake_role = random.choice(minion_role_options)
+            fake_role = self.rng.choice(minion_role_options)
             candidates.append((p, fake_role))
-        print(
-            f"DEBUG: Investigator info candidates: {[(p.name, r) for p,r in candidates]}"
+        log.debug(
+            "Investigator info candidates: %s",
+            lazy(lambda: [(p.name, r) for p, r in candidates]),
         )
         if not candidates:
-            print("DEBUG: No valid Investigator candidates.")
+            log.debug("No valid Investigator candidates.")
             return None, None, None
         if self.is_drunk_or_poisoned(investigator, game):
             fake_players = [p for p in game.players if p != investigator]
-            fake_real = random.choice(fake_players)
-            fake_role = random.choice(minion_role_options)
+            fake_real = self.rng.choice(fake_players)
+            fake_role = self.rng.choice(minion_role_options)
             others = [p for p in game.players if p != investigator and p != fake_real]
-            other = random.choice(others)
+            other = self.rng.choice(others)
             pair = [fake_real, other]
-            random.shuffle(pair)
-            print(
-                f"DEBUG: Investigator (drunk/poisoned) shows role {fake_role} and players {pair[0].name}, {pair[1].name}"
+            self.rng.shuffle(pair)
+            log.debug(
+                "Investigator (drunk/poisoned) shows role %s and players %s, %s",
+                fake_role,
+                pair[0].name,
+                pair[1].name,
             )
             return fake_role, pair[0], pair[1]
-        real, role_to_show = random.choice(candidates)
+        real, role_to_show = self.rng.choice(candidates)
         others = [p for p in game.players if p != investigator and p != real]
-        other = random.choice(others)
+        other = self.rng.choice(others)
         pair = [real, other]
-        random.shuffle(pair)
-        print(
-            f"DEBUG: Investigator shows role {role_to_show} and players {pair[0].name}, {pair[1].name}"
+        self.rng.shuffle(pair)
+        log.debug(
+            "Investigator shows role %s and players %s, %s",
+            role_to_show,
+            pair[0].name,
+            pair[1].name,
         )
         return role_to_show, pair[0], pair[1]
 
     def evil_for_empath(self, player):
         if player.role.name == "Recluse":
-            result = random.choice([True, False])
-            print(
-                f"DEBUG: Empath checks {player.name} (Recluse), random evil? {result}"
+            result = self.rng.choice([True, False])
+            log.debug(
+                "Empath checks %s (Recluse), random evil? %s",
+                player.name,
+                result,
             )
             return result
         if player.role.name == "Spy":
-            print(f"DEBUG: Empath checks {player.name} (Spy), always not evil.")
+            log.debug("Empath checks %s (Spy), always not evil.", player.name)
             return False
         result = player.role.alignment in [Alignment.MINION, Alignment.DEMON]
-        print(f"DEBUG: Empath checks {player.name}, evil? {result}")
+        log.debug("Empath checks %s, evil? %s", player.name, result)
         return result
 
     def chef_evilness_map(self, alive_players):
@@ -1061,37 +1896,50 @@ class DumbStorytellerAI(StorytellerAI):
         mapping = {}
         for p in alive_players:
             if p.role.name == "Recluse":
-                val = random.choice([True, False])
+                val = self.rng.choice([True, False])
                 mapping[p.seat] = val
-                print(f"DEBUG: Chef checks {p.name} (Recluse), random evil? {val}")
+                log.debug(
+                    "Chef checks %s (Recluse), random evil? %s",
+                    p.name,
+                    val,
+                )
             elif p.role.name == "Spy":
-                val = random.choice([True, False])
+                val = self.rng.choice([True, False])
                 mapping[p.seat] = val
-                print(f"DEBUG: Chef checks {p.name} (Spy), random evil? {val}")
+                log.debug("Chef checks %s (Spy), random evil? %s", p.name, val)
             else:
                 val = p.role.alignment in [Alignment.MINION, Alignment.DEMON]
                 mapping[p.seat] = val
-                print(f"DEBUG: Chef checks {p.name}, evil? {val}")
+                log.debug("Chef checks %s, evil? %s", p.name, val)
         return mapping
 
     def give_empath_info(self, empath, game, true_evil_neighbors):
         if self.is_drunk_or_poisoned(empath, game):
             val = 0 if true_evil_neighbors >= 1 else 1
-            print(
-                f"DEBUG: Empath ({empath.name}) is drunk/poisoned: giving {val} instead of {true_evil_neighbors}"
+            log.debug(
+                "Empath (%s) is drunk/poisoned: giving %s instead of %s",
+                empath.name,
+                val,
+                true_evil_neighbors,
             )
             return val
-        print(f"DEBUG: Empath ({empath.name}) is sober: giving {true_evil_neighbors}")
+        log.debug(
+            "Empath (%s) is sober: giving %s",
+            empath.name,
+            true_evil_neighbors,
+        )
         return true_evil_neighbors
 
     def give_chef_info(self, chef, game, true_evil_pairs):
         if self.is_drunk_or_poisoned(chef, game):
-            rand_val = random.randint(0, 3)
-            print(
-                f"DEBUG: Chef ({chef.name}) is drunk/poisoned: giving random {rand_val}"
+            rand_val = self.rng.randint(0, 3)
+            log.debug(
+                "Chef (%s) is drunk/poisoned: giving random %s",
+                chef.name,
+                rand_val,
             )
             return rand_val
-        print(f"DEBUG: Chef ({chef.name}) is sober: giving {true_evil_pairs}")
+        log.debug("Chef (%s) is sober: giving %s", chef.name, true_evil_pairs)
         return true_evil_pairs
 
     def pick_red_herring(self, game):
@@ -1102,18 +1950,22 @@ class DumbStorytellerAI(StorytellerAI):
             and p.role.alignment != Alignment.MINION
             and p.role.name != "Recluse"
         ]
-        pick = random.choice(candidates)
-        print(f"DEBUG: Fortune Teller red herring is {pick.name}")
+        pick = self.rng.choice(candidates)
+        log.debug("Fortune Teller red herring is %s", pick.name)
         return pick
 
     def fortune_teller_result(self, fortune_teller, pair, game):
-        print(
-            f"DEBUG: Fortune Teller is checking {pair[0].name if pair[0] else None} and {pair[1].name if pair[1] else None}"
+        log.debug(
+            "Fortune Teller is checking %s and %s",
+            pair[0].name if pair[0] else None,
+            pair[1].name if pair[1] else None,
         )
         if self.is_drunk_or_poisoned(fortune_teller, game):
-            result = random.choice([True, False, False])
-            print(
-                f"DEBUG: Fortune Teller ({fortune_teller.name}) is drunk/poisoned: random ping {result}"
+            result = self.rng.choice([True, False, False])
+            log.debug(
+                "Fortune Teller (%s) is drunk/poisoned: random ping %s",
+                fortune_teller.name,
+                result,
             )
             return result
         if not hasattr(game.state, "red_herring") or game.state.red_herring is None:
@@ -1123,28 +1975,33 @@ class DumbStorytellerAI(StorytellerAI):
             if p is None:
                 continue
             if self.registers_as_demon(p):
-                print(f"DEBUG: Fortune Teller pinged true on {p.name} (Demon)")
+                log.debug("Fortune Teller pinged true on %s (Demon)", p.name)
                 return True
             if p == red_herring:
-                print(f"DEBUG: Fortune Teller pinged true on {p.name} (Red Herring)")
+                log.debug(
+                    "Fortune Teller pinged true on %s (Red Herring)",
+                    p.name,
+                )
                 return True
-        print("DEBUG: Fortune Teller did not ping (both safe)")
+        log.debug("Fortune Teller did not ping (both safe)")
         return False
 
     def registers_as_demon(self, player):
         if player.role.name == "Recluse":
-            val = random.choice([True, False])
-            print(f"DEBUG: {player.name} (Recluse) registers as demon? {val}")
+            val = self.rng.choice([True, False])
+            log.debug("%s (Recluse) registers as demon? %s", player.name, val)
             return val
         result = player.role.alignment == Alignment.DEMON
-        print(f"DEBUG: {player.name} registers as demon? {result}")
+        log.debug("%s registers as demon? %s", player.name, result)
         return result
 
     def undertaker_info(self, undertaker, executed_player, game):
         if self.is_drunk_or_poisoned(undertaker, game):
-            if random.random() < 0.7:
-                print(
-                    f"DEBUG: Undertaker ({undertaker.name}) is drunk/poisoned: giving actual role {executed_player.role.name}"
+            if self.rng.random() < 0.7:
+                log.debug(
+                    "Undertaker (%s) is drunk/poisoned: giving actual role %s",
+                    undertaker.name,
+                    executed_player.role.name,
                 )
                 return executed_player.role.name
             else:
@@ -1162,40 +2019,47 @@ class DumbStorytellerAI(StorytellerAI):
                 for p in game.players:
                     if p.role.alignment in opposite_alignments:
                         role_pool.append(p.role.name)
-                pick = random.choice(role_pool)
-                print(
-                    f"DEBUG: Undertaker ({undertaker.name}) is drunk/poisoned: giving false role {pick}"
+                pick = self.rng.choice(role_pool)
+                log.debug(
+                    "Undertaker (%s) is drunk/poisoned: giving false role %s",
+                    undertaker.name,
+                    pick,
                 )
                 return pick
         if executed_player.role.name == "Recluse":
-            if random.choice([True, False]):
-                pick = random.choice(["Poisoner", "Scarlet Woman", "Spy", "Baron"])
-                print(f"DEBUG: Undertaker sees Recluse as {pick}")
+            if self.rng.choice([True, False]):
+                pick = self.rng.choice(["Poisoner", "Scarlet Woman", "Spy", "Baron"])
+                log.debug("Undertaker sees Recluse as %s", pick)
                 return pick
             else:
-                print("DEBUG: Undertaker sees Recluse as Imp")
+                log.debug("Undertaker sees Recluse as Imp")
                 return "Imp"
         if executed_player.role.name == "Spy":
-            if random.choice([True, False]):
-                pick = random.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK])
-                print(f"DEBUG: Undertaker sees Spy as {pick}")
+            if self.rng.choice([True, False]):
+                pick = self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK])
+                log.debug("Undertaker sees Spy as %s", pick)
                 return pick
             else:
-                pick = random.choice(TROUBLE_BREWING_ROLES[Alignment.OUTSIDER])
-                print(f"DEBUG: Undertaker sees Spy as {pick}")
+                pick = self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.OUTSIDER])
+                log.debug("Undertaker sees Spy as %s", pick)
                 return pick
-        print(f"DEBUG: Undertaker sees true role {executed_player.role.name}")
+        log.debug("Undertaker sees true role %s", executed_player.role.name)
         return executed_player.role.name
 
     # The remaining methods (monk_protect, ravenkeeper_info, etc.) can be similarly instrumented with prints, if needed.
     def monk_protect(self, monk, target, game):
         if self.is_drunk_or_poisoned(monk, game):
-            print(f"DEBUG: Monk ({monk.name}) is drunk/poisoned: no one protected.")
+            log.debug(
+                "Monk (%s) is drunk/poisoned: no one protected.",
+                monk.name,
+            )
             game.state.monk_protected = None
             return
         game.state.monk_protected = target
-        print(
-            f"DEBUG: Monk ({monk.name}) protects {target.name if target else 'nobody'}."
+        log.debug(
+            "Monk (%s) protects %s.",
+            monk.name,
+            target.name if target else 'nobody',
         )
 
     def ravenkeeper_info(self, ravenkeeper, target, game):
@@ -1207,133 +2071,167 @@ class DumbStorytellerAI(StorytellerAI):
             role_pool = []
             for align in opposite_alignments:
                 role_pool.extend(TROUBLE_BREWING_ROLES[align])
-            pick = random.choice(role_pool)
-            print(
-                f"DEBUG: Ravenkeeper ({ravenkeeper.name}) is drunk/poisoned: shown {pick} for {target.name}."
+            pick = self.rng.choice(role_pool)
+            log.debug(
+                "Ravenkeeper (%s) is drunk/poisoned: shown %s for %s.",
+                ravenkeeper.name,
+                pick,
+                target.name,
             )
             return pick
         if target.role.name == "Recluse":
-            if random.choice([True, False]):
+            if self.rng.choice([True, False]):
                 role_pool = (
                     TROUBLE_BREWING_ROLES[Alignment.MINION]
                     + TROUBLE_BREWING_ROLES[Alignment.DEMON]
                 )
-                pick = random.choice(role_pool)
-                print(f"DEBUG: Ravenkeeper sees Recluse as {pick}.")
+                pick = self.rng.choice(role_pool)
+                log.debug("Ravenkeeper sees Recluse as %s.", pick)
                 return pick
             else:
-                print(f"DEBUG: Ravenkeeper sees Recluse as Recluse.")
+                log.debug("Ravenkeeper sees Recluse as Recluse.")
                 return "Recluse"
         if target.role.name == "Spy":
-            if random.choice([True, False]):
-                pick = random.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK])
-                print(f"DEBUG: Ravenkeeper sees Spy as {pick}.")
+            if self.rng.choice([True, False]):
+                pick = self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK])
+                log.debug("Ravenkeeper sees Spy as %s.", pick)
                 return pick
             else:
-                pick = random.choice(TROUBLE_BREWING_ROLES[Alignment.OUTSIDER])
-                print(f"DEBUG: Ravenkeeper sees Spy as {pick}.")
+                pick = self.rng.choice(TROUBLE_BREWING_ROLES[Alignment.OUTSIDER])
+                log.debug("Ravenkeeper sees Spy as %s.", pick)
                 return pick
-        print(
-            f"DEBUG: Ravenkeeper sees true role {target.role.name} for {target.name}."
+        log.debug(
+            "Ravenkeeper sees true role %s for %s.",
+            target.role.name,
+            target.name,
         )
         return target.role.name
 
     def virgin_nominator_registers_as_townsfolk(self, nominator, game):
         if nominator.role.alignment == Alignment.TOWNSFOLK:
-            print(f"DEBUG: Virgin nomination: {nominator.name} is a real Townsfolk.")
+            log.debug(
+                "Virgin nomination: %s is a real Townsfolk.",
+                nominator.name,
+            )
             return True
         if nominator.role.name == "Spy":
-            val = random.choice([True, False])
-            print(
-                f"DEBUG: Virgin nomination: {nominator.name} is Spy, registers as Townsfolk? {val}"
+            val = self.rng.choice([True, False])
+            log.debug(
+                "Virgin nomination: %s is Spy, registers as Townsfolk? %s",
+                nominator.name,
+                val,
             )
             return val
-        print(f"DEBUG: Virgin nomination: {nominator.name} is not a Townsfolk or Spy.")
+        log.debug(
+            "Virgin nomination: %s is not a Townsfolk or Spy.",
+            nominator.name,
+        )
         return False
 
     def virgin_nomination_check(self, virgin, nominator, game):
         if self.is_drunk_or_poisoned(virgin, game):
-            print(
-                f"DEBUG: Virgin ({virgin.name}) is drunk/poisoned: ability does not trigger."
+            log.debug(
+                "Virgin (%s) is drunk/poisoned: ability does not trigger.",
+                virgin.name,
             )
             return
         if self.virgin_nominator_registers_as_townsfolk(nominator, game):
-            print(f"DEBUG: Virgin's ability triggers, executing {nominator.name}.")
+            log.debug("Virgin's ability triggers, executing %s.", nominator.name)
             nominator.kill()
-            game.state.history.append(
-                f"{nominator.name} was executed on day {game.state.day}."
-            )
+            game.notify_state_change()
+            game.state.log_event(EventKind.EXECUTION, nominator.seat)
             nominator.memory["executed_by_virgin"] = True
         else:
-            print(f"DEBUG: Virgin's ability does NOT trigger for {nominator.name}.")
+            log.debug(
+                "Virgin's ability does NOT trigger for %s.",
+                nominator.name,
+            )
 
     def slayer_shot(self, slayer, target, game):
         if self.is_drunk_or_poisoned(slayer, game):
-            print(
-                f"DEBUG: Slayer ({slayer.name}) is drunk/poisoned: shot does nothing."
+            log.debug(
+                "Slayer (%s) is drunk/poisoned: shot does nothing.",
+                slayer.name,
+            )
+            game.state.log_event(
+                EventKind.ABILITY, slayer.seat, target.seat, ("Slayer", False)
             )
             return
         if target.role.alignment == Alignment.DEMON:
-            print(f"DEBUG: Slayer shot and killed {target.name} (Demon)!")
+            log.debug("Slayer shot and killed %s (Demon)!", target.name)
             target.kill()
-            game.state.history.append(
-                f"The Slayer ({slayer.name}) shot {target.name} and killed them!"
+            game.notify_state_change()
+            game.state.log_event(
+                EventKind.ABILITY, slayer.seat, target.seat, ("Slayer", True)
             )
             game.resolve_scarlet_woman(target)
             return
         if target.role.name == "Recluse":
-            val = random.choice([True, False])
-            print(
-                f"DEBUG: Slayer shot Recluse ({target.name}). Registers as demon? {val}"
+            val = self.rng.choice([True, False])
+            log.debug(
+                "Slayer shot Recluse (%s). Registers as demon? %s",
+                target.name,
+                val,
             )
             if val:
                 target.kill()
-                game.state.history.append(
-                    f"The Slayer ({slayer.name}) shot {target.name} and killed them!"
+                game.notify_state_change()
+                game.state.log_event(
+                    EventKind.ABILITY, slayer.seat, target.seat, ("Slayer", True)
                 )
                 return
-        print(f"DEBUG: Slayer shot {target.name}, but nothing happened.")
+        log.debug("Slayer shot %s, but nothing happened.", target.name)
+        game.state.log_event(
+            EventKind.ABILITY, slayer.seat, target.seat, ("Slayer", False)
+        )
 
     def resolve_demon_kill(self, demon, target, game):
-        print(f"DEBUG: Demon ({demon.name}) is trying to kill {target.name}.")
+        log.debug("Demon (%s) is trying to kill %s.", demon.name, target.name)
         if self.is_drunk_or_poisoned(demon, game):
             return
 
         if not game.is_player_alive(target):
             return
 
-        mayor_bounce = [
-            p for p in game.players if p.alive and p.role.alignment != Alignment.DEMON
-        ]
+        seats = game.state.seats
+        mayor_bounce = game.players_in(
+            seats.alive & ~seats.alignment_mask(Alignment.DEMON)
+        )
         if target.role.name == "Mayor" and not self.is_drunk_or_poisoned(target, game):
-            redirect_target = random.choice(mayor_bounce)
+            redirect_target = self.rng.choice(mayor_bounce)
             if redirect_target != target:
-                print(
-                    f"DEBUG: Mayor bounce! Redirecting kill from {target.name} to {redirect_target.name}."
+                log.debug(
+                    "Mayor bounce! Redirecting kill from %s to %s.",
+                    target.name,
+                    redirect_target.name,
                 )
             else:
-                print(f"DEBUG: Mayor self-bounce! Kill remains on {target.name}.")
+                log.debug("Mayor self-bounce! Kill remains on %s.", target.name)
             target = redirect_target
 
         if (
             hasattr(game.state, "monk_protected")
             and game.state.monk_protected == target
         ):
-            print(f"DEBUG: Target {target.name} is protected by the Monk.")
+            log.debug("Target %s is protected by the Monk.", target.name)
             return
 
         if target.role.name == "Soldier" and not self.is_drunk_or_poisoned(
             target, game
         ):
-            print(f"DEBUG: Target {target.name} is the Soldier and cannot be killed.")
+            log.debug(
+                "Target %s is the Soldier and cannot be killed.",
+                target.name,
+            )
             return
 
         if target.role.name == "Ravenkeeper":
-            print(
-                f"DEBUG: Ravenkeeper ({target.name}) is dying at night! Triggering their ability."
+            log.debug(
+                "Ravenkeeper (%s) is dying at night! Triggering their ability.",
+                target.name,
             )
             game.state.pending_deaths.add(target.seat)
-            game.state.history.append(f"{target.name} was killed in the night.")
+            game.state.log_event(EventKind.KILL, target.seat)
 
             checked = target.choose_ravenkeeper_reveal(game)
             shown_role = self.ravenkeeper_info(target, checked, game)
@@ -1342,57 +2240,61 @@ class DumbStorytellerAI(StorytellerAI):
                 "seen_player": checked.name if checked else None,
                 "seen_role": shown_role,
             }
-            print(
-                f"RAVENKEEPER INFO: {target.name} (dead) checked {checked.name}: role is {shown_role}"
+            log.info(
+                "RAVENKEEPER INFO: %s (dead) checked %s: role is %s",
+                target.name,
+                checked.name,
+                shown_role,
             )
             return
 
         if demon == target:
-            print(f"DEBUG: Imp is trying to star-pass (suicide).")
-            sw_candidates = [
-                p for p in game.players if p.role.name == "Scarlet Woman" and p.alive
-            ]
+            log.debug("Imp is trying to star-pass (suicide).")
+            sw_candidates = game.players_in(seats.alive & seats.role_mask("Scarlet Woman"))
             if sw_candidates:
                 sw = sw_candidates[0]
-                print(f"DEBUG: Scarlet Woman ({sw.name}) becomes new Imp.")
+                log.debug("Scarlet Woman (%s) becomes new Imp.", sw.name)
                 sw.role = Imp(self)
                 game.state.pending_deaths.add(demon.seat)
-                game.state.history.append(f"{target.name} was killed in the night.")
+                game.state.log_event(EventKind.KILL, target.seat)
                 return
-            minion_candidates = [
-                p
-                for p in game.players
-                if p.role.alignment == Alignment.MINION and p.alive and p != demon
-            ]
+            minion_candidates = game.players_in(
+                seats.alive
+                & seats.alignment_mask(Alignment.MINION)
+                & ~(1 << demon.seat)
+            )
             if minion_candidates:
-                new_imp = random.choice(minion_candidates)
-                print(
-                    f"DEBUG: No Scarlet Woman; {new_imp.name} (Minion) becomes the new Imp."
+                new_imp = self.rng.choice(minion_candidates)
+                log.debug(
+                    "No Scarlet Woman; %s (Minion) becomes the new Imp.",
+                    new_imp.name,
                 )
                 new_imp.role = Imp(self)
                 game.state.pending_deaths.add(demon.seat)
-                game.state.history.append(f"{target.name} was killed in the night.")
+                game.state.log_event(EventKind.KILL, target.seat)
                 return
             else:
-                print(f"DEBUG: Imp suicides, no one to inherit Demonhood.")
+                log.debug("Imp suicides, no one to inherit Demonhood.")
                 game.state.pending_deaths.add(demon.seat)
-                game.state.history.append(f"{target.name} was killed in the night.")
+                game.state.log_event(EventKind.KILL, target.seat)
                 return
 
-        print(f"DEBUG: Demon kill successful, {target.name} dies.")
+        log.debug("Demon kill successful, %s dies.", target.name)
         game.state.pending_deaths.add(target.seat)
-        game.state.history.append(f"{target.name} was killed in the night.")
+        game.state.log_event(EventKind.KILL, target.seat)
 
     def poison_player(self, poisoner, target, game):
-        if not hasattr(game.state, "poisoned"):
-            game.state.poisoned = set()
-        game.state.poisoned.add(target)
-        print(f"DEBUG: Poisoner ({poisoner.name}) poisons {target.name} this night.")
+        game.state.seats.set("poisoned", target.seat)
+        log.debug(
+            "Poisoner (%s) poisons %s this night.",
+            poisoner.name,
+            target.name,
+        )
 
     def spy_night_info(self, spy, game):
         role_map = {p.name: p.role.name for p in game.players}
         demon_bluffs = getattr(game.state, "demon_bluffs", [])
-        print(f"DEBUG: Spy ({spy.name}) sees all roles: {role_map}")
+        log.debug("Spy (%s) sees all roles: %s", spy.name, role_map)
         return {"all_roles": role_map, "demon_bluffs": demon_bluffs}
 
 
@@ -1483,7 +2385,8 @@ class Empath(Role):
                 if self.storyteller_ai.evil_for_empath(neighbor):
                     evil_count += 1
         empath_info = self.storyteller_ai.give_empath_info(player, game, evil_count)
-        player.memory.setdefault("night_results", []).append(
+        player.remember(
+            "night_results",
             {
                 "night": game.state.night,
                 "player1": left.name if left else None,
@@ -1501,7 +2404,8 @@ class FortuneTeller(Role):
     def night_action(self, player, game):
         pair = player.choose_fortune_teller_targets(game)
         is_ping = self.storyteller_ai.fortune_teller_result(player, pair, game)
-        player.memory.setdefault("night_results", []).append(
+        player.remember(
+            "night_results",
             {
                 "night": game.state.night,
                 "player1": pair[0].name if pair[0] else None,
@@ -1525,7 +2429,8 @@ class Undertaker(Role):
             return
         # Info may be fuzzed by StorytellerAI (e.g. for Recluse, poison, etc.)
         shown_role = self.storyteller_ai.undertaker_info(player, executed_player, game)
-        player.memory.setdefault("night_results", []).append(
+        player.remember(
+            "night_results",
             {
                 "night": game.state.night,
                 "executed_player": executed_player.name,
@@ -1543,7 +2448,8 @@ class Monk(Role):
         if game.state.night > 1:
             target = player.choose_monk_protect(game)
             self.storyteller_ai.monk_protect(player, target, game)
-            player.memory.setdefault("info", []).append(
+            player.remember(
+                "info",
                 {
                     "night": game.state.night,
                     "protected": target.name if target else None,
@@ -1608,7 +2514,8 @@ class Butler(Role):
     def night_action(self, player, game):
         target = player.choose_master(game)
         self.master = target
-        player.memory.setdefault("info", []).append(
+        player.remember(
+            "info",
             {
                 "night": game.state.night,
                 "master": target.name if target else None,
@@ -1700,8 +2607,6 @@ class Imp(Role):
 
 
 if __name__ == "__main__":
-    import sys
-
     # Alias this module as 'game' so the controller modules can import it
     sys.modules.setdefault("game", sys.modules[__name__])
 
@@ -0,0 +1,199 @@
+"""Typed, append-only log of public game events."""
+
+from __future__ import annotations
+
+from enum import Enum, auto
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+
+
+class EventKind(Enum):
+    KILL = auto()  # ``seat`` was killed in the night
+    DEATH = auto()  # ``seat`` was found dead at dawn
+    EXECUTION = auto()  # ``seat`` was executed
+    PROMOTION = auto()  # ``seat`` became the Imp after ``target`` died
+    ABILITY = auto()  # ``seat`` used a public ability; ``detail`` = (role, result)
+    NOMINATION = auto()  # ``seat`` nominated ``target``
+    VOTE = auto()  # ``seat`` voted for ``target``
+    CLAIM = auto()  # ``seat`` publicly claimed the role in ``detail``
+    PHASE = auto()  # the game moved to the ``Phase`` in ``detail``
+    INFO = auto()  # private, never logged: ``seat`` learned the memory in ``detail``
+
+
+DEATH_KINDS = (EventKind.KILL, EventKind.DEATH, EventKind.EXECUTION)
+# Deaths everyone knows about: night kills only become public at dawn
+ANNOUNCED_DEATH_KINDS = (EventKind.DEATH, EventKind.EXECUTION)
+
+
+class Event:
+    """A single public event, stamped with the day and night it happened."""
+
+    __slots__ = ("index", "kind", "day", "night", "seat", "target", "detail")
+
+    def __init__(self, index, kind, day, night, seat=None, target=None, detail=None):
+        self.index = index
+        self.kind = kind
+        self.day = day
+        self.night = night
+        self.seat = seat
+        self.target = target
+        self.detail = detail
+
+    def describe(self, names: Mapping[int, str]) -> Optional[str]:
+        """Return the English ``history`` line for this event, if it has one."""
+        kind = self.kind
+        if kind is EventKind.KILL:
+            return f"{names[self.seat]} was killed in the night."
+        if kind is EventKind.DEATH:
+            return f"{names[self.seat]} died last night."
+        if kind is EventKind.EXECUTION:
+            return f"{names[self.seat]} was executed on day {self.day}."
+        if kind is EventKind.PROMOTION:
+            return (
+                f"Scarlet Woman ({names[self.seat]}) becomes the new Imp after "
+                f"{names[self.target]} was killed."
+            )
+        if kind is EventKind.ABILITY:
+            role, result = self.detail
+            if role == "Slayer" and result:
+                return (
+                    f"The Slayer ({names[self.seat]}) shot {names[self.target]} "
+                    "and killed them!"
+                )
+            if role == "Saint":
+                if result:
+                    return "Saint was executed. Evil wins immediately."
+                return "Saint was executed while drunk/poisoned (no effect)."
+        return None
+
+    def __repr__(self) -> str:
+        return (
+            f"Event({self.index}, {self.kind.name}, day={self.day}, "
+            f"night={self.night}, seat={self.seat}, target={self.target}, "
+            f"detail={self.detail!r})"
+        )
+
+
+class EventLog:
+    """Append-only event list with per-seat and per-kind indexes.
+
+    Indexes hold event positions in increasing order, so a reader that only
+    may see the first ``end`` events (see ``EventCursor``) can stop early.
+    """
+
+    def __init__(self):
+        self._events: List[Event] = []
+        self._by_seat: Dict[int, List[int]] = {}
+        self._by_kind: Dict[EventKind, List[int]] = {}
+        # Called with each new event; not carried over by ``fork``
+        self.listeners: List[Callable[[Event], None]] = []
+
+    def record(self, kind, day, night, seat=None, target=None, detail=None) -> Event:
+        event = Event(len(self._events), kind, day, night, seat, target, detail)
+        self._events.append(event)
+        self._by_kind.setdefault(kind, []).append(event.index)
+        for s in (seat, target):
+            if s is not None:
+                positions = self._by_seat.setdefault(s, [])
+                if not positions or positions[-1] != event.index:
+                    positions.append(event.index)
+        for listener in self.listeners:
+            listener(event)
+        return event
+
+    def fork(self) -> "EventLog":
+        """Return a copy that shares the (immutable) events themselves."""
+        new = EventLog()
+        new._events = list(self._events)
+        new._by_seat = {seat: list(p) for seat, p in self._by_seat.items()}
+        new._by_kind = {kind: list(p) for kind, p in self._by_kind.items()}
+        return new
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __getitem__(self, index):
+        return self._events[index]
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self._events)
+
+    def cursor(self) -> "EventCursor":
+        """Return a read-only view of the events recorded so far."""
+        return EventCursor(self, len(self._events))
+
+    def _select(self, positions, end) -> List[Event]:
+        events = self._events
+        out = []
+        for i in positions:
+            if i >= end:
+                break
+            out.append(events[i])
+        return out
+
+    def for_seat(self, seat: int, end: Optional[int] = None) -> List[Event]:
+        """Return events in which ``seat`` is the actor or the target."""
+        end = len(self._events) if end is None else end
+        return self._select(self._by_seat.get(seat, ()), end)
+
+    def of_kind(self, kind: EventKind, end: Optional[int] = None) -> List[Event]:
+        end = len(self._events) if end is None else end
+        return self._select(self._by_kind.get(kind, ()), end)
+
+    def deaths(self, end: Optional[int] = None, kinds=DEATH_KINDS) -> Dict[int, Event]:
+        """Return ``{seat: event}`` for the first death event of each seat.
+
+        Pass ``kinds=ANNOUNCED_DEATH_KINDS`` for the deaths players know of.
+        """
+        end = len(self._events) if end is None else end
+        first: Dict[int, Event] = {}
+        for kind in kinds:
+            for event in self.of_kind(kind, end):
+                known = first.get(event.seat)
+                if known is None or event.index < known.index:
+                    first[event.seat] = event
+        return dict(sorted(first.items(), key=lambda item: item[1].index))
+
+    def history(self, names: Mapping[int, str], end: Optional[int] = None) -> List[str]:
+        """Return the English lines of the first ``end`` events."""
+        end = len(self._events) if end is None else end
+        lines = []
+        for event in self._events[:end]:
+            line = event.describe(names)
+            if line is not None:
+                lines.append(line)
+        return lines
+
+
+class EventCursor:
+    """The prefix of an ``EventLog`` that existed when the cursor was made.
+
+    Later events are invisible through the cursor, so a ``PlayerView`` keeps
+    seeing exactly what had happened when it was built without copying.
+    """
+
+    __slots__ = ("log", "end")
+
+    def __init__(self, log: EventLog, end: int):
+        self.log = log
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end
+
+    def __iter__(self) -> Iterator[Event]:
+        events = self.log._events
+        for i in range(self.end):
+            yield events[i]
+
+    def since(self, position: int) -> List[Event]:
+        """Return the visible events recorded at or after ``position``."""
+        return self.log._events[position : self.end]
+
+    def for_seat(self, seat: int) -> List[Event]:
+        return self.log.for_seat(seat, self.end)
+
+    def of_kind(self, kind: EventKind) -> List[Event]:
+        return self.log.of_kind(kind, self.end)
+
+    def deaths(self, kinds=DEATH_KINDS) -> Dict[int, Event]:
+        return self.log.deaths(self.end, kinds)
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import random
 import itertools
 from typing import List, Tuple
 
@@ -11,6 +10,7 @@ from deduction_engine import (
     deduction_pipeline,
     compute_role_probs,
 )
+from deduction_service import death_records, freeze
 from role_data import ONGOING_INFO_ROLES
 from game import (
     PlayerController,
@@ -18,25 +18,40 @@ from game import (
     PlayerView,
     player_role_counts,
     TROUBLE_BREWING_ROLES,
+    log,
 )
 
 
 class GoodPlayerController(PlayerController):
     """A simple AI for good players using deduction heuristics."""
 
+    supports_batch = True
+    wants_events = True
+
     def __init__(self):
         super().__init__()
         self._last_public = None
-
-    def _evil_imp_probs(self, player_view: PlayerView) -> Tuple[dict, dict]:
-        """Run deduction using only the provided ``PlayerView``."""
-        TB_ROLES = {
-            a.value if hasattr(a, "value") else a: roles
-            for a, roles in TROUBLE_BREWING_ROLES.items()
-        }
-        player_names = [name for name in player_view.seat_names.values()]
-        m_minions, outsider_count = player_role_counts(len(player_names))
-
+        # (fingerprint, worlds, evil_prob, imp_prob) of the last deduction
+        self._belief_cache = None
+        # False while no update arrived since the cache was last checked
+        self._stale = True
+
+    def on_event(self, update) -> None:
+        self._stale = True
+
+    def fork(self, player):
+        new = super().fork(player)
+        # The fork may be played by a wrapper that does not pass updates on
+        new._stale = True
+        return new
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_belief_cache"] = None
+        return state
+
+    def _deduction_claims(self, player_view: PlayerView) -> dict:
+        """Return public claims overlaid with this player's private info."""
         claims = {}
         for seat, name in player_view.seat_names.items():
             c = dict(player_view.public_claims.get(seat, {}) or {})
@@ -47,53 +62,52 @@ class GoodPlayerController(PlayerController):
                 if "info" in player_view.memory:
                     c.update(player_view.memory["info"])
             claims[name] = c
+        return claims
+
+    def _belief_fingerprint(self, player_view: PlayerView) -> tuple:
+        """Key of every ``PlayerView`` input that can change the deduction."""
+        memory = player_view.memory
+        return (
+            player_view.player_seat,
+            player_view.role_name,
+            freeze(player_view.public_claims),
+            freeze(memory.get("night_results")),
+            freeze(memory.get("info")),
+            tuple(player_view.alive_players),
+        )
 
-        try:
-            worlds = generate_all_worlds(
-                player_names,
-                TB_ROLES["Minion"],
-                m_minions,
-                claims,
-                TB_ROLES,
-                outsider_count,
-                deaths=[],
-                pov_player=self.player.name,
-            )
-            deduced = deduction_pipeline(worlds, TB_ROLES)
-            evil_prob, imp_prob = compute_role_probs(
-                deduced, player_names, TB_ROLES
-            )
-        except Exception as e:  # pragma: no cover - fallback for early bugs
-            print(f"Deduction error: {e}")
-            evil_prob = {name: 0.0 for name in player_names}
-            imp_prob = {name: 0.0 for name in player_names}
-        return evil_prob, imp_prob
+    def _beliefs(self, player_view: PlayerView):
+        """Return ``(worlds, evil_prob, imp_prob)`` for ``player_view``.
 
-    # Utility ---------------------------------------------------------------
-    def _alive_players(self, candidates: List[Player], player_view: PlayerView) -> List[Player]:
-        alive_seats = set(player_view.alive_players)
-        return [p for p in candidates if p.seat in alive_seats]
+        Votes, nominations and night choices within a day all ask the same
+        question, so the result is cached until the claims, this player's
+        memory or the alive set change. While no update has arrived through
+        ``on_event`` even the fingerprint check is skipped. When the game
+        provides a shared ``DeductionService`` the question is answered by
+        it instead.
+        """
+        if not self._stale and self._belief_cache is not None:
+            return self._belief_cache[1:]
+        key = self._belief_fingerprint(player_view)
+        if self._belief_cache is not None and self._belief_cache[0] == key:
+            self._stale = False
+            return self._belief_cache[1:]
+
+        claims = self._deduction_claims(player_view)
+        if player_view.deduction is not None:
+            result = player_view.deduction.beliefs(
+                self.player.name, claims[self.player.name]
+            )
+            self._belief_cache = (key, *result)
+            self._stale = False
+            return result
 
-    def _possible_worlds(self, player_view: PlayerView):
-        """Return all worlds consistent with this player's knowledge."""
         TB_ROLES = {
             a.value if hasattr(a, "value") else a: roles
             for a, roles in TROUBLE_BREWING_ROLES.items()
         }
         player_names = [name for name in player_view.seat_names.values()]
         m_minions, outsider_count = player_role_counts(len(player_names))
-
-        claims = {}
-        for seat, name in player_view.seat_names.items():
-            c = dict(player_view.public_claims.get(seat, {}) or {})
-            if seat == player_view.player_seat:
-                c["role"] = player_view.role_name
-                if "night_results" in player_view.memory:
-                    c["night_results"] = player_view.memory["night_results"]
-                if "info" in player_view.memory:
-                    c.update(player_view.memory["info"])
-            claims[name] = c
-
         worlds = generate_all_worlds(
             player_names,
             TB_ROLES["Minion"],
@@ -101,10 +115,58 @@ class GoodPlayerController(PlayerController):
             claims,
             TB_ROLES,
             outsider_count,
-            deaths=[],
+            deaths=death_records(player_view.events, player_view.seat_names),
             pov_player=self.player.name,
         )
-        return deduction_pipeline(worlds, TB_ROLES)
+        deduced = deduction_pipeline(worlds, TB_ROLES, dedupe=True)
+        evil_prob, imp_prob = compute_role_probs(deduced, player_names, TB_ROLES)
+        self._belief_cache = (key, deduced, evil_prob, imp_prob)
+        self._stale = False
+        return deduced, evil_prob, imp_prob
+
+    def _evil_imp_probs(self, player_view: PlayerView) -> Tuple[dict, dict]:
+        """Run deduction using only the provided ``PlayerView``."""
+        try:
+            _, evil_prob, imp_prob = self._beliefs(player_view)
+        except Exception:  # pragma: no cover - fallback for early bugs
+            log.exception("Deduction error")
+            player_names = list(player_view.seat_names.values())
+            evil_prob = {name: 0.0 for name in player_names}
+            imp_prob = {name: 0.0 for name in player_names}
+        return evil_prob, imp_prob
+
+    def _batch_probs(self, requests) -> list:
+        """Return ``(evil_prob, imp_prob)`` for each ``(player, view)`` request.
+
+        With a shared ``DeductionService`` every point of view is answered from
+        one enumeration; otherwise each controller deduces for itself.
+        """
+        service = requests[0][1].deduction if requests else None
+        if service is None:
+            return [p.controller._evil_imp_probs(pv) for p, pv in requests]
+        povs = []
+        for p, pv in requests:
+            claims = p.controller._deduction_claims(pv)
+            povs.append((p.name, claims[p.name]))
+        try:
+            by_pov = service.role_probs_by_pov(povs)
+        except Exception:  # pragma: no cover - fallback for early bugs
+            log.exception("Deduction error")
+            return [p.controller._evil_imp_probs(pv) for p, pv in requests]
+        return [by_pov[p.name] for p, _ in requests]
+
+    # Utility ---------------------------------------------------------------
+    def _alive_players(self, candidates: List[Player], player_view: PlayerView) -> List[Player]:
+        alive_seats = set(player_view.alive_players)
+        return [p for p in candidates if p.seat in alive_seats]
+
+    def _possible_worlds(self, player_view: PlayerView):
+        """Return all worlds consistent with this player's knowledge.
+
+        Identical worlds are merged, so callers should weight each world by
+        its ``multiplicity``.
+        """
+        return self._beliefs(player_view)[0]
 
     def _ft_ping(self, world, pair):
         names = [p.name for p in pair]
@@ -126,9 +188,11 @@ class GoodPlayerController(PlayerController):
         the controller declines to nominate anyone else, leading to fewer
         overall nominations.
         """
-        alive = self._alive_players(candidates, player_view)
         evil_prob, imp_prob = self._evil_imp_probs(player_view)
+        return self._nominate(candidates, player_view, evil_prob, imp_prob)
 
+    def _nominate(self, candidates, player_view, evil_prob, imp_prob):
+        alive = self._alive_players(candidates, player_view)
         others = [p for p in alive if p != self.player]
         if not others:
             return None
@@ -151,6 +215,9 @@ class GoodPlayerController(PlayerController):
         the nominee is more likely evil.
         """
         evil_prob, imp_prob = self._evil_imp_probs(player_view)
+        return self._vote(nominee, player_view, evil_prob, imp_prob)
+
+    def _vote(self, nominee, player_view, evil_prob, imp_prob) -> bool:
         num_alive = len(player_view.alive_players)
         final_three = num_alive <= 3
 
@@ -194,7 +261,23 @@ class GoodPlayerController(PlayerController):
         else:
             chance /= 2
         # Small baseline so highly suspected players are voted more often
-        return random.random() < max(chance, .3)
+        return self.rng.random() < max(chance, .3)
+
+    def choose_nominees(self, candidates, requests) -> list:
+        """Nominate for every ``(player, view)`` request from one deduction."""
+        probs = self._batch_probs(requests)
+        return [
+            p.controller._nominate(candidates, pv, evil_prob, imp_prob)
+            for (p, pv), (evil_prob, imp_prob) in zip(requests, probs)
+        ]
+
+    def cast_votes(self, nominee, requests) -> list:
+        """Vote for every ``(player, view)`` request from one deduction."""
+        probs = self._batch_probs(requests)
+        return [
+            p.controller._vote(nominee, pv, evil_prob, imp_prob)
+            for (p, pv), (evil_prob, imp_prob) in zip(requests, probs)
+        ]
 
     # Night actions --------------------------------------------------------
     def choose_fortune_teller_targets(self, candidates, player_view):
@@ -202,19 +285,20 @@ class GoodPlayerController(PlayerController):
         worlds = self._possible_worlds(player_view)
         others = [p for p in candidates if p != self.player]
         if len(others) < 2:
-            return tuple(random.sample(candidates, 2))
+            return tuple(self.rng.sample(candidates, 2))
 
         best_pair = None
         best_score = float("inf")
+        total = sum(w.multiplicity for w in worlds)
         for pair in itertools.combinations(others, 2):
-            true_count = sum(1 for w in worlds if self._ft_ping(w, pair))
-            false_count = len(worlds) - true_count
+            true_count = sum(w.multiplicity for w in worlds if self._ft_ping(w, pair))
+            false_count = total - true_count
             score = true_count ** 2 + false_count ** 2
             if score < best_score:
                 best_score = score
                 best_pair = pair
 
-        return best_pair if best_pair else tuple(random.sample(others, 2))
+        return best_pair if best_pair else tuple(self.rng.sample(others, 2))
 
     def choose_monk_protect(self, candidates, player_view):
 
@@ -230,7 +314,7 @@ class GoodPlayerController(PlayerController):
             score = prob_good
             if claim in info_roles:
                 score *= 1.5
-            score *= random.uniform(0.8, 1.2)
+            score *= self.rng.uniform(0.8, 1.2)
             if score > best_score:
                 best = p
                 best_score = score
@@ -254,13 +338,13 @@ class GoodPlayerController(PlayerController):
             counts = {}
             for w in worlds:
                 role = w.roles.get(t.name)
-                counts[role] = counts.get(role, 0) + 1
+                counts[role] = counts.get(role, 0) + w.multiplicity
             score = sum(c * c for c in counts.values())
             if score < best_score:
                 best_score = score
                 best_target = t
 
-        return best_target if best_target else (random.choice(others) if others else None)
+        return best_target if best_target else (self.rng.choice(others) if others else None)
 
     def share_info(self, player_view: PlayerView, context=None):
         # info = self.player.memory
@@ -278,11 +362,7 @@ class GoodPlayerController(PlayerController):
             self.player.claim = claim
             self._last_public = claim
             return {"public_claim": self.player.claim}
-        info = {
-            k: v
-            for k, v in self.player.memory.items()
-            if k != "received_info"
-        }
+        info = dict(self.player.memory)
         if info and info != self._last_public:
             self._last_public = info
             return {"public": info}
@@ -0,0 +1,83 @@
+"""Append-only log of the information players pass to each other."""
+
+from __future__ import annotations
+
+from heapq import merge
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+
+
+class Message:
+    """One ``info`` payload from seat ``sender``; ``recipient`` None is everyone."""
+
+    __slots__ = ("index", "sender", "recipient", "info")
+
+    def __init__(self, index, sender, recipient, info):
+        self.index = index
+        self.sender = sender
+        self.recipient = recipient
+        self.info = info
+
+    def as_received(self, names: Mapping[int, str]) -> dict:
+        """Return the ``{"from": name, "info": info}`` form players used to store."""
+        return {"from": names[self.sender], "info": self.info}
+
+    def __repr__(self) -> str:
+        return (
+            f"Message({self.index}, sender={self.sender}, "
+            f"recipient={self.recipient}, info={self.info!r})"
+        )
+
+
+class MessageBus:
+    """Game-wide message log with private channels.
+
+    A broadcast is stored once however many players can see it; a seat's
+    inbox is the broadcasts of other seats merged with its private channel.
+    Messages are never modified after posting, so views and forks share them.
+    """
+
+    def __init__(self):
+        self._messages: List[Message] = []
+        self._broadcasts: List[int] = []
+        self._private: Dict[int, List[int]] = {}
+        # Called with each new message; not carried over by ``fork``
+        self.listeners: List[Callable[[Message], None]] = []
+
+    def post(self, sender: int, info, recipient: Optional[int] = None) -> Message:
+        message = Message(len(self._messages), sender, recipient, info)
+        self._messages.append(message)
+        if recipient is None:
+            self._broadcasts.append(message.index)
+        else:
+            self._private.setdefault(recipient, []).append(message.index)
+        for listener in self.listeners:
+            listener(message)
+        return message
+
+    def fork(self) -> "MessageBus":
+        new = MessageBus()
+        new._messages = list(self._messages)
+        new._broadcasts = list(self._broadcasts)
+        new._private = {seat: list(p) for seat, p in self._private.items()}
+        return new
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages)
+
+    def inbox(self, seat: int, end: Optional[int] = None, start: int = 0) -> List[Message]:
+        """Return the messages ``seat`` can see among positions ``start:end``."""
+        end = len(self._messages) if end is None else end
+        messages = self._messages
+        out = []
+        for i in merge(self._broadcasts, self._private.get(seat, ())):
+            if i >= end:
+                break
+            if i >= start and messages[i].sender != seat:
+                out.append(messages[i])
+        return out
@@ -0,0 +1,582 @@
+"""Search controller that decides by simulating the rest of the game."""
+
+from __future__ import annotations
+
+import multiprocessing
+from typing import Dict, List, Optional, Tuple
+
+from evil_player_controller import EvilPlayerController
+from game import (
+    TROUBLE_BREWING_ROLES,
+    Alignment,
+    Drunk,
+    Game,
+    Player,
+    PlayerController,
+    PlayerView,
+    Phase,
+    create_role,
+    derive_rng,
+    fork_rng,
+    log,
+    player_role_counts,
+)
+from good_player_controller import GoodPlayerController
+from role_data import INFO_ROLES, ONGOING_INFO_ROLES
+
+EVIL_ROLES = set(
+    TROUBLE_BREWING_ROLES[Alignment.MINION] + TROUBLE_BREWING_ROLES[Alignment.DEMON]
+)
+GOOD_ROLES = [
+    r
+    for r in TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK] + TROUBLE_BREWING_ROLES[Alignment.OUTSIDER]
+    if r != "Drunk"
+]
+# Roles whose only info arrives on the first night
+FIRST_NIGHT_ROLES = INFO_ROLES - ONGOING_INFO_ROLES
+# Memory only evil players are given by ``Game.assign_evil_info_and_bluffs``
+EVIL_MEMORY = ("evil_team", "bluffs", "assigned_bluff", "bluff_plan", "confirmed_teammates")
+
+
+class _SeatRef:
+    """Picklable stand-in for a ``Player`` inside a recorded decision."""
+
+    __slots__ = ("seat",)
+
+    def __init__(self, seat: int):
+        self.seat = seat
+
+    def __eq__(self, other):
+        return isinstance(other, _SeatRef) and other.seat == self.seat
+
+    def __hash__(self):
+        return hash(("seat", self.seat))
+
+    def __repr__(self):
+        return f"seat{self.seat}"
+
+
+def _encode(answer):
+    if isinstance(answer, Player):
+        return _SeatRef(answer.seat)
+    if isinstance(answer, tuple):
+        return tuple(_encode(a) for a in answer)
+    return answer
+
+
+def _decode(code, game: Game):
+    if isinstance(code, _SeatRef):
+        return game.players[code.seat]
+    if isinstance(code, tuple):
+        return tuple(_decode(c, game) for c in code)
+    return code
+
+
+def _team(alignment) -> str:
+    return "Evil" if alignment in (Alignment.MINION, Alignment.DEMON) else "Good"
+
+
+class ScriptedController(PlayerController):
+    """Rollout stand-in for a searching player.
+
+    Replays the searched decisions the searcher already made this phase,
+    gives the ``forced`` answer to the decision under evaluation, then calls
+    ``on_forced`` (which re-seeds the rollout) and plays ``policy`` for the
+    rest of the game.
+    """
+
+    def __init__(
+        self, policy: PlayerController, game: Game, replay, forced, on_forced=None
+    ):
+        super().__init__()
+        self.policy = policy
+        self.player = policy.player
+        self.game = game
+        self._replay = list(replay)
+        self._forced = forced
+        self._on_forced = on_forced
+
+    @property
+    def rng(self):
+        return self.policy.rng
+
+    @rng.setter
+    def rng(self, value):
+        self.policy.rng = value
+
+    @property
+    def wants_events(self):
+        return self.policy.wants_events
+
+    def on_event(self, update) -> None:
+        self.policy.on_event(update)
+
+    def _decide(self, key, fallback):
+        if self._replay:
+            recorded, code = self._replay[0]
+            if recorded == key:
+                self._replay.pop(0)
+                return _decode(code, self.game)
+            # The rollout left the recorded line of play
+            self._replay = []
+        if self._forced is not None and self._forced[0] == key:
+            code = self._forced[1]
+            self._forced = None
+            if self._on_forced is not None:
+                self._on_forced()
+            return _decode(code, self.game)
+        return fallback()
+
+    # Searched decisions ----------------------------------------------------
+    def choose_nominee(self, candidates, player_view):
+        return self._decide(
+            "choose_nominee",
+            lambda: self.policy.choose_nominee(candidates, player_view),
+        )
+
+    def cast_vote(self, nominee, player_view):
+        return self._decide(
+            ("cast_vote", nominee.seat),
+            lambda: self.policy.cast_vote(nominee, player_view),
+        )
+
+    def choose_imp_kill(self, candidates, player_view):
+        return self._decide(
+            "choose_imp_kill",
+            lambda: self.policy.choose_imp_kill(candidates, player_view),
+        )
+
+    def choose_poisoner_target(self, candidates, player_view):
+        return self._decide(
+            "choose_poisoner_target",
+            lambda: self.policy.choose_poisoner_target(candidates, player_view),
+        )
+
+    def choose_monk_protect(self, candidates, player_view):
+        return self._decide(
+            "choose_monk_protect",
+            lambda: self.policy.choose_monk_protect(candidates, player_view),
+        )
+
+    # Delegated decisions ---------------------------------------------------
+    def choose_fortune_teller_targets(self, candidates, player_view):
+        return self.policy.choose_fortune_teller_targets(candidates, player_view)
+
+    def choose_ravenkeeper_reveal(self, candidates, player_view):
+        return self.policy.choose_ravenkeeper_reveal(candidates, player_view)
+
+    def choose_master(self, candidates, player_view):
+        return self.policy.choose_master(candidates, player_view)
+
+    def share_info(self, player_view, context=None):
+        return self.policy.share_info(player_view, context)
+
+
+# Determinization ---------------------------------------------------------
+def _own_claim(player_view: PlayerView) -> dict:
+    """Return the claim the viewer would make knowing their own info."""
+    claim = dict(player_view.public_claims.get(player_view.player_seat, {}) or {})
+    claim["role"] = player_view.role_name
+    memory = player_view.memory
+    if "night_results" in memory:
+        claim["night_results"] = memory["night_results"]
+    if isinstance(memory.get("info"), dict):
+        claim.update(memory["info"])
+    return claim
+
+
+def belief_worlds(player_view: PlayerView, player: Player) -> list:
+    """Return the deduced worlds ``player`` considers possible.
+
+    Good players ask the shared ``DeductionService`` from their own point of
+    view. Evil players know their team, so they keep the public worlds that
+    place the evil team exactly where it is.
+    """
+    service = player_view.deduction
+    if service is None:
+        return []
+    if _team(player.role.alignment) == "Good":
+        return service.worlds(player.name, _own_claim(player_view))
+    team = {info["name"] for info in player_view.memory.get("evil_team", ())}
+    team.add(player.name)
+    return [
+        w for w in service.worlds()
+        if {n for n, r in w.roles.items() if r in EVIL_ROLES} == team
+    ]
+
+
+def sample_roles(player_view: PlayerView, player: Player, worlds: list, rng) -> tuple:
+    """Draw one hidden-role assignment that ``player`` finds possible.
+
+    Returns ``(roles, red_herring)``: ``roles`` maps each seat to a
+    ``(role, cover, claim)`` triple, or to ``None`` to keep the seat's role.
+    ``cover`` is a Drunk's believed role and ``claim`` the public claim the
+    new role explains, if any; ``red_herring`` is a seat or ``None``.
+    A world is drawn from ``worlds`` by multiplicity; without any, the evil
+    team is placed at random among the seats ``player`` cannot rule out.
+    Unknown good roles are read from public claims where possible, and
+    after the first night are never roles that only learn on it. Evil
+    searchers keep their team's true roles.
+    """
+    names = player_view.seat_names
+    evil = _team(player.role.alignment) == "Evil"
+    red_herring = None
+    if worlds:
+        seat_of = {name: seat for seat, name in names.items()}
+        world = rng.choices(worlds, weights=[w.multiplicity for w in worlds])[0]
+        drawn = {seat_of[name]: role for name, role in world.roles.items()}
+        red_herring = seat_of.get(world.red_herring)
+    elif evil:
+        drawn = {}
+    else:
+        minion_count, _ = player_role_counts(len(names))
+        others = [seat for seat in names if seat != player.seat]
+        demon, *minions = rng.sample(others, minion_count + 1)
+        minion_roles = rng.sample(TROUBLE_BREWING_ROLES[Alignment.MINION], minion_count)
+        drawn = {demon: "Imp", player.seat: player_view.role_name}
+        drawn.update(zip(minions, minion_roles))
+    if evil:
+        for info in player_view.memory.get("evil_team", ()):
+            drawn[info["seat"]] = None
+        drawn[player.seat] = None
+
+    roles: Dict[int, Optional[tuple]] = {}
+    taken = {role for role in drawn.values() if role not in (None, "Good", "Drunk")}
+    # Too late to learn: an unclaimed seat would have nothing to claim
+    late = (
+        FIRST_NIGHT_ROLES
+        if player_view.night > 1 or player_view.phase == Phase.DAY
+        else set()
+    )
+    fresh = [r for r in GOOD_ROLES if r not in late]
+    for seat in names:
+        role = drawn.get(seat, "Good")
+        public = player_view.public_claims.get(seat) or {}
+        claimed = player_view.role_name if seat == player.seat else public.get("role")
+        if role is None:
+            roles[seat] = None
+            continue
+        if role == "Drunk":
+            if claimed not in TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK]:
+                claimed = rng.choice(TROUBLE_BREWING_ROLES[Alignment.TOWNSFOLK])
+            role, cover = "Drunk", claimed
+        elif role == "Good":
+            if claimed not in GOOD_ROLES or claimed in taken:
+                claimed = rng.choice([r for r in fresh if r not in taken] or fresh)
+            taken.add(claimed)
+            role, cover = claimed, None
+        else:
+            cover = None
+        explained = (cover or role) == public.get("role") and seat != player.seat
+        roles[seat] = (role, cover, dict(public) if explained else None)
+    return roles, red_herring
+
+
+def determinize(game: Game, roles: dict, red_herring=None) -> None:
+    """Give the players of ``game`` the hidden roles drawn by ``sample_roles``.
+
+    Players who change team get a default controller for their new team
+    and the evil team's memory is rebuilt. Seats whose role is unchanged
+    keep their ``Role`` objects and whatever state those carry.
+    """
+    ais = game.storytellers()
+    ai = ais[0] if ais else None
+    seats = game.state.seats
+    flipped = False
+    for p in game.players:
+        entry = roles.get(p.seat)
+        if entry is None:
+            continue
+        name, cover, claim = entry
+        old = p.role
+        if old.name == name and getattr(old, "cover_role_name", None) == cover:
+            continue
+        p.role = Drunk(ai, cover_role_name=cover) if name == "Drunk" else create_role(name, ai)
+        seats.set("drunk", p.seat, name == "Drunk")
+        if (cover or name) != (getattr(old, "cover_role_name", None) or old.name):
+            # What the old role learned does not belong to the new one; a
+            # seat that already claimed the new role learned what it claimed
+            p.memory.pop("info", None)
+            p.memory.pop("night_results", None)
+            if claim is not None:
+                info = {k: v for k, v in claim.items() if k not in ("role", "night_results")}
+                if info:
+                    p.memory["info"] = info
+                if claim.get("night_results"):
+                    p.memory["night_results"] = list(claim["night_results"])
+        team = _team(p.role.alignment)
+        if team != _team(old.alignment):
+            flipped = True
+            controller = EvilPlayerController() if team == "Evil" else GoodPlayerController()
+            controller.set_player(p)
+            controller.rng = fork_rng(p.controller.rng)
+            p.controller = controller
+    if flipped:
+        _rebuild_evil_memory(game)
+        game._refresh_listeners()
+    if getattr(game.state, "red_herring", None) is not None:
+        if red_herring is not None:
+            game.state.red_herring = game.players[red_herring]
+        elif ai is not None:
+            # The true red herring is hidden from the searcher
+            game.state.red_herring = ai.pick_red_herring(game)
+
+
+def _rebuild_evil_memory(game: Game) -> None:
+    """Tell a determinized evil team who they are, as role assignment does."""
+    evil_team = [p for p in game.players if _team(p.role.alignment) == "Evil"]
+    team_info = [
+        {"name": p.name, "alignment": p.role.alignment, "seat": p.seat} for p in evil_team
+    ]
+    bluffs = list(getattr(game.state, "demon_bluffs", None) or [])
+    plan = {}
+    for p in evil_team:
+        claimed = (p.claim or {}).get("role")
+        plan[p.name] = claimed or p.memory.get("assigned_bluff") or (bluffs[0] if bluffs else None)
+    for p in game.players:
+        if p not in evil_team:
+            for key in EVIL_MEMORY:
+                p.memory.pop(key, None)
+            continue
+        p.memory["evil_team"] = team_info
+        p.memory["bluffs"] = bluffs
+        p.memory["bluff_plan"] = plan
+        p.memory["assigned_bluff"] = plan[p.name]
+
+
+def run_rollouts(
+    snapshot: Game, seat: int, replay, forced, seeds, team: str, worlds=None
+) -> int:
+    """Play one rollout per seed from ``snapshot`` and return the wins of ``team``.
+
+    ``worlds`` holds one ``sample_roles`` draw per seed. Each rollout first
+    gives the players those hidden roles, so the searcher plays against
+    what it believes rather than against the true setup. The searcher in
+    ``seat`` replays ``replay`` and then answers ``forced``; at that point
+    the rollout is re-seeded so each seed explores a different
+    continuation. Everyone else is played by their forked controllers.
+    """
+    wins = 0
+    for i, seed in enumerate(seeds):
+        game = snapshot.fork()
+        if worlds is not None:
+            determinize(game, *worlds[i])
+        player = game.players[seat]
+        policy = player.controller
+
+        def diverge(game=game, seed=seed):
+            game.reseed(seed)
+
+        player.controller = ScriptedController(policy, game, replay, forced, diverge)
+        result = game.run(verbose=False)
+        winner = "Good" if result and result.lower().startswith("good") else "Evil"
+        wins += winner == team
+    return wins
+
+
+def _rollout_task(args) -> int:
+    return run_rollouts(*args)
+
+
+class RolloutController(PlayerController):
+    """Choose nominations, votes and night targets by Monte Carlo rollouts.
+
+    ``policy`` is the heuristic controller (good or evil) used for every
+    decision that is not searched and to play all seats inside rollouts.
+    For each candidate answer the controller plays ``rollouts`` games to the
+    end from a snapshot of the current phase and picks the answer with the
+    best win rate for its team. Before each rollout the hidden roles are
+    redrawn from the searcher's own beliefs (``belief_worlds``), so search
+    only exploits what the seat could know. Rollout ``i`` uses the same
+    draw for every answer, so answers are compared on the same worlds.
+
+    Win counts are pooled while the game state, the searcher's memory and
+    the searcher's earlier decisions this phase are unchanged, so a
+    sibling decision asking the same question (e.g. nominations asked
+    again before anything happened) only tops up the budget.
+
+    ``jobs > 1`` spreads rollouts over a process pool; this needs a seeded
+    game so the snapshot can be pickled, and otherwise runs in process.
+    The pool is closed when the game ends, or use the controller as a
+    context manager. Other search controllers are played by their policies
+    inside rollouts.
+    """
+
+    wants_snapshots = True
+
+    def __init__(self, policy: PlayerController, rollouts: int = 8, jobs: int = 1):
+        super().__init__()
+        self.policy = policy
+        self.rollouts = rollouts
+        self.jobs = jobs
+        self._snapshot: Optional[Game] = None
+        self._phase_key = None
+        self._log: List[Tuple] = []
+        # (context, method key, answer code) -> [wins, rollouts] this phase
+        self._stats: Dict[tuple, List[int]] = {}
+        self._pool = None
+
+    @property
+    def rng(self):
+        return self.policy.rng
+
+    @rng.setter
+    def rng(self, value):
+        self.policy.rng = value
+
+    @property
+    def wants_events(self):
+        return self.policy.wants_events
+
+    def on_event(self, update) -> None:
+        self.policy.on_event(update)
+
+    def set_player(self, player):
+        super().set_player(player)
+        self.policy.set_player(player)
+
+    def fork(self, player):
+        # Inside forks (and so inside rollouts) the policy plays this seat
+        return self.policy.fork(player)
+
+    def on_phase_start(self, snapshot: Game) -> None:
+        self._snapshot = snapshot
+        self._phase_key = (snapshot.state.day, snapshot.state.night, snapshot.state.phase)
+        self._log = []
+        self._stats = {}
+
+    def on_game_over(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the rollout process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_snapshot"] = None
+        return state
+
+    # Search ----------------------------------------------------------------
+    def _worlds(self, player_view: PlayerView, context: str) -> list:
+        """Return one ``sample_roles`` draw per rollout index for ``context``."""
+        try:
+            worlds = belief_worlds(player_view, self.player)
+        except Exception:  # pragma: no cover - fallback for early bugs
+            log.exception("Deduction error")
+            worlds = []
+        return [
+            sample_roles(player_view, self.player, worlds, derive_rng(context, f"world:{i}"))
+            for i in range(self.rollouts)
+        ]
+
+    def _win_rates(self, key, options, player_view: PlayerView) -> list:
+        snapshot = self._snapshot
+        seat = self.player.seat
+        team = _team(self.player.role.alignment)
+        replay = tuple(self._log)
+        # Answers are only comparable, and counts only poolable, from the
+        # same point of the game
+        context = (player_view.version, self.player.memory.version, replay)
+        base = f"{snapshot.seed}:rollout:{self._phase_key}:{context[:2]}:{len(replay)}"
+        worlds = None
+        tasks, pending = [], []
+        for code in options:
+            wins, n = self._stats.setdefault((context, key, code), [0, 0])
+            if n >= self.rollouts:
+                continue
+            if worlds is None:
+                worlds = self._worlds(player_view, base)
+            indices = list(range(n, self.rollouts))
+            # Split each answer's rollouts so every worker gets a share
+            chunks = max(1, min(self.jobs, len(indices)))
+            for c in range(chunks):
+                share = indices[c::chunks]
+                seeds = [f"{base}:{key}:{code!r}:{i}" for i in share]
+                tasks.append(
+                    (snapshot, seat, replay, (key, code), seeds, team, [worlds[i] for i in share])
+                )
+                pending.append(code)
+
+        results = None
+        if tasks and self.jobs > 1 and snapshot.seed is not None:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self.jobs)
+            results = self._pool.map(_rollout_task, tasks)
+        elif tasks:
+            results = [_rollout_task(t) for t in tasks]
+
+        for code, task, wins in zip(pending, tasks, results or ()):
+            entry = self._stats[(context, key, code)]
+            entry[0] += wins
+            entry[1] += len(task[4])
+        rates = []
+        for code in options:
+            wins, n = self._stats[(context, key, code)]
+            rates.append(wins / n if n else 0.0)
+        return rates
+
+    def _search(self, key, options: list, player_view: PlayerView):
+        """Return the best of ``options`` and record it for phase replays."""
+        codes = [_encode(o) for o in options]
+        if len(options) == 1 or self._snapshot is None:
+            choice = 0
+        else:
+            rates = self._win_rates(key, codes, player_view)
+            choice = max(range(len(options)), key=lambda i: rates[i])
+        self._log.append((key, codes[choice]))
+        return options[choice]
+
+    # Searched decisions ----------------------------------------------------
+    def _alive_others(self, candidates, player_view: PlayerView) -> list:
+        alive = set(player_view.alive_players)
+        return [p for p in candidates if p.seat in alive and p is not self.player]
+
+    def choose_nominee(self, candidates, player_view):
+        options = [None] + self._alive_others(candidates, player_view)
+        return self._search("choose_nominee", options, player_view)
+
+    def cast_vote(self, nominee, player_view):
+        return self._search(("cast_vote", nominee.seat), [False, True], player_view)
+
+    def choose_imp_kill(self, candidates, player_view):
+        alive = set(player_view.alive_players)
+        options = [p for p in candidates if p.seat in alive]
+        if not options:
+            return self.policy.choose_imp_kill(candidates, player_view)
+        return self._search("choose_imp_kill", options, player_view)
+
+    def choose_poisoner_target(self, candidates, player_view):
+        options = [p for p in candidates if p is not self.player]
+        if not options:
+            return self.policy.choose_poisoner_target(candidates, player_view)
+        return self._search("choose_poisoner_target", options, player_view)
+
+    def choose_monk_protect(self, candidates, player_view):
+        options = [p for p in candidates if p is not self.player]
+        if not options:
+            return self.policy.choose_monk_protect(candidates, player_view)
+        return self._search("choose_monk_protect", options, player_view)
+
+    # Delegated decisions ---------------------------------------------------
+    def choose_fortune_teller_targets(self, candidates, player_view):
+        return self.policy.choose_fortune_teller_targets(candidates, player_view)
+
+    def choose_ravenkeeper_reveal(self, candidates, player_view):
+        return self.policy.choose_ravenkeeper_reveal(candidates, player_view)
+
+    def choose_master(self, candidates, player_view):
+        return self.policy.choose_master(candidates, player_view)
+
+    def share_info(self, player_view, context=None):
+        return self.policy.share_info(player_view, context)
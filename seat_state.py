@@ -0,0 +1,146 @@
+"""Seat-indexed player flags stored as integer bitmasks."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, Mapping, Optional
+
+
+def iter_seats(mask: int) -> Iterator[int]:
+    """Yield the seats set in ``mask`` in increasing order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def count_seats(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class SeatState:
+    """Per-seat flags of a game, one bit per seat in each mask.
+
+    ``alive`` and ``dead`` track deaths (``dead`` only the ones the game has
+    recorded), ``pending`` the deaths queued for dawn, and ``poisoned`` and
+    ``drunk`` the players whose abilities malfunction. Masks are plain ints,
+    so copying a ``SeatState`` is cheap and every test is a shift and a mask.
+
+    ``roles`` and ``alignments`` index the seats holding each role name and
+    alignment; ``Player`` keeps them current whenever its role changes.
+    """
+
+    __slots__ = (
+        "size", "alive", "dead", "pending", "poisoned", "drunk", "roles", "alignments"
+    )
+
+    FLAGS = ("alive", "dead", "pending", "poisoned", "drunk")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.alive = (1 << size) - 1
+        self.dead = 0
+        self.pending = 0
+        self.poisoned = 0
+        self.drunk = 0
+        self.roles: Dict[str, int] = {}
+        self.alignments: Dict[object, int] = {}
+
+    def copy(self) -> "SeatState":
+        new = SeatState.__new__(SeatState)
+        new.size = self.size
+        for flag in self.FLAGS:
+            setattr(new, flag, getattr(self, flag))
+        new.roles = dict(self.roles)
+        new.alignments = dict(self.alignments)
+        return new
+
+    def has(self, flag: str, seat: int) -> bool:
+        return (getattr(self, flag) >> seat) & 1 == 1
+
+    def set(self, flag: str, seat: int, value: bool = True) -> None:
+        bit = 1 << seat
+        if seat >= self.size:
+            self.size = seat + 1
+        mask = getattr(self, flag)
+        setattr(self, flag, mask | bit if value else mask & ~bit)
+
+    def move_role(self, seat: int, old, new) -> None:
+        """Re-index ``seat`` from role ``old`` to role ``new`` (either may be None)."""
+        bit = 1 << seat
+        if old is not None:
+            self.roles[old.name] = self.roles.get(old.name, 0) & ~bit
+            self.alignments[old.alignment] = self.alignments.get(old.alignment, 0) & ~bit
+        if new is not None:
+            self.roles[new.name] = self.roles.get(new.name, 0) | bit
+            self.alignments[new.alignment] = self.alignments.get(new.alignment, 0) | bit
+
+    def role_mask(self, name: str) -> int:
+        return self.roles.get(name, 0)
+
+    def alignment_mask(self, *alignments) -> int:
+        mask = 0
+        for alignment in alignments:
+            mask |= self.alignments.get(alignment, 0)
+        return mask
+
+    def living(self) -> int:
+        """Mask of players who are alive and not dying at dawn."""
+        return self.alive & ~self.pending
+
+    def impaired(self, seat: int) -> bool:
+        """True if the player in ``seat`` is drunk or poisoned."""
+        return ((self.poisoned | self.drunk) >> seat) & 1 == 1
+
+    def __repr__(self) -> str:
+        flags = ", ".join(
+            f"{flag}={list(iter_seats(getattr(self, flag)))}" for flag in self.FLAGS
+        )
+        return f"SeatState({flags})"
+
+
+class SeatFlags:
+    """Set-like view of one ``SeatState`` flag for code written against sets.
+
+    Members may be given as seats or as ``Player`` objects. Iteration yields
+    seats, or the players from ``players`` when a seat mapping is supplied.
+    """
+
+    __slots__ = ("_state", "_flag", "_players")
+
+    def __init__(self, state: SeatState, flag: str, players: Optional[Mapping] = None):
+        self._state = state
+        self._flag = flag
+        self._players = players
+
+    @staticmethod
+    def _seat(item):
+        return getattr(item, "seat", item)
+
+    def __contains__(self, item) -> bool:
+        seat = self._seat(item)
+        return isinstance(seat, int) and self._state.has(self._flag, seat)
+
+    def add(self, item) -> None:
+        self._state.set(self._flag, self._seat(item))
+
+    def discard(self, item) -> None:
+        self._state.set(self._flag, self._seat(item), False)
+
+    def clear(self) -> None:
+        setattr(self._state, self._flag, 0)
+
+    def __iter__(self):
+        seats = iter_seats(getattr(self._state, self._flag))
+        if self._players is None:
+            return seats
+        players = self._players
+        return (players[s] for s in seats)
+
+    def __len__(self) -> int:
+        return count_seats(getattr(self._state, self._flag))
+
+    def __bool__(self) -> bool:
+        return getattr(self._state, self._flag) != 0
+
+    def __repr__(self) -> str:
+        return f"{{{', '.join(repr(x) for x in self)}}}"
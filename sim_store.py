@@ -0,0 +1,309 @@
+"""Columnar, append-only store of simulated games.
+
+A store is a directory holding one flat binary file per column plus a
+``meta.json`` with the code books and the number of committed games::
+
+    roles.u8       role code of every seat, ``MAX_SEATS`` per game (255 = empty)
+    players.u8     player count
+    winner.u8      0 = Good, 1 = Evil
+    nights.u8      nights played
+    executions.u8  executions
+    controller.u8  controller version code
+    seeds.txt      one game seed per line (empty for unseeded games)
+
+Columns are memory-mapped with NumPy when it is installed and read into
+``array`` objects otherwise; aggregation is vectorised over whole columns
+in the first case and a plain loop in the second.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from typing import Dict, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from game import TROUBLE_BREWING_ROLES, Alignment
+
+MAX_SEATS = 15
+EMPTY = 255
+TEAMS = ("Good", "Evil")
+COLUMNS = ("players", "winner", "nights", "executions", "controller")
+GROUPINGS = (None, "players", "seat", "setup", "controller")
+
+# Team each role plays for, to score games from their stored records
+ROLE_TEAMS = {
+    name: "Good" if alignment in (Alignment.TOWNSFOLK, Alignment.OUTSIDER) else "Evil"
+    for alignment, names in TROUBLE_BREWING_ROLES.items()
+    for name in names
+}
+
+
+class SimStore:
+    """Append game records to, and aggregate over, the store at ``path``.
+
+    Rows past the committed game count are invisible to readers. Open with
+    ``repair`` to cut them off before appending; a plain open never writes,
+    so it is safe to read a store another process is appending to.
+    """
+
+    def __init__(self, path: str, repair: bool = False):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"max_seats": MAX_SEATS, "roles": [], "controllers": [], "games": 0}
+        if repair:
+            self._discard_uncommitted()
+
+    def __len__(self) -> int:
+        return self.meta["games"]
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _discard_uncommitted(self) -> None:
+        """Cut columns back to the committed game count after a crash."""
+        games = self.meta["games"]
+        sizes = {"roles.u8": games * MAX_SEATS}
+        sizes.update({f"{c}.u8": games for c in COLUMNS})
+        for name, size in sizes.items():
+            path = self._file(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+        seeds = self._file("seeds.txt")
+        if os.path.exists(seeds):
+            with open(seeds, "rb") as f:
+                data = f.read()
+            # A torn last seed has no newline yet and goes first
+            kept = data[: data.rfind(b"\n") + 1]
+            if kept.count(b"\n") > games:
+                lines = kept.split(b"\n")[:games]
+                kept = b"".join(line + b"\n" for line in lines)
+            if kept != data:
+                with open(seeds, "r+b") as f:
+                    f.truncate(len(kept))
+
+    @staticmethod
+    def _code(book: list, value: str) -> int:
+        try:
+            return book.index(value)
+        except ValueError:
+            if len(book) >= EMPTY:
+                raise ValueError(f"too many distinct values: {value!r}")
+            book.append(value)
+            return len(book) - 1
+
+    # Writing ---------------------------------------------------------------
+    def append(self, records: Iterable[dict]) -> int:
+        """Append ``play_game`` records and commit them; return how many."""
+        roles_book = self.meta["roles"]
+        controllers = self.meta["controllers"]
+        roles = array("B")
+        cols = {c: array("B") for c in COLUMNS}
+        seeds = []
+        for record in records:
+            row = [self._code(roles_book, r) for r in record["roles"]]
+            if len(row) > MAX_SEATS:
+                raise ValueError(f"games are limited to {MAX_SEATS} seats")
+            roles.extend(row + [EMPTY] * (MAX_SEATS - len(row)))
+            cols["players"].append(record["players"])
+            cols["winner"].append(TEAMS.index(record["winner"]))
+            cols["nights"].append(min(record["nights"], EMPTY))
+            cols["executions"].append(min(record["executions"], EMPTY))
+            controller = record.get("controller", "default")
+            cols["controller"].append(self._code(controllers, controller))
+            seeds.append("" if record["seed"] is None else str(record["seed"]))
+        if not seeds:
+            return 0
+        with open(self._file("roles.u8"), "ab") as f:
+            roles.tofile(f)
+        for name, col in cols.items():
+            with open(self._file(f"{name}.u8"), "ab") as f:
+                col.tofile(f)
+        with open(self._file("seeds.txt"), "a", encoding="utf-8") as f:
+            f.write("".join(seed + "\n" for seed in seeds))
+        # Rewriting the game count last is what commits the new rows
+        self.meta["games"] += len(seeds)
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._file("meta.json"))
+        return len(seeds)
+
+    # Reading ---------------------------------------------------------------
+    def column(self, name: str):
+        """Return column ``name`` (``roles`` is flat, ``MAX_SEATS`` per game)."""
+        size = len(self) * (MAX_SEATS if name == "roles" else 1)
+        path = self._file(f"{name}.u8")
+        if np is not None:
+            if size == 0:
+                return np.zeros(0, dtype=np.uint8)
+            return np.memmap(path, dtype=np.uint8, mode="r", shape=(size,))
+        col = array("B")
+        if size:
+            with open(path, "rb") as f:
+                col.fromfile(f, size)
+        return col
+
+    def seeds(self) -> list:
+        with open(self._file("seeds.txt"), encoding="utf-8") as f:
+            return [line.rstrip("\n") or None for line in f][: len(self)]
+
+    def _role_is_evil(self) -> list:
+        return [ROLE_TEAMS.get(r) == "Evil" for r in self.meta["roles"]]
+
+    def aggregate(self, by: Optional[str] = None) -> Dict[object, dict]:
+        """Return ``{group: {"games", "teams", "roles"}}`` win counts.
+
+        ``teams`` maps team to games won and ``roles`` maps role to
+        ``[wins, total]``, like ``simulate_games.SimStats``. ``by`` is one of
+        ``GROUPINGS``; without it everything is one group, ``None``. Grouped
+        by seat, a game counts towards every seat it filled.
+        """
+        if by not in GROUPINGS:
+            raise ValueError(f"by must be one of {GROUPINGS}")
+        if len(self) == 0:
+            return {}
+        if np is None:
+            return self._aggregate_loop(by)
+        return self._aggregate_numpy(by)
+
+    def _labels(self, by, keys) -> list:
+        if by == "controller":
+            return [self.meta["controllers"][k] for k in keys]
+        return [int(k) for k in keys]
+
+    def _aggregate_numpy(self, by):
+        games = len(self)
+        roles = np.asarray(self.column("roles")).reshape(games, MAX_SEATS)
+        winner = np.asarray(self.column("winner")).astype(np.int64)
+        filled = roles != EMPTY
+        is_evil = np.zeros(EMPTY + 1, dtype=np.int64)
+        is_evil[: len(self.meta["roles"])] = self._role_is_evil()
+        won = is_evil[roles] == winner[:, None]
+
+        if by is None:
+            game_group = np.zeros(games, dtype=np.int64)
+            labels = [None]
+        elif by == "setup":
+            # One opaque MAX_SEATS-byte key per game sorts far faster than rows
+            rows = np.ascontiguousarray(np.sort(roles, axis=1))
+            keys = rows.view(np.dtype((np.void, MAX_SEATS))).reshape(-1)
+            unique, game_group = np.unique(keys, return_inverse=True)
+            unique = unique.view(np.uint8).reshape(-1, MAX_SEATS)
+            game_group = game_group.reshape(-1)
+            book = self.meta["roles"]
+            labels = [", ".join(book[c] for c in row if c != EMPTY) for row in unique]
+        elif by == "seat":
+            game_group = None
+            labels = list(range(MAX_SEATS))
+        else:
+            keys, game_group = np.unique(
+                np.asarray(self.column(by)), return_inverse=True
+            )
+            labels = self._labels(by, keys)
+
+        if game_group is None:
+            cell_group = np.broadcast_to(np.arange(MAX_SEATS), roles.shape)
+        else:
+            cell_group = np.broadcast_to(game_group[:, None], roles.shape)
+        n_groups = len(labels)
+        n_roles = EMPTY + 1
+
+        # Team results: once per game, or once per filled seat
+        if game_group is None:
+            team_keys = (cell_group * 2 + winner[:, None])[filled]
+        else:
+            team_keys = game_group * 2 + winner
+        teams = np.bincount(team_keys, minlength=n_groups * 2).reshape(n_groups, 2)
+
+        role_keys = (cell_group * n_roles + roles)[filled]
+        totals = np.bincount(role_keys, minlength=n_groups * n_roles)
+        wins = np.bincount(
+            role_keys, weights=won[filled], minlength=n_groups * n_roles
+        ).astype(np.int64)
+        totals = totals.reshape(n_groups, n_roles)
+        wins = wins.reshape(n_groups, n_roles)
+
+        book = self.meta["roles"]
+        out = {}
+        for g, label in enumerate(labels):
+            played = int(teams[g].sum())
+            if played == 0:
+                continue
+            out[label] = {
+                "games": played,
+                "teams": {team: int(teams[g, i]) for i, team in enumerate(TEAMS)},
+                "roles": {
+                    book[c]: [int(wins[g, c]), int(totals[g, c])]
+                    for c in np.flatnonzero(totals[g])
+                },
+            }
+        return out
+
+    def _aggregate_loop(self, by):
+        roles = self.column("roles")
+        winner = self.column("winner")
+        column = self.column(by) if by in COLUMNS else None
+        is_evil = self._role_is_evil()
+        book = self.meta["roles"]
+        out: Dict[object, dict] = {}
+
+        def group(label):
+            if label not in out:
+                out[label] = {"games": 0, "teams": dict.fromkeys(TEAMS, 0), "roles": {}}
+            return out[label]
+
+        for g in range(len(self)):
+            row = [c for c in roles[g * MAX_SEATS : (g + 1) * MAX_SEATS] if c != EMPTY]
+            win = winner[g]
+            if by is None:
+                label = None
+            elif by == "setup":
+                label = ", ".join(book[c] for c in sorted(row))
+            elif by == "seat":
+                label = None
+            else:
+                label = self._labels(by, [column[g]])[0]
+            for seat, code in enumerate(row):
+                entry = group(seat if by == "seat" else label)
+                if by == "seat":
+                    entry["games"] += 1
+                    entry["teams"][TEAMS[win]] += 1
+                counts = entry["roles"].setdefault(book[code], [0, 0])
+                counts[1] += 1
+                counts[0] += is_evil[code] == win
+            if by != "seat":
+                entry = group(label)
+                entry["games"] += 1
+                entry["teams"][TEAMS[win]] += 1
+        return out
+
+
+class StoreWriter:
+    """Buffer records and append them to a ``SimStore`` every ``batch`` games."""
+
+    def __init__(self, store: SimStore, batch: int = 1000):
+        self.store = store
+        self.batch = batch
+        self._pending: list = []
+
+    def write(self, record: dict) -> None:
+        self._pending.append(record)
+        if len(self._pending) >= self.batch:
+            self.store.append(self._pending)
+            self._pending = []
+
+    def close(self) -> None:
+        self.store.append(self._pending)
+        self._pending = []
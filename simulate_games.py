@@ -1,10 +1,27 @@
 import argparse
-from collections import defaultdict
-from math import sqrt
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from math import ceil, sqrt
+from typing import Optional
 
-from game import Game, random_trouble_brewing_setup, DumbStorytellerAI, Alignment
+from game import (
+    Game,
+    random_trouble_brewing_setup,
+    DumbStorytellerAI,
+    Alignment,
+    derive_rng,
+    trouble_brewing_setup_strata,
+)
+from game_events import EventKind
 from good_player_controller import GoodPlayerController
+from sim_store import GROUPINGS, ROLE_TEAMS, SimStore, StoreWriter
 from evil_player_controller import EvilPlayerController
+from telemetry import GameTelemetry, TelemetryStats, print_telemetry
 
 def proportion_confidence_interval(wins, total, z=1.645):
     """Returns (center, lower_bound, upper_bound) for a proportion ±0.90 CI.
@@ -17,70 +34,846 @@ def proportion_confidence_interval(wins, total, z=1.645):
     upper = min(1, p + z * se)
     return p, lower, upper
 
-def simulate_games(num_games: int, player_count: int = 8) -> None:
-    team_results = {"Good": 0, "Evil": 0}
-    role_results = defaultdict(lambda: [0, 0])  # role -> [wins, total]
-
-    for _ in range(num_games):
-        print(_)
-        ai = DumbStorytellerAI()
-        player_names = [f"Player {i+1}" for i in range(player_count)]
-        roles = random_trouble_brewing_setup(player_count, ai)
-
-        game = Game(player_names, roles)
-        # Keep track of each player's starting role so win rates are based on
-        # initial roles even if they change (e.g. Imp star-pass).
-        starting_roles = {
-            p.seat: (p.role.name, p.role.alignment) for p in game.players
+def ci_half_width(wins, total, z=1.645) -> float:
+    """Half-width of the ``proportion_confidence_interval`` of ``wins/total``."""
+    p, lower, upper = proportion_confidence_interval(wins, total, z)
+    return max(p - lower, upper - p)
+
+def game_seed(seed, index: int):
+    """Return the master seed of game ``index`` in a run seeded with ``seed``."""
+    return None if seed is None else f"{seed}:{index}"
+
+@dataclass
+class SimStats:
+    """Win counts of a batch of games; batches merge by addition."""
+
+    team_results: dict = field(default_factory=lambda: {"Good": 0, "Evil": 0})
+    role_results: dict = field(default_factory=dict)  # role -> [wins, total]
+    games: int = 0
+    # Pooled per-game telemetry, when the records carry any
+    telemetry: Optional[TelemetryStats] = None
+
+    def add_record(self, record: dict) -> None:
+        """Count one game from its ``play_game`` record."""
+        if "telemetry" in record:
+            if self.telemetry is None:
+                self.telemetry = TelemetryStats()
+            self.telemetry.add_record(record["telemetry"])
+        winning_team = record["winner"]
+        self.games += 1
+        self.team_results[winning_team] += 1
+        # Scored by starting role, even if it changed (e.g. Imp star-pass)
+        for start_name in record["roles"]:
+            entry = self.role_results.setdefault(start_name, [0, 0])
+            entry[1] += 1
+            if ROLE_TEAMS[start_name] == winning_team:
+                entry[0] += 1
+
+    def merge(self, other: "SimStats") -> None:
+        if other.telemetry is not None:
+            if self.telemetry is None:
+                self.telemetry = TelemetryStats()
+            self.telemetry.merge(other.telemetry)
+        self.games += other.games
+        for team, wins in other.team_results.items():
+            self.team_results[team] = self.team_results.get(team, 0) + wins
+        for role, (wins, total) in other.role_results.items():
+            entry = self.role_results.setdefault(role, [0, 0])
+            entry[0] += wins
+            entry[1] += total
+
+def controller_label(factory) -> str:
+    """Name of a controller class, or the ``label`` of another factory."""
+    return getattr(factory, "label", None) or factory.__name__
+
+def play_game(
+    seed_i,
+    player_count: int = 8,
+    stratum=None,
+    controllers=None,
+    storyteller=None,
+    telemetry: bool = False,
+) -> dict:
+    """Play one AI-only game and return its JSON-ready record.
+
+    ``stratum`` is a ``(minions, outsiders)`` pair the setup must use,
+    ``controllers`` a ``(good, evil)`` pair of controller classes (or other
+    zero-argument factories) to play the seats and ``storyteller`` a factory
+    taking the storyteller's random stream. With ``telemetry`` the record
+    also holds the game's ``GameTelemetry``.
+    """
+    start = time.perf_counter()
+    good_cls, evil_cls = controllers or (GoodPlayerController, EvilPlayerController)
+    ai = (storyteller or DumbStorytellerAI)(derive_rng(seed_i, "storyteller"))
+    player_names = [f"Player {i+1}" for i in range(player_count)]
+    minions, outsiders = stratum if stratum is not None else (None, None)
+    roles = random_trouble_brewing_setup(
+        player_count, ai, derive_rng(seed_i, "setup"), minions, outsiders
+    )
+
+    game = Game(player_names, roles, short_circuit_votes=True, seed=seed_i)
+    # Keep track of each player's starting role so win rates are based on
+    # initial roles even if they change (e.g. Imp star-pass).
+    starting_roles = [p.role.name for p in game.players]
+    for p in game.players:
+        if p.role.alignment in (Alignment.MINION, Alignment.DEMON):
+            p.controller = evil_cls()
+        else:
+            p.controller = good_cls()
+        p.controller.set_player(p)
+    if telemetry:
+        game.telemetry = GameTelemetry()
+
+    result = game.run(verbose=False)
+    winning_team = "Good" if result and result.lower().startswith("good") else "Evil"
+    record = {
+        "seed": seed_i,
+        "players": player_count,
+        "setup": sorted(r.name for r in roles),
+        "roles": starting_roles,
+        "winner": winning_team,
+        "nights": game.state.night,
+        "executions": len(game.state.events.of_kind(EventKind.EXECUTION)),
+        "controller": f"{controller_label(good_cls)}/{controller_label(evil_cls)}",
+    }
+    if telemetry:
+        game.telemetry.seconds = time.perf_counter() - start
+        record["telemetry"] = game.telemetry.as_record()
+    return record
+
+def _play_chunk(args):
+    """Worker task: play the games ``indices`` of a run.
+
+    Returns the chunk's ``SimStats`` and, if ``keep_records``, the records.
+    """
+    seed, indices, player_count, keep_records, stratum, telemetry = args
+    stats = SimStats()
+    records = []
+    for index in indices:
+        record = {
+            "index": index,
+            **play_game(
+                game_seed(seed, index), player_count, stratum, telemetry=telemetry
+            ),
         }
-        for p in game.players:
-            if p.role.alignment in (Alignment.MINION, Alignment.DEMON):
-                p.controller = EvilPlayerController()
-            else:
-                p.controller = GoodPlayerController()
-            p.controller.set_player(p)
-
-        result = game.run(verbose=False)
-        winning_team = "Good" if result and result.lower().startswith("good") else "Evil"
-        team_results[winning_team] += 1
-
-        for p in game.players:
-            start_name, start_align = starting_roles[p.seat]
-            role_results[start_name][1] += 1
-            player_team = (
-                "Good"
-                if start_align in (Alignment.TOWNSFOLK, Alignment.OUTSIDER)
-                else "Evil"
-            )
-            if player_team == winning_team:
-                role_results[start_name][0] += 1
+        stats.add_record(record)
+        if keep_records:
+            records.append(record)
+    return stats, records
 
+def _chunks(indices: list, jobs: int):
+    """Split ``indices`` into a few tasks per worker."""
+    size = max(1, min(250, len(indices) // (jobs * 4)))
+    for start in range(0, len(indices), size):
+        yield indices[start : start + size]
+
+def load_records(path: str, repair: bool = False) -> list:
+    """Read the game records in ``path``.
+
+    A run killed mid-write can leave half a record as the last line; it is
+    skipped, and with ``repair`` cut off so appending resumes on a clean
+    line. A bad line anywhere else raises ``ValueError`` and leaves the
+    file untouched.
+    """
+    records = []
+    good_bytes = 0
+    torn = None
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            if torn is not None:
+                raise ValueError(f"{path}:{torn}: unreadable game record")
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                torn = number
+                continue
+            good_bytes += len(line)
+    if torn is not None and repair:
+        with open(path, "r+b") as f:
+            f.truncate(good_bytes)
+    return records
+
+class RecordWriter:
+    """Append game records to a JSONL file, flushing every ``flush_every``."""
+
+    def __init__(self, path: str, flush_every: int = 100):
+        self._file = open(path, "a", encoding="utf-8")
+        self.flush_every = flush_every
+        self._unflushed = 0
+
+    def write(self, record: dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self._file.flush()
+            self._unflushed = 0
+
+    def close(self) -> None:
+        self._file.close()
+
+def summarize(path: str, by=None) -> dict:
+    """Print the report of saved games without playing anything.
+
+    ``path`` is a JSONL records file or a ``SimStore`` directory. With
+    ``by`` (see ``sim_store.GROUPINGS``) the store's games are reported per
+    group; returns ``{group: SimStats}``.
+    """
+    if os.path.isdir(path):
+        groups = {
+            label: SimStats(dict(g["teams"]), g["roles"], g["games"])
+            for label, g in SimStore(path).aggregate(by).items()
+        }
+    elif by is not None:
+        raise ValueError("breakdowns need a SimStore directory")
+    else:
+        stats = SimStats()
+        for record in load_records(path):
+            stats.add_record(record)
+        groups = {None: stats}
+    for label in sorted(groups, key=str):
+        if by is not None:
+            print(f"\n=== {by}: {label} ===")
+        print_report(groups[label])
+    return groups
+
+def _resume(path: str, seed, player_count: int):
+    """Return ``(stats, done, seed)`` for the records already in ``path``."""
+    stats = SimStats()
+    done = set()
+    for record in load_records(path, repair=True):
+        if record["players"] != player_count:
+            raise ValueError(f"{path} holds {record['players']}-player games")
+        if seed is None and record["seed"] is not None:
+            # Continue the unseeded parallel run with the seed it picked
+            seed = record["seed"].rsplit(":", 1)[0]
+        if record["seed"] != game_seed(seed, record["index"]):
+            raise ValueError(f"{path} was written by a run with a different seed")
+        stats.add_record(record)
+        done.add(record["index"])
+    return stats, done, seed
+
+def print_report(stats: SimStats) -> None:
+    num_games = stats.games
     print("Team win rates:")
-    for team, wins in team_results.items():
+    for team, wins in stats.team_results.items():
         print(f"{team}: {wins / num_games:.2%} ({wins}/{num_games})")
 
     print("\nRole win rates (sorted):")
     # Prepare list with winrate and CI for sorting/printing
-    stats = []
-    for role, (wins, total) in role_results.items():
+    rows = []
+    for role, (wins, total) in stats.role_results.items():
         winrate, lower, upper = proportion_confidence_interval(wins, total)
-        stats.append((winrate, role, wins, total, lower, upper))
+        rows.append((winrate, role, wins, total, lower, upper))
 
     # Sort by winrate descending
-    stats.sort(reverse=True)
+    rows.sort(reverse=True)
 
     print(f"{'Role':<20}{'Winrate':>12}{'90% CI':>20} {'Record':>12}")
-    for winrate, role, wins, total, lower, upper in stats:
+    for winrate, role, wins, total, lower, upper in rows:
         print(f"{role:<20}{winrate:>10.2%}   [{lower:.2%}, {upper:.2%}]   {wins}/{total}")
 
+    if stats.telemetry is not None:
+        print_telemetry(stats.telemetry)
+
+# Estimates from fewer samples than this never count as converged; with
+# all wins or all losses the normal interval would otherwise be empty.
+MIN_SAMPLES = 30
+# Roles dealt in fewer than this share of games do not hold up an adaptive
+# run: reaching MIN_SAMPLES alone would take most of the budget.
+MIN_SHARE = 0.02
+
+def _tracked(stats: SimStats, precision_of: str, min_share: float = MIN_SHARE) -> list:
+    """Return ``(wins, total)`` of every proportion an adaptive run watches."""
+    if precision_of == "team":
+        return [(stats.team_results["Good"], stats.games)]
+    return [
+        (wins, total)
+        for wins, total in stats.role_results.values()
+        if total >= min_share * stats.games
+    ]
+
+def rare_roles(stats: SimStats, min_share: float = MIN_SHARE) -> list:
+    """Roles too rarely dealt to be watched by an adaptive run."""
+    return sorted(
+        role
+        for role, (_, total) in stats.role_results.items()
+        if total < min_share * stats.games
+    )
+
+def widest_ci(stats: SimStats, precision_of: str = "roles", min_share: float = MIN_SHARE) -> float:
+    """Largest 90% CI half-width among the watched proportions."""
+    tracked = _tracked(stats, precision_of, min_share)
+    if not tracked or any(total < MIN_SAMPLES for _, total in tracked):
+        return 1.0
+    return max(ci_half_width(wins, total) for wins, total in tracked)
+
+def games_needed(
+    stats: SimStats,
+    precision: float,
+    precision_of: str = "roles",
+    z=1.645,
+    min_share: float = MIN_SHARE,
+) -> int:
+    """Estimate the total games after which every watched CI is narrow enough.
+
+    Each proportion needs about ``p(1-p)(z/precision)^2`` samples, and a
+    role is sampled ``total / games`` times per game so far.
+    """
+    need = 0
+    for wins, total in _tracked(stats, precision_of, min_share):
+        p = wins / total
+        samples = max(MIN_SAMPLES, ceil(p * (1 - p) * (z / precision) ** 2))
+        need = max(need, ceil(samples * stats.games / total))
+    return need
+
+class _GamePlayer:
+    """Play batches of game indices serially or on a reusable process pool."""
+
+    def __init__(self, seed, player_count, jobs, stats, writers, telemetry=False):
+        self.seed = seed
+        self.player_count = player_count
+        self.jobs = jobs
+        self.stats = stats
+        self.writers = writers
+        # ``(minions, outsiders)`` the next games must be dealt, if any
+        self.stratum = None
+        self.telemetry = telemetry
+        self._pool = None
+
+    def play(self, indices: list) -> None:
+        if self.jobs > 1 and indices:
+            if self.seed is None:
+                self.seed = random.randrange(2**32)
+                print(f"Seed: {self.seed}")
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self.jobs)
+            tasks = [
+                (
+                    self.seed,
+                    chunk,
+                    self.player_count,
+                    bool(self.writers),
+                    self.stratum,
+                    self.telemetry,
+                )
+                for chunk in _chunks(indices, self.jobs)
+            ]
+            for partial, records in self._pool.imap_unordered(_play_chunk, tasks):
+                self.stats.merge(partial)
+                for record in records:
+                    for writer in self.writers:
+                        writer.write(record)
+        else:
+            for index in indices:
+                record = {
+                    "index": index,
+                    **play_game(
+                        game_seed(self.seed, index),
+                        self.player_count,
+                        self.stratum,
+                        telemetry=self.telemetry,
+                    ),
+                }
+                self.stats.add_record(record)
+                for writer in self.writers:
+                    writer.write(record)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        for writer in self.writers:
+            writer.close()
+
+def simulate_games(
+    num_games: int,
+    player_count: int = 8,
+    seed=None,
+    jobs: int = 1,
+    out=None,
+    store=None,
+    precision=None,
+    precision_of: str = "roles",
+    min_batch: int = 200,
+    telemetry: bool = False,
+    min_share: float = MIN_SHARE,
+) -> SimStats:
+    """Play ``num_games`` AI-only games, print win rates and return the counts.
+
+    With a ``seed`` every game is reproducible on its own: game ``i`` draws
+    all of its randomness from ``game_seed(seed, i)``. ``jobs > 1`` spreads
+    the games over a process pool; each worker counts its share and the
+    counts are summed, so the report matches a serial run with the same
+    seed. Parallel runs without a seed pick one and print it.
+
+    With ``out`` every game's record is appended to that JSONL file as it
+    finishes. If the file already exists the run resumes: recorded games
+    are counted and only the missing ones are played. ``store`` appends
+    the games played to the ``SimStore`` in that directory.
+
+    With ``precision`` the run stops early, once the 90% CI half-width of
+    every role's win rate (``precision_of="roles"``) or of the team win
+    rate (``"team"``) is below it; ``num_games`` is then the budget. Roles
+    dealt in fewer than ``min_share`` of the games are left out of the
+    stopping rule and reported as unconverged. Games are played in batches
+    of at least ``min_batch``, sized from the games the current estimates
+    still need. The stopping point depends only on the results, so seeded
+    runs stop at the same game with any ``jobs``. The run reports whether
+    it converged or used up its budget.
+
+    With ``telemetry`` every game is timed and its work counted (see
+    ``telemetry.GameTelemetry``); the report adds percentiles and
+    histograms, and the records written to ``out`` keep the raw numbers.
+    """
+    stats = SimStats()
+    done = set()
+    if out is not None and os.path.exists(out):
+        stats, done, seed = _resume(out, seed, player_count)
+        if done:
+            print(f"Resuming: {len(done)} games already in {out}")
+    todo = [i for i in range(num_games) if i not in done]
+    writers = []
+    if out is not None:
+        writers.append(RecordWriter(out))
+    if store is not None:
+        writers.append(StoreWriter(SimStore(store, repair=True)))
+    player = _GamePlayer(seed, player_count, jobs, stats, writers, telemetry)
+    try:
+        if precision is None:
+            player.play(todo)
+        else:
+            while todo and widest_ci(stats, precision_of, min_share) >= precision:
+                batch = min_batch
+                if stats.games:
+                    wanted = (
+                        games_needed(stats, precision, precision_of, min_share=min_share)
+                        - stats.games
+                    )
+                    # Early estimates are noisy; at most double the games per batch
+                    batch = min(max(min_batch, wanted), max(min_batch, stats.games))
+                player.play(todo[:batch])
+                todo = todo[batch:]
+                print(
+                    f"{stats.games} games: widest 90% CI half-width "
+                    f"{widest_ci(stats, precision_of, min_share):.2%}"
+                )
+    finally:
+        player.close()
+
+    if precision is not None:
+        widest = widest_ci(stats, precision_of, min_share)
+        if widest < precision:
+            print(f"Converged after {stats.games} games (widest half-width {widest:.2%})")
+        else:
+            print(
+                f"Budget of {num_games} games used up before converging "
+                f"(widest half-width {widest:.2%})"
+            )
+        rare = rare_roles(stats, min_share) if precision_of == "roles" else []
+        if rare:
+            print(
+                f"Unconverged, dealt in under {min_share:.0%} of games: "
+                + ", ".join(rare)
+            )
+
+    print_report(stats)
+    return stats
+
+def _adjusted_rate(wins, total, z) -> float:
+    """Agresti-Coull rate: ``wins / total`` with ``z*z/2`` wins and losses added."""
+    return (wins + z * z / 2) / (total + z * z)
+
+def stratified_estimates(strata: list, z=1.645) -> tuple:
+    """Reweight per-stratum counts to the natural setup distribution.
+
+    ``strata`` holds ``(probability, SimStats)`` pairs. Returns
+    ``(teams, roles)``: ``teams`` maps team to ``(p, lower, upper)`` and
+    ``roles`` maps role to ``(p, lower, upper)``, where ``p`` is the win
+    rate a plain random-setup run would estimate. A role's rate is a ratio
+    (its expected wins over its expected seats per game); each role sits in
+    at most one seat per game, so its variance follows from the stratum
+    counts. Every stratum needs two games. A stratum whose games all went
+    one way still adds Agresti-Coull variance, so intervals never collapse
+    to a point.
+    """
+    for _, st in strata:
+        if st.games < 2:
+            raise ValueError("every stratum needs at least 2 games")
+    scale = sum(w for w, _ in strata)
+    sampled = [(w / scale, st) for w, st in strata]
+
+    good = sum(w * st.team_results["Good"] / st.games for w, st in sampled)
+    var = 0.0
+    for w, st in sampled:
+        q = _adjusted_rate(st.team_results["Good"], st.games, z)
+        var += w * w * q * (1 - q) / (st.games + z * z)
+    half = z * sqrt(var)
+    teams = {
+        "Good": (good, max(0, good - half), min(1, good + half)),
+        "Evil": (1 - good, max(0, 1 - good - half), min(1, 1 - good + half)),
+    }
+
+    roles = {}
+    names = {role for _, st in sampled for role in st.role_results}
+    for role in names:
+        expected_wins = expected_seats = 0.0
+        for w, st in sampled:
+            wins, total = st.role_results.get(role, (0, 0))
+            expected_wins += w * wins / st.games
+            expected_seats += w * total / st.games
+        p = expected_wins / expected_seats
+        var = 0.0
+        for w, st in sampled:
+            n = st.games
+            wins, total = st.role_results.get(role, (0, 0))
+            # Per game d = seats * (won - p); moments from the counts
+            sum_d = wins - p * total
+            sum_d2 = wins * (1 - p) ** 2 + (total - wins) * p * p
+            sample_var = (sum_d2 - sum_d * sum_d / n) / (n - 1)
+            q = _adjusted_rate(wins, total, z)
+            floor = total / n * q * (1 - q)
+            var += w * w * max(sample_var, floor) / n
+        half = z * sqrt(var) / expected_seats
+        roles[role] = (p, max(0, p - half), min(1, p + half))
+    return teams, roles
+
+def print_stratified_report(strata: list) -> None:
+    teams, roles = stratified_estimates(strata)
+    games = sum(st.games for _, st in strata)
+    records = SimStats()
+    for _, st in strata:
+        records.merge(st)
+    print(f"Reweighted to the natural setup distribution ({games} games):")
+    print("Team win rates:")
+    for team, (p, lower, upper) in teams.items():
+        print(f"{team}: {p:.2%}   [{lower:.2%}, {upper:.2%}]")
+
+    print("\nRole win rates (sorted):")
+    rows = sorted(
+        ((p, role, lower, upper) for role, (p, lower, upper) in roles.items()),
+        reverse=True,
+    )
+    print(f"{'Role':<20}{'Winrate':>12}{'90% CI':>20} {'Record':>12}")
+    for p, role, lower, upper in rows:
+        wins, total = records.role_results[role]
+        print(f"{role:<20}{p:>10.2%}   [{lower:.2%}, {upper:.2%}]   {wins}/{total}")
+
+    if records.telemetry is not None:
+        print_telemetry(records.telemetry)
+
+def simulate_stratified(
+    num_games: int,
+    player_count: int = 8,
+    seed=None,
+    jobs: int = 1,
+    out=None,
+    store=None,
+    telemetry: bool = False,
+) -> list:
+    """Play ``num_games`` games spread evenly over the setup strata.
+
+    A stratum is one combination of minions and outsiders (see
+    ``trouble_brewing_setup_strata``); game ``i`` is dealt stratum
+    ``i % len(strata)`` with the rest of its setup random. Rare
+    combinations, such as Baron with Drunk, get as many games as common
+    ones. The counts are then reweighted to how often a random setup deals
+    each stratum, which gives the same quantities as ``simulate_games``
+    with tighter per-role intervals. Returns ``(probability, SimStats)``
+    per stratum. Records streamed to ``out`` or ``store`` are not
+    reweighted, and stratified runs do not resume.
+    """
+    if out is not None and os.path.exists(out):
+        raise ValueError(f"{out} exists; stratified runs do not resume")
+    strata = trouble_brewing_setup_strata(player_count)
+    if num_games < 2 * len(strata):
+        raise ValueError(f"need at least {2 * len(strata)} games, two per stratum")
+    writers = []
+    if out is not None:
+        writers.append(RecordWriter(out))
+    if store is not None:
+        writers.append(StoreWriter(SimStore(store, repair=True)))
+    results = []
+    player = _GamePlayer(seed, player_count, jobs, None, writers, telemetry)
+    try:
+        for h, (minions, outsiders, probability) in enumerate(strata):
+            player.stats = SimStats()
+            player.stratum = (minions, outsiders)
+            player.play(list(range(h, num_games, len(strata))))
+            results.append((probability, player.stats))
+    finally:
+        player.close()
+
+    print_stratified_report(results)
+    return results
+
+def load_controller(spec: str):
+    """Return the controller class named by ``"module:Class"``."""
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"controller must be given as module:Class, not {spec!r}")
+    return getattr(importlib.import_module(module), name)
+
+@dataclass
+class PairedStats:
+    """Paired A/B outcomes, as sums of per-game differences ``B - A``.
+
+    ``team`` and every ``roles`` entry hold ``[n, sum_d, sum_d2, changed]``:
+    pairs seen, sum and sum of squares of the win difference, and pairs
+    whose outcome differed. Batches merge by addition.
+    """
+
+    team: list = field(default_factory=lambda: [0, 0, 0, 0])
+    roles: dict = field(default_factory=dict)
+    wins_a: int = 0
+    wins_b: int = 0
+
+    @staticmethod
+    def _add(entry: list, d: int) -> None:
+        entry[0] += 1
+        entry[1] += d
+        entry[2] += d * d
+        entry[3] += d != 0
+
+    def add_pair(self, roles: list, winner_a: str, winner_b: str) -> None:
+        good_a, good_b = winner_a == "Good", winner_b == "Good"
+        self.wins_a += good_a
+        self.wins_b += good_b
+        self._add(self.team, good_b - good_a)
+        for role in roles:
+            won_a = ROLE_TEAMS[role] == winner_a
+            won_b = ROLE_TEAMS[role] == winner_b
+            self._add(self.roles.setdefault(role, [0, 0, 0, 0]), won_b - won_a)
+
+    def merge(self, other: "PairedStats") -> None:
+        self.wins_a += other.wins_a
+        self.wins_b += other.wins_b
+        for mine, theirs in [(self.team, other.team)] + [
+            (self.roles.setdefault(role, [0, 0, 0, 0]), entry)
+            for role, entry in other.roles.items()
+        ]:
+            for i, value in enumerate(theirs):
+                mine[i] += value
+
+def paired_difference(entry: list, z=1.645) -> tuple:
+    """Return ``(mean, lower, upper)`` of the paired differences in ``entry``."""
+    n, sum_d, sum_d2, _ = entry
+    if n == 0:
+        return 0, 0, 0
+    mean = sum_d / n
+    var = (sum_d2 - sum_d * sum_d / n) / (n - 1) if n > 1 else 0.0
+    half = z * sqrt(var / n)
+    return mean, mean - half, mean + half
+
+def _play_pairs(args) -> PairedStats:
+    """Worker task: play games ``indices`` once with each controller pair."""
+    seed, indices, player_count, pair_a, pair_b = args
+    stats = PairedStats()
+    for index in indices:
+        seed_i = game_seed(seed, index)
+        a = play_game(seed_i, player_count, controllers=pair_a)
+        b = play_game(seed_i, player_count, controllers=pair_b)
+        stats.add_pair(a["roles"], a["winner"], b["winner"])
+    return stats
+
+def compare_controllers(
+    num_games: int,
+    variant_a,
+    variant_b,
+    side: str = "good",
+    player_count: int = 8,
+    seed=None,
+    jobs: int = 1,
+) -> PairedStats:
+    """A/B test two controller classes for ``side`` with common random numbers.
+
+    Every game is played twice from the same seed, once with each variant
+    on ``side`` and the stock controller on the other side. Setup,
+    storyteller and every seat draw from the same per-label random streams
+    in both plays, so the games differ only through the variants'
+    decisions. The paired difference of win rates therefore has far less
+    noise than two independent runs. Returns the ``PairedStats``.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+        print(f"Seed: {seed}")
+    stock = (GoodPlayerController, EvilPlayerController)
+    if side == "good":
+        pair_a, pair_b = (variant_a, stock[1]), (variant_b, stock[1])
+    elif side == "evil":
+        pair_a, pair_b = (stock[0], variant_a), (stock[0], variant_b)
+    else:
+        raise ValueError("side must be 'good' or 'evil'")
+    indices = list(range(num_games))
+    tasks = [
+        (seed, chunk, player_count, pair_a, pair_b)
+        for chunk in _chunks(indices, max(jobs, 1))
+    ]
+    stats = PairedStats()
+    if jobs > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            for partial in pool.imap_unordered(_play_pairs, tasks):
+                stats.merge(partial)
+    else:
+        for task in tasks:
+            stats.merge(_play_pairs(task))
+
+    print_comparison(stats, controller_label(variant_a), controller_label(variant_b), side)
+    return stats
+
+def print_comparison(stats: PairedStats, name_a: str, name_b: str, side: str) -> None:
+    n = stats.team[0]
+    team = "Good" if side == "good" else "Evil"
+    rate_a = stats.wins_a / n if side == "good" else 1 - stats.wins_a / n
+    rate_b = stats.wins_b / n if side == "good" else 1 - stats.wins_b / n
+    mean, lower, upper = paired_difference(stats.team)
+    if side == "evil":
+        mean, lower, upper = 0.0 - mean, 0.0 - upper, 0.0 - lower
+    print(f"{team} win rate over {n} paired games:")
+    print(f"  A {name_a}: {rate_a:.2%}")
+    print(f"  B {name_b}: {rate_b:.2%}")
+    print(
+        f"  B - A: {mean:+.2%}   90% CI [{lower:+.2%}, {upper:+.2%}]   "
+        f"({stats.team[3]} games changed outcome)"
+    )
+
+    print("\nRole win rate differences, B - A (sorted):")
+    rows = []
+    for role, entry in stats.roles.items():
+        rows.append((*paired_difference(entry), role, entry[0], entry[3]))
+    rows.sort(reverse=True)
+    print(f"{'Role':<20}{'B - A':>10}{'90% CI':>24} {'Changed':>12}")
+    for mean, lower, upper, role, pairs, changed in rows:
+        print(
+            f"{role:<20}{mean:>+10.2%}   [{lower:+.2%}, {upper:+.2%}]   "
+            f"{changed}/{pairs}"
+        )
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Simulate multiple BOTC games")
-    parser.add_argument("num_games", type=int, help="Number of games to simulate")
+    parser.add_argument(
+        "num_games", type=int, nargs="?", help="Number of games to simulate"
+    )
     parser.add_argument(
         "--players", type=int, default=8, help="Number of players in each game"
     )
+    parser.add_argument(
+        "--seed", help="Master seed; makes every game reproducible"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes to play games in"
+    )
+    parser.add_argument(
+        "--out", help="Stream game records to this JSONL file; resumes if it exists"
+    )
+    parser.add_argument(
+        "--precision",
+        type=float,
+        help="Stop early once every 90%% CI half-width is below this (e.g. 0.02); "
+        "num_games becomes the budget",
+    )
+    parser.add_argument(
+        "--precision-of",
+        choices=["roles", "team"],
+        default="roles",
+        help="Which win rates --precision applies to",
+    )
+    parser.add_argument(
+        "--min-share",
+        type=float,
+        default=MIN_SHARE,
+        help="With --precision, ignore roles dealt in fewer than this share of games",
+    )
+    parser.add_argument(
+        "--stratified",
+        action="store_true",
+        help="Spread games evenly over minion/outsider setups and reweight",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("A", "B"),
+        help="A/B test two module:Class controllers on the same seeds",
+    )
+    parser.add_argument(
+        "--side",
+        choices=["good", "evil"],
+        default="good",
+        help="Which team --compare swaps the controller of",
+    )
+    parser.add_argument(
+        "--telemetry",
+        action="store_true",
+        help="Time every phase and count decisions and deduction work per game",
+    )
+    parser.add_argument(
+        "--store", metavar="DIR", help="Also append game records to a columnar store"
+    )
+    parser.add_argument(
+        "--summarize",
+        metavar="PATH",
+        help="Print the report of a records file or store directory and exit",
+    )
+    parser.add_argument(
+        "--by",
+        choices=[g for g in GROUPINGS if g],
+        help="With --summarize on a store, report each group separately",
+    )
     args = parser.parse_args()
-    simulate_games(args.num_games, args.players)
+    if args.summarize:
+        summarize(args.summarize, args.by)
+        return
+    if args.num_games is None:
+        parser.error("num_games is required unless --summarize is given")
+    if args.compare:
+        unsupported = [
+            flag
+            for flag, given in (
+                ("--out", args.out),
+                ("--store", args.store),
+                ("--telemetry", args.telemetry),
+                ("--precision", args.precision is not None),
+                ("--stratified", args.stratified),
+            )
+            if given
+        ]
+        if unsupported:
+            parser.error(f"--compare does not support {', '.join(unsupported)}")
+        compare_controllers(
+            args.num_games,
+            load_controller(args.compare[0]),
+            load_controller(args.compare[1]),
+            args.side,
+            args.players,
+            args.seed,
+            args.jobs,
+        )
+        return
+    if args.stratified:
+        if args.precision is not None:
+            parser.error("--stratified does not support --precision")
+        simulate_stratified(
+            args.num_games,
+            args.players,
+            args.seed,
+            args.jobs,
+            args.out,
+            args.store,
+            args.telemetry,
+        )
+        return
+    simulate_games(
+        args.num_games,
+        args.players,
+        args.seed,
+        args.jobs,
+        args.out,
+        args.store,
+        args.precision,
+        args.precision_of,
+        telemetry=args.telemetry,
+        min_share=args.min_share,
+    )
 
 if __name__ == "__main__":
     main()
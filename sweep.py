@@ -0,0 +1,258 @@
+"""Simulate a grid of player counts, controllers and storytellers in one run.
+
+Every cell of the grid plays the same game seeds, so cells are compared on
+common random numbers wherever their setups coincide. All cells share one
+process pool: tasks are small chunks of games queued largest table first,
+and workers stay alive for the whole sweep so per-process caches such as
+``deduction_engine.world_skeletons`` are warmed once rather than per cell.
+
+Components are given as ``module:Class`` with optional keyword arguments,
+e.g. ``my_controllers:CautiousGood(threshold=0.6)``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import itertools
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from simulate_games import (
+    SimStats,
+    game_seed,
+    load_controller,
+    play_game,
+    print_report,
+    proportion_confidence_interval,
+)
+
+DEFAULT_GOOD = "good_player_controller:GoodPlayerController"
+DEFAULT_EVIL = "evil_player_controller:EvilPlayerController"
+DEFAULT_STORYTELLER = "game:DumbStorytellerAI"
+
+
+@dataclass(frozen=True)
+class Component:
+    """A class named ``module:Class`` and the keyword arguments to build it with.
+
+    Calling a ``Component`` builds the class, so it can stand in for a
+    controller or storyteller class; unlike a lambda it pickles to workers.
+    """
+
+    path: str
+    params: Tuple[Tuple[str, object], ...] = ()
+
+    @classmethod
+    def parse(cls, spec: str) -> "Component":
+        path, paren, rest = spec.partition("(")
+        if not paren:
+            return cls(path.strip())
+        call = ast.parse(f"f({rest}", mode="eval").body
+        if call.args:
+            raise ValueError(f"only keyword arguments are supported: {spec!r}")
+        params = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+        return cls(path.strip(), tuple(sorted(params.items())))
+
+    @property
+    def label(self) -> str:
+        name = self.path.rpartition(":")[2]
+        if not self.params:
+            return name
+        args = ", ".join(f"{k}={v!r}" for k, v in self.params)
+        return f"{name}({args})"
+
+    def __call__(self, *args):
+        return load_controller(self.path)(*args, **dict(self.params))
+
+
+@dataclass(frozen=True)
+class Cell:
+    players: int
+    good: Component
+    evil: Component
+    storyteller: Component
+
+    @property
+    def label(self) -> tuple:
+        return (self.players, self.good.label, self.evil.label, self.storyteller.label)
+
+
+def parse_players(values: List[str]) -> List[int]:
+    """Expand ``["5-7", "10"]`` into ``[5, 6, 7, 10]``."""
+    counts = []
+    for value in values:
+        low, _, high = value.partition("-")
+        counts.extend(range(int(low), int(high or low) + 1))
+    return sorted(set(counts))
+
+
+def grid(players, good, evil, storytellers) -> List[Cell]:
+    return [Cell(*combo) for combo in itertools.product(players, good, evil, storytellers)]
+
+
+def _play_cell_chunk(args):
+    """Worker task: play games ``indices`` of one cell.
+
+    Returns ``(cell_index, stats, seconds, failures)``; a game that raises
+    is left out of ``stats`` and listed in ``failures`` as ``(index,
+    error)`` so one bad game does not end the sweep.
+    """
+    cell_index, cell, seed, indices = args
+    start = time.perf_counter()
+    stats = SimStats()
+    failures = []
+    for index in indices:
+        try:
+            record = play_game(
+                game_seed(seed, index),
+                cell.players,
+                controllers=(cell.good, cell.evil),
+                storyteller=cell.storyteller,
+            )
+        except Exception as e:
+            failures.append((index, f"{type(e).__name__}: {e}"))
+            continue
+        stats.add_record(record)
+    return cell_index, stats, time.perf_counter() - start, failures
+
+
+def _tasks(cells: List[Cell], num_games: int, seed, jobs: int, chunk: int) -> list:
+    """Chunk every cell's games; bigger tables first so they do not finish last."""
+    size = chunk or max(1, min(50, num_games * len(cells) // (jobs * 8)))
+    tasks = [
+        (i, cell, seed, list(range(start, min(start + size, num_games))))
+        for i, cell in enumerate(cells)
+        for start in range(0, num_games, size)
+    ]
+    tasks.sort(key=lambda task: -task[1].players)
+    return tasks
+
+
+def run_sweep(
+    cells: List[Cell], num_games: int, seed=None, jobs: int = 1, chunk: int = 0
+) -> Dict[Cell, Tuple[SimStats, float, list]]:
+    """Play ``num_games`` games in every cell.
+
+    Returns ``{cell: (stats, seconds, failures)}``. ``seconds`` is worker
+    time spent on the cell, summed over its chunks, and ``failures`` lists
+    ``(game index, error)`` for the games that raised, in index order.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+        print(f"Seed: {seed}")
+    results = [[SimStats(), 0.0, []] for _ in cells]
+    tasks = _tasks(cells, num_games, seed, max(jobs, 1), chunk)
+
+    def collect(outcome):
+        cell_index, stats, seconds, failures = outcome
+        results[cell_index][0].merge(stats)
+        results[cell_index][1] += seconds
+        results[cell_index][2].extend(failures)
+
+    if jobs > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            for outcome in pool.imap_unordered(_play_cell_chunk, tasks):
+                collect(outcome)
+    else:
+        for task in tasks:
+            collect(_play_cell_chunk(task))
+    return {
+        cell: (stats, seconds, sorted(failures))
+        for cell, (stats, seconds, failures) in zip(cells, results)
+    }
+
+
+def print_sweep(
+    results: Dict[Cell, Tuple[SimStats, float, list]], detail: bool = False
+) -> None:
+    """Print one row per cell, and each cell's full report with ``detail``.
+
+    Cells with failed games are listed after the table with the first
+    error; their rows count only the games that finished.
+    """
+    header = (
+        f"{'Players':>7}  {'Good':<26}{'Evil':<26}{'Storyteller':<20}"
+        f"{'Games':>6}{'Failed':>7}{'Good win':>10}{'90% CI':>18}{'ms/game':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for cell, (stats, seconds, failures) in results.items():
+        players, good, evil, storyteller = cell.label
+        played = stats.games + len(failures)
+        ms = 1000 * seconds / played if played else 0.0
+        if stats.games:
+            wins = stats.team_results["Good"]
+            p, lower, upper = proportion_confidence_interval(wins, stats.games)
+            rate, ci = f"{p:.2%}", f"[{lower:.2%}, {upper:.2%}]"
+        else:
+            rate, ci = "-", "-"
+        print(
+            f"{players:>7}  {good:<26}{evil:<26}{storyteller:<20}{stats.games:>6}"
+            f"{len(failures):>7}{rate:>10}{ci:>18}{ms:>9.1f}"
+        )
+    failed = [(cell, failures) for cell, (_, _, failures) in results.items() if failures]
+    if failed:
+        print("\nFailed games:")
+        for cell, failures in failed:
+            index, error = failures[0]
+            print(
+                f"  {', '.join(map(str, cell.label))}: {len(failures)} failed, "
+                f"first at game {index}: {error}"
+            )
+    if detail:
+        for cell, (stats, _, _) in results.items():
+            if not stats.games:
+                continue
+            print(f"\n=== {', '.join(map(str, cell.label))} ===")
+            print_report(stats)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Simulate every combination of player count, controllers and storyteller"
+    )
+    parser.add_argument("num_games", type=int, help="Games per cell")
+    parser.add_argument(
+        "--players",
+        nargs="+",
+        default=["5-9"],
+        help="Player counts, e.g. 5-9 or 7 10; games slow sharply from 10 players",
+    )
+    parser.add_argument(
+        "--good", nargs="+", default=[DEFAULT_GOOD], help="Good controller classes"
+    )
+    parser.add_argument(
+        "--evil", nargs="+", default=[DEFAULT_EVIL], help="Evil controller classes"
+    )
+    parser.add_argument(
+        "--storyteller",
+        nargs="+",
+        default=[DEFAULT_STORYTELLER],
+        help="Storyteller classes, built with their random stream",
+    )
+    parser.add_argument("--seed", help="Master seed shared by every cell")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes")
+    parser.add_argument(
+        "--chunk", type=int, default=0, help="Games per pool task (default: automatic)"
+    )
+    parser.add_argument(
+        "--detail", action="store_true", help="Also print each cell's role report"
+    )
+    args = parser.parse_args()
+
+    cells = grid(
+        parse_players(args.players),
+        [Component.parse(s) for s in args.good],
+        [Component.parse(s) for s in args.evil],
+        [Component.parse(s) for s in args.storyteller],
+    )
+    results = run_sweep(cells, args.num_games, args.seed, args.jobs, args.chunk)
+    print_sweep(results, args.detail)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Optional per-game timing and work counters for simulation batches.
+
+Set ``game.telemetry = GameTelemetry()`` before ``Game.run`` and the game
+times every night and day, counts the decisions it asks controllers for,
+and has its ``DeductionService`` count queries, the worlds each public
+enumeration generated, the worlds each computed query kept and the time
+spent deducing. ``play_game`` also times the whole game, setup included.
+Games without telemetry measure nothing. ``TelemetryStats`` pools the records of many games, e.g.
+across simulation workers, and ``print_telemetry`` reports percentiles and
+histograms of them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from math import ceil, log10
+from typing import Dict, List
+
+
+class GameTelemetry:
+    """Measurements of one game, filled in as the module docstring describes."""
+
+    __slots__ = (
+        "seconds",
+        "nights",
+        "days",
+        "decisions",
+        "deduction_calls",
+        "deduction_seconds",
+        "worlds",
+        "pov_worlds",
+    )
+
+    def __init__(self):
+        self.seconds = 0.0  # wall seconds of the whole game, setup included
+        self.nights: List[float] = []  # wall seconds of each night phase
+        self.days: List[float] = []  # wall seconds of each day phase
+        self.decisions: Dict[str, int] = {}  # decision type -> times asked
+        self.deduction_calls = 0  # belief queries, cached or not
+        self.deduction_seconds = 0.0
+        self.worlds: List[int] = []  # worlds generated by each public enumeration
+        self.pov_worlds: List[int] = []  # worlds kept by each computed query
+
+    def decision(self, kind: str, count: int = 1) -> None:
+        self.decisions[kind] = self.decisions.get(kind, 0) + count
+
+    def as_record(self) -> dict:
+        """Return the JSON-ready form stored in game records."""
+        return {
+            "seconds": self.seconds,
+            "nights": self.nights,
+            "days": self.days,
+            "decisions": self.decisions,
+            "deduction_calls": self.deduction_calls,
+            "deduction_seconds": self.deduction_seconds,
+            "worlds": self.worlds,
+            "pov_worlds": self.pov_worlds,
+        }
+
+
+# Per-phase or per-game samples reported by ``print_telemetry``, in order
+METRICS = (
+    ("night_seconds", "Night phase (ms)", 1000),
+    ("day_seconds", "Day phase (ms)", 1000),
+    ("game_seconds", "Game (ms)", 1000),
+    ("deduction_seconds", "Deduction per game (ms)", 1000),
+    ("deduction_calls", "Deduction calls per game", 1),
+    ("worlds", "Worlds per enumeration", 1),
+    ("pov_worlds", "Worlds per query", 1),
+)
+
+
+@dataclass
+class TelemetryStats:
+    """Telemetry samples of a batch of games; batches merge by concatenation."""
+
+    samples: Dict[str, list] = field(default_factory=dict)
+    decisions: Dict[str, int] = field(default_factory=dict)  # type -> total
+    games: int = 0
+
+    def _extend(self, metric: str, values) -> None:
+        self.samples.setdefault(metric, []).extend(values)
+
+    def add_record(self, record: dict) -> None:
+        """Add the ``GameTelemetry.as_record`` form of one game."""
+        self.games += 1
+        self._extend("night_seconds", record["nights"])
+        self._extend("day_seconds", record["days"])
+        if "seconds" in record:  # records written before games were timed whole
+            self._extend("game_seconds", [record["seconds"]])
+        self._extend("deduction_seconds", [record["deduction_seconds"]])
+        self._extend("deduction_calls", [record["deduction_calls"]])
+        self._extend("worlds", record["worlds"])
+        self._extend("pov_worlds", record.get("pov_worlds", ()))
+        for kind, count in record["decisions"].items():
+            self.decisions[kind] = self.decisions.get(kind, 0) + count
+
+    def merge(self, other: "TelemetryStats") -> None:
+        self.games += other.games
+        for metric, values in other.samples.items():
+            self._extend(metric, values)
+        for kind, count in other.decisions.items():
+            self.decisions[kind] = self.decisions.get(kind, 0) + count
+
+
+def percentile(ordered: list, q: float):
+    """Nearest-rank ``q``-th percentile (0-100) of the sorted list ``ordered``."""
+    return ordered[max(0, ceil(q / 100 * len(ordered)) - 1)]
+
+
+def histogram(ordered: list, bins: int = 8) -> List[tuple]:
+    """Return ``(low, high, count)`` bins covering the sorted list ``ordered``.
+
+    Bins are logarithmic when the positive values span more than two
+    decades, as phase times and world counts usually do, and linear
+    otherwise.
+    """
+    low, high = ordered[0], ordered[-1]
+    if low == high:
+        return [(low, high, len(ordered))]
+    if low > 0 and log10(high / low) > 2:
+        ratio = (high / low) ** (1 / bins)
+        edges = [low * ratio**i for i in range(bins + 1)]
+    else:
+        step = (high - low) / bins
+        edges = [low + step * i for i in range(bins + 1)]
+    edges[-1] = high
+    counts = [0] * bins
+    b = 0
+    for value in ordered:
+        while b < bins - 1 and value >= edges[b + 1]:
+            b += 1
+        counts[b] += 1
+    return [(edges[i], edges[i + 1], counts[i]) for i in range(bins)]
+
+
+def print_telemetry(stats: TelemetryStats, width: int = 40) -> None:
+    games = stats.games
+    print(f"\nTelemetry over {games} games:")
+    print(f"{'Metric':<26}{'n':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for metric, title, scale in METRICS:
+        values = sorted(v * scale for v in stats.samples.get(metric, ()))
+        if not values:
+            continue
+        cells = [sum(values) / len(values)] + [
+            percentile(values, q) for q in (50, 90, 99)
+        ] + [values[-1]]
+        print(f"{title:<26}{len(values):>8}" + "".join(f"{c:>10.1f}" for c in cells))
+
+    print("\nDecisions by type:")
+    print(f"{'Decision':<26}{'total':>8}{'per game':>10}")
+    for kind, count in sorted(stats.decisions.items(), key=lambda kv: -kv[1]):
+        print(f"{kind:<26}{count:>8}{count / games:>10.2f}")
+
+    for metric, title, scale in METRICS:
+        values = sorted(v * scale for v in stats.samples.get(metric, ()))
+        if not values:
+            continue
+        print(f"\n{title}:")
+        bins = histogram(values)
+        most = max(count for _, _, count in bins)
+        for low, high, count in bins:
+            bar = "#" * round(width * count / most)
+            print(f"  {low:>10.1f} - {high:<10.1f}{count:>7}  {bar}")
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from deduction_engine import (
+    DEFAULT_TB_ROLES,
+    _evaluate_or_report,
+    _read_scenarios,
+    compute_role_probs,
+    deduction_pipeline,
+    generate_all_worlds,
+)
+
+TABLE = '{"players": ["A", "B", "C", "D", "E"]}'
+
+
+def test_bad_lines_become_error_records_and_later_lines_still_run():
+    stream = io.StringIO("\n".join([TABLE, "not json", "[]", "3", "", TABLE]) + "\n")
+    results = [_evaluate_or_report(s) for s in _read_scenarios(stream)]
+
+    assert [r["id"] for r in results] == [0, 1, 2, 3, 5]
+    assert "worlds" in results[0] and "worlds" in results[-1]
+    assert results[1]["line"] == 2 and results[1]["error"].startswith("invalid JSON")
+    assert results[2]["error"] == "expected an object, got list"
+    assert results[3]["error"] == "expected an object, got int"
+
+
+PLAYERS = ["A", "B", "C", "D", "E", "F", "G"]
+CLAIMS = {
+    "A": {
+        "role": "Fortune Teller",
+        "night_results": [
+            {"night": 1, "ping": True, "player1": "B", "player2": "D"},
+            {"night": 2, "ping": True, "player1": "D", "player2": "E"},
+        ],
+    },
+    "B": {
+        "role": "Empath",
+        "night_results": [
+            {"night": 1, "num_evil": 1, "neighbor1": "A", "neighbor2": "C"}
+        ],
+    },
+    "D": {"role": "Soldier"},
+    "E": {"role": "Monk"},
+    "F": {"role": "Washerwoman", "seen_role": "Empath", "seen_players": ["B", "G"]},
+    "G": {
+        "role": "Undertaker",
+        "night_results": [
+            {"night": 2, "executed_player": "F", "seen_role": "Washerwoman"}
+        ],
+    },
+}
+# F is executed on day 1 and C dies on night 2, which may be a star-pass
+DEATHS = [
+    {"player": "F", "night": 1, "time": "day"},
+    {"player": "C", "night": 2, "time": "night"},
+]
+
+
+def test_dedupe_keeps_the_marginals():
+    worlds = generate_all_worlds(
+        PLAYERS, DEFAULT_TB_ROLES["Minion"], 1, CLAIMS, DEFAULT_TB_ROLES, 0, deaths=DEATHS
+    )
+    raw = deduction_pipeline(worlds, DEFAULT_TB_ROLES)
+    deduped = deduction_pipeline(worlds, DEFAULT_TB_ROLES, dedupe=True)
+
+    # Every kind of branch fired, and merging saved some worlds
+    assert any(w.poison_nights for w in raw)
+    assert any(w.red_herring for w in raw)
+    assert any(list(w.roles.values()).count("Imp") == 2 for w in raw)
+    assert len(deduped) < len(raw)
+    assert sum(w.multiplicity for w in deduped) == len(raw)
+
+    for expected, actual in zip(
+        compute_role_probs(raw, PLAYERS, DEFAULT_TB_ROLES),
+        compute_role_probs(deduped, PLAYERS, DEFAULT_TB_ROLES),
+    ):
+        assert actual == pytest.approx(expected)
@@ -0,0 +1,141 @@
+import pytest
+
+from deduction_engine import (
+    compute_role_probs,
+    deduction_pipeline,
+    default_role_counts,
+    generate_all_worlds,
+)
+from good_player_controller import GoodPlayerController
+from test_game import make_game
+
+
+def played_game(seed="service", nights=1):
+    """Return a seeded game after ``nights`` nights and the days between them."""
+    g = make_game(seed)
+    g.reseed(seed)
+    g.night_phase()
+    for _ in range(nights - 1):
+        g.day_phase()
+        g.night_phase()
+    return g
+
+
+def count_calls(monkeypatch, obj, name):
+    calls = []
+    method = getattr(obj, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return method(*args, **kwargs)
+
+    monkeypatch.setattr(obj, name, wrapper)
+    return calls
+
+
+def test_good_controller_reuses_beliefs_until_its_inputs_change(monkeypatch):
+    g = played_game()
+    g.day_phase()
+    good = [
+        p for p in g.players
+        if p.alive and isinstance(p.controller, GoodPlayerController)
+    ]
+    player, other = good[0], good[-1]
+    controller = player.controller
+    calls = count_calls(monkeypatch, g.deduction, "beliefs")
+
+    worlds, evil_prob, _ = controller._beliefs(g.get_player_view(player))
+    assert controller._beliefs(g.get_player_view(player))[0] is worlds
+    assert len(calls) == 1
+
+    # An update that changes none of the inputs only costs a fingerprint
+    controller.on_event(None)
+    assert controller._beliefs(g.get_player_view(player))[0] is worlds
+    assert len(calls) == 1
+
+    g.execute_player(other)
+    _, after_death, _ = controller._beliefs(g.get_player_view(player))
+    assert len(calls) == 2
+    assert after_death != evil_prob
+
+    player.remember("night_results", {"night": 2})
+    controller._beliefs(g.get_player_view(player))
+    assert len(calls) == 3
+    assert calls[-1][1]["night_results"][-1] == {"night": 2}
+
+
+def test_beliefs_are_cached_until_the_game_changes():
+    g = played_game()
+    service = g.deduction
+    first = service.beliefs("Player 1")
+    assert service.beliefs("Player 1") is first
+
+    g.day_phase()
+    assert service._public is None and not service._queries
+    after_day = service.beliefs("Player 1")
+    assert after_day is not first
+    assert [d["player"] for d in service._public[1]] == ["Player 4"]
+
+
+def test_forks_start_with_the_parent_cache_and_invalidate_alone():
+    g = played_game()
+    service = g.deduction
+    first = service.beliefs("Player 1")
+    fork = g.fork()
+    assert fork.deduction is not service and fork.deduction.game is fork
+    assert fork.deduction.beliefs("Player 1") is first
+
+    fork.execute_player(fork.players[1])
+    assert service.beliefs("Player 1") is first
+    assert service._deaths() == []
+    assert fork.deduction.beliefs("Player 1") is not first
+    assert [d["player"] for d in fork.deduction._deaths()] == ["Player 2"]
+
+    forked = fork.deduction.beliefs("Player 1")
+    g.execute_player(g.players[2])
+    assert fork.deduction.beliefs("Player 1") is forked
+    assert [d["player"] for d in service._deaths()] == ["Player 3"]
+
+
+def direct_probs(g, pov, pov_claim):
+    """Deduce from scratch for ``pov``, without the shared public world set."""
+    service = g.deduction
+    names = [p.name for p in g.players]
+    claims = service._claims()
+    claims[pov] = pov_claim
+    m_minions, outsider_count = default_role_counts(len(names))
+    worlds = generate_all_worlds(
+        names,
+        service.TB_ROLES["Minion"],
+        m_minions,
+        claims,
+        service.TB_ROLES,
+        outsider_count,
+        deaths=service._deaths(),
+        pov_player=pov,
+    )
+    deduced = deduction_pipeline(worlds, service.TB_ROLES, dedupe=True)
+    return compute_role_probs(deduced, names, service.TB_ROLES)
+
+
+def test_pov_beliefs_match_a_direct_deduction():
+    g = played_game(nights=2)
+    player = g.players[0]
+    private = player.controller._deduction_claims(g.get_player_view(player))
+    public = g.deduction._claims()
+    povs = [
+        # Public claim only: the public set is filtered
+        ("Player 6", public["Player 6"]),
+        # Same role with night info not shared yet: the pipeline is rerun
+        ("Player 1", private["Player 1"]),
+        # A different role: the worlds are regenerated
+        ("Player 5", {"role": "Saint"}),
+    ]
+    assert private["Player 1"] != public["Player 1"]
+
+    for pov, pov_claim in povs:
+        evil_prob, imp_prob = g.deduction.role_probs(pov, pov_claim)
+        expected_evil, expected_imp = direct_probs(g, pov, pov_claim)
+        assert evil_prob == pytest.approx(expected_evil)
+        assert imp_prob == pytest.approx(expected_imp)
+        assert evil_prob[pov] == 0
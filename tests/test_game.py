@@ -0,0 +1,371 @@
+import pickle
+
+import pytest
+
+import game
+from evil_player_controller import EvilPlayerController
+from good_player_controller import GoodPlayerController
+
+
+def make_game(seed="test", player_count=8, short_circuit_votes=True):
+    ai = game.DumbStorytellerAI(game.derive_rng(seed, "storyteller"))
+    roles = game.random_trouble_brewing_setup(
+        player_count, ai, game.derive_rng(seed, "setup")
+    )
+    g = game.Game(
+        [f"Player {i + 1}" for i in range(player_count)],
+        roles,
+        short_circuit_votes=short_circuit_votes,
+        seed=seed,
+    )
+    for p in g.players:
+        if p.role.alignment in (game.Alignment.MINION, game.Alignment.DEMON):
+            p.controller = EvilPlayerController()
+        else:
+            p.controller = GoodPlayerController()
+        p.controller.set_player(p)
+    return g
+
+
+def test_view_pins_snapshots_and_rejects_stale_reads():
+    g = make_game()
+    player = g.players[0]
+    view = g.get_player_view(player)
+    alive = view.alive_players
+
+    g.players[1].kill()
+    g.notify_state_change()
+
+    assert view.alive_players == alive  # pinned when first read
+    with pytest.raises(game.StaleViewError):
+        view.dead_players
+    assert 1 in g.get_player_view(player).dead_players
+
+
+def test_view_memory_rejects_reads_after_a_write():
+    g = make_game()
+    player = g.players[0]
+    view = g.get_player_view(player)
+    memory = view.memory
+    assert dict(memory) == dict(player.memory)
+
+    player.memory["note"] = 1
+    with pytest.raises(game.StaleViewError):
+        memory["note"]
+    assert g.get_player_view(player).memory["note"] == 1
+
+
+class FixedVoter(game.PlayerController):
+    def __init__(self, vote):
+        super().__init__()
+        self.vote = vote
+        self.asked = 0
+
+    def cast_vote(self, nominee, player_view):
+        self.asked += 1
+        return self.vote
+
+
+@pytest.mark.parametrize(
+    "count, remaining, required, leader, decided",
+    [
+        (0, 3, 4, 0, True),  # cannot reach the majority
+        (0, 4, 4, 0, False),
+        (3, 2, 4, 6, True),  # cannot tie the leader
+        (3, 3, 4, 6, False),
+        (5, 2, 4, 0, False),  # already on the block; later votes still count
+    ],
+)
+def test_vote_decided(count, remaining, required, leader, decided):
+    assert game.Game._vote_decided(count, remaining, required, leader) is decided
+
+
+def test_short_circuit_still_asks_dead_voters():
+    g = make_game()
+    for p in g.players:
+        p.controller = FixedVoter(p.seat == 7)
+        p.controller.set_player(p)
+    g.players[7].kill()
+    g.notify_state_change()
+
+    votes = g._collect_votes(g.players[0])
+
+    # Seat 7 votes second to last, after the nominee is already out of reach
+    assert votes == [g.players[7]]
+    assert g.players[7].has_used_dead_vote
+    # The nominee votes last and is skipped
+    assert g.players[0].controller.asked == 0
+
+
+def test_deduction_sees_announced_deaths_only():
+    g = make_game()
+    g.state.night = 1
+    g.execute_player(g.players[2])
+    g.state.log_event(game.EventKind.KILL, 3)  # not announced until dawn
+    g.state.log_event(game.EventKind.ABILITY, 5, 6, ("Slayer", True))
+    g.state.log_event(game.EventKind.ABILITY, 5, 7, ("Slayer", False))
+
+    assert g.deduction._deaths() == [
+        {"player": "Player 3", "night": 1, "time": "day"},
+        {"player": "Player 7", "night": 1, "time": "day"},
+    ]
+
+
+@pytest.mark.parametrize("seed", [f"worlds-{i}" for i in range(8)])
+def test_public_worlds_never_run_out(seed):
+    g = make_game(seed)
+    sizes = []
+    compute = g.deduction._public_worlds
+
+    def public_worlds():
+        result = compute()
+        sizes.append(len(result[3]))
+        return result
+
+    g.deduction._public_worlds = public_worlds
+    g.run(verbose=False)
+    evil_prob, _ = g.deduction.role_probs()
+
+    assert sizes and min(sizes) > 0
+    assert sum(evil_prob.values()) > 0
+
+
+def test_fork_is_isolated_from_the_parent():
+    g = make_game()
+    g.state.demon_bluffs = ["Chef", "Monk", "Saint"]
+    player = g.players[0]
+    player.remember("night_results", {"night": 1})
+    player.claim = {"role": "Empath", "night_results": player.memory["night_results"]}
+
+    fork = g.fork()
+    twin = fork.players[0]
+    fork.state.demon_bluffs.append("Mayor")
+    twin.remember("night_results", {"night": 2})
+    twin.claim["role"] = "Chef"
+    fork.players[1].kill()
+    fork.state.log_event(game.EventKind.CLAIM, 0, detail="Chef")
+
+    assert g.state.demon_bluffs == ["Chef", "Monk", "Saint"]
+    assert player.memory["night_results"] == [{"night": 1}]
+    assert player.claim == {"role": "Empath", "night_results": [{"night": 1}]}
+    assert g.players[1].alive
+    assert len(g.state.events) == len(fork.state.events) - 1
+    # The fork's claim still quotes the fork's own, growing memory list
+    assert twin.claim["night_results"] is twin.memory["night_results"]
+    assert len(twin.claim["night_results"]) == 2
+
+
+def test_remember_appends_in_place():
+    player = make_game().players[0]
+    player.remember("night_results", 1)
+    items = player.memory["night_results"]
+    player.remember("night_results", 2)
+    assert player.memory["night_results"] is items and items == [1, 2]
+
+
+def test_memory_survives_pickling():
+    player = make_game().players[0]
+    player.remember("night_results", 1)
+    copy = pickle.loads(pickle.dumps(player.memory))
+    assert isinstance(copy, game.PlayerMemory)
+    assert copy == player.memory and copy.version == player.memory.version
+
+
+class Recorder(GoodPlayerController):
+    def __init__(self):
+        super().__init__()
+        self.updates = []
+
+    def on_event(self, update):
+        super().on_event(update)
+        self.updates.append(update)
+
+    def take(self) -> list:
+        kinds = [getattr(u, "kind", "message") for u in self.updates]
+        self.updates.clear()
+        return kinds
+
+
+def test_every_belief_input_reaches_listeners():
+    g = make_game()
+    for p in g.players:
+        p.controller = Recorder()
+        p.controller.set_player(p)
+    g._refresh_listeners()
+    a, b = g.players[0].controller, g.players[1].controller
+
+    a.player.memory["info"] = {"pairs": 1}
+    assert a.take() == [game.EventKind.INFO] and b.take() == []
+    assert a.updates == [] and a._stale
+
+    a.player.remember("night_results", 1)
+    a.player.claim = {"role": "Empath", "night_results": a.player.memory["night_results"]}
+    a.take()
+    a.player.remember("night_results", 2)
+    assert a.take() == [game.EventKind.INFO, game.EventKind.CLAIM]
+    assert b.take() == [game.EventKind.CLAIM]
+
+    g.execute_player(g.players[2])
+    assert game.EventKind.EXECUTION in b.take()
+
+    a.send_info(b.player, {"bluffs": []})
+    assert b.take() == ["message"]
+
+
+def event_trace(g):
+    return [(e.kind, e.day, e.night, e.seat, e.target, e.detail) for e in g.state.events]
+
+
+def test_seeded_games_replay_exactly():
+    first, second = make_game("replay"), make_game("replay")
+    assert first.run(verbose=False) == second.run(verbose=False)
+    assert event_trace(first) == event_trace(second)
+
+
+def test_forks_replay_the_parent_unless_reseeded():
+    g = make_game("replay")
+    g.reseed("replay")
+    g.night_phase()
+    g.day_phase()
+    g.night_phase()
+    forks = [g.fork(), g.fork()]
+    reseeded = [g.fork(seed="other"), g.fork(seed="other")]
+
+    results = {copy.run(verbose=False) for copy in [g] + forks}
+    assert len(results) == 1
+    assert event_trace(g) == event_trace(forks[0]) == event_trace(forks[1])
+    assert reseeded[0].run(verbose=False) == reseeded[1].run(verbose=False)
+    assert event_trace(reseeded[0]) == event_trace(reseeded[1])
+
+
+class UnbatchedGood(GoodPlayerController):
+    supports_batch = False
+
+
+@pytest.mark.parametrize("seed", [f"batch-{i}" for i in range(3)])
+def test_batches_decide_like_one_player_at_a_time(seed):
+    batched = make_game(seed, short_circuit_votes=False)
+    single = make_game(seed, short_circuit_votes=False)
+    for p in single.players:
+        if isinstance(p.controller, GoodPlayerController):
+            p.controller = UnbatchedGood()
+            p.controller.set_player(p)
+
+    assert batched.run(verbose=False) == single.run(verbose=False)
+    assert event_trace(batched) == event_trace(single)
+
+
+class BatchRecorder(GoodPlayerController):
+    """Record, for every batched request, whether its view is the player's own."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def _record(self, requests):
+        self.batches.append(
+            [
+                (
+                    p.seat,
+                    pv.player_seat,
+                    pv.role_claim is p.claim,
+                    dict(pv.memory) == dict(p.memory),
+                )
+                for p, pv in requests
+            ]
+        )
+
+    def choose_nominees(self, candidates, requests):
+        self._record(requests)
+        return super().choose_nominees(candidates, requests)
+
+    def cast_votes(self, nominee, requests):
+        self._record(requests)
+        return super().cast_votes(nominee, requests)
+
+
+def test_batched_players_answer_from_their_own_view():
+    g = make_game("batch-0", short_circuit_votes=False)
+    for p in g.players:
+        if isinstance(p.controller, GoodPlayerController):
+            p.controller = BatchRecorder()
+            p.controller.set_player(p)
+    g.reseed("batch-0")
+    g.night_phase()
+    g.day_phase()
+
+    batches = [b for p in g.players for b in getattr(p.controller, "batches", [])]
+    assert any(len(batch) > 1 for batch in batches)
+    for batch in batches:
+        seats = [seat for seat, *_ in batch]
+        assert len(set(seats)) == len(seats)
+        for seat, view_seat, own_claim, own_memory in batch:
+            assert seat == view_seat and own_claim and own_memory
+            assert isinstance(g.players[seat].controller, BatchRecorder)
+
+
+def fixed_game(*role_names, seed="fixed"):
+    ai = game.DumbStorytellerAI(game.derive_rng(seed, "storyteller"))
+    roles = [game.create_role(name, ai) for name in role_names]
+    return game.Game([f"Player {i + 1}" for i in range(len(roles))], roles, seed=seed)
+
+
+def by_role(g, name):
+    return next(p for p in g.players if p.role.name == name)
+
+
+def seats_of(players):
+    return sum(1 << p.seat for p in players)
+
+
+def assert_indexes_match(g):
+    seats = g.state.seats
+    for name in {p.role.name for p in g.players} | set(seats.roles):
+        holders = [p for p in g.players if p.role.name == name]
+        assert seats.role_mask(name) == seats_of(holders)
+    for alignment in game.Alignment:
+        assert seats.alignment_mask(alignment) == seats_of(
+            p for p in g.players if p.role.alignment == alignment
+        )
+    assert seats.alive == seats_of(p for p in g.players if p.alive)
+    assert seats.living() == seats_of(g.get_alive_players())
+
+
+TABLE = ("Imp", "Scarlet Woman", "Poisoner", "Virgin", "Chef", "Empath", "Monk", "Soldier")
+
+
+def test_indexes_follow_a_star_pass():
+    g = fixed_game(*TABLE)
+    g.state.night = 2
+    imp, sw = by_role(g, "Imp"), by_role(g, "Scarlet Woman")
+    imp.role.storyteller_ai.resolve_demon_kill(imp, imp, g)
+
+    assert sw.role.name == "Imp"
+    assert g.state.seats.role_mask("Imp") == seats_of([imp, sw])
+    # The old Imp dies at dawn: still alive, no longer living
+    assert imp.alive and not g.is_player_alive(imp)
+    assert_indexes_match(g)
+
+
+def test_indexes_follow_a_scarlet_woman_promotion():
+    g = fixed_game(*TABLE)
+    imp, sw = by_role(g, "Imp"), by_role(g, "Scarlet Woman")
+    g.execute_player(imp)
+
+    assert sw.role.name == "Imp" and not imp.alive
+    assert g.state.seats.alignment_mask(game.Alignment.MINION) == seats_of(
+        [by_role(g, "Poisoner")]
+    )
+    assert g.check_win_conditions() is None
+    assert_indexes_match(g)
+
+
+def test_indexes_follow_a_virgin_execution():
+    g = fixed_game(*TABLE)
+    virgin, chef = by_role(g, "Virgin"), by_role(g, "Chef")
+    virgin.role.on_nominated(virgin, chef, g)
+
+    assert not chef.alive
+    assert chef.seat in g.state.events.deaths()
+    assert g.state.seats.role_mask("Chef") == seats_of([chef])  # dead, still the Chef
+    assert_indexes_match(g)
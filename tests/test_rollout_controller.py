@@ -0,0 +1,65 @@
+import random
+
+import game
+from evil_player_controller import EvilPlayerController
+from good_player_controller import GoodPlayerController
+from rollout_controller import _team, belief_worlds, determinize, sample_roles
+from test_game import make_game
+
+
+def played_to_night_two(seed="rollout"):
+    g = make_game(seed)
+    g.night_phase()
+    g.day_phase()
+    g.night_phase()
+    return g
+
+
+def draws(g, player, count=30):
+    view = g.get_player_view(player)
+    worlds = belief_worlds(view, player)
+    return [sample_roles(view, player, worlds, random.Random(i)) for i in range(count)]
+
+
+def test_good_searcher_draws_from_its_beliefs():
+    g = played_to_night_two()
+    searcher = next(p for p in g.players if _team(p.role.alignment) == "Good")
+    imps = {
+        seat
+        for roles, _ in draws(g, searcher)
+        for seat, entry in roles.items()
+        if entry is not None and entry[0] == "Imp"
+    }
+    assert searcher.seat not in imps
+    assert len(imps) > 1  # the true Imp is not simply read off
+
+
+def test_evil_searcher_keeps_its_team():
+    g = played_to_night_two()
+    searcher = next(p for p in g.players if p.role.alignment == game.Alignment.DEMON)
+    team = {info["seat"] for info in searcher.memory["evil_team"]} | {searcher.seat}
+    for roles, _ in draws(g, searcher):
+        assert {seat for seat, entry in roles.items() if entry is None} == team
+
+
+def test_determinize_gives_a_coherent_game():
+    g = played_to_night_two()
+    searcher = next(p for p in g.players if _team(p.role.alignment) == "Good")
+    truth = [p.role for p in g.players]
+    roles, red_herring = draws(g, searcher)[1]
+    fork = g.fork()
+    determinize(fork, roles, red_herring)
+
+    evil = {p.name for p in fork.players if _team(p.role.alignment) == "Evil"}
+    for p in fork.players:
+        if roles[p.seat] is not None:
+            assert p.role.name == roles[p.seat][0]
+        assert fork.state.seats.role_mask(p.role.name) >> p.seat & 1
+        if p.name in evil:
+            assert isinstance(p.controller, EvilPlayerController)
+            assert {info["name"] for info in p.memory["evil_team"]} == evil
+        else:
+            assert isinstance(p.controller, GoodPlayerController)
+            assert "evil_team" not in p.memory
+    assert [p.role for p in g.players] == truth
+    assert fork.run(verbose=False)
@@ -0,0 +1,70 @@
+from collections import namedtuple
+
+from seat_state import SeatFlags, SeatState, count_seats, iter_seats
+
+Role = namedtuple("Role", "name alignment")
+IMP = Role("Imp", "Demon")
+SW = Role("Scarlet Woman", "Minion")
+CHEF = Role("Chef", "Townsfolk")
+
+
+def test_iter_and_count_seats():
+    assert list(iter_seats(0b101001)) == [0, 3, 5]
+    assert count_seats(0b101001) == 3
+    assert list(iter_seats(0)) == []
+
+
+def test_pending_deaths_are_alive_but_not_living():
+    seats = SeatState(5)
+    seats.set("pending", 2)
+    assert seats.has("alive", 2)
+    assert list(iter_seats(seats.living())) == [0, 1, 3, 4]
+
+    # Dawn: pending deaths become real ones
+    seats.alive &= ~seats.pending
+    seats.dead |= seats.pending
+    seats.pending = 0
+    assert seats.living() == seats.alive
+    assert list(iter_seats(seats.dead)) == [2]
+
+
+def test_role_indexes_follow_moves():
+    seats = SeatState(3)
+    for seat, role in enumerate((IMP, SW, CHEF)):
+        seats.move_role(seat, None, role)
+
+    seats.move_role(1, SW, IMP)  # the Scarlet Woman takes over
+    assert seats.role_mask("Imp") == 0b011
+    assert seats.role_mask("Scarlet Woman") == 0
+    assert seats.alignment_mask("Demon") == 0b011
+    assert seats.alignment_mask("Minion") == 0
+    assert seats.alignment_mask("Demon", "Townsfolk") == 0b111
+
+
+def test_copies_are_independent():
+    seats = SeatState(3)
+    seats.move_role(0, None, IMP)
+    copy = seats.copy()
+    copy.set("poisoned", 1)
+    copy.set("alive", 2, False)
+    copy.move_role(0, IMP, CHEF)
+
+    assert seats.poisoned == 0 and seats.has("alive", 2)
+    assert seats.role_mask("Imp") == 0b001 and seats.role_mask("Chef") == 0
+    assert not seats.impaired(1) and copy.impaired(1)
+
+
+def test_seat_flags_view():
+    seats = SeatState(4)
+    players = {seat: f"P{seat}" for seat in range(6)}
+    poisoned = SeatFlags(seats, "poisoned", players)
+    poisoned.add(3)
+    poisoned.add(5)  # grows the table
+    assert seats.size == 6
+    assert 3 in poisoned and 2 not in poisoned and "P3" not in poisoned
+    assert list(poisoned) == ["P3", "P5"] and len(poisoned) == 2
+
+    poisoned.discard(3)
+    assert list(SeatFlags(seats, "poisoned")) == [5]
+    poisoned.clear()
+    assert not poisoned
@@ -0,0 +1,100 @@
+import os
+import random
+
+import pytest
+
+import sim_store
+from sim_store import COLUMNS, GROUPINGS, ROLE_TEAMS, SimStore
+from simulate_games import SimStats
+
+
+def make_records(count=60, seed=0):
+    rng = random.Random(seed)
+    names = sorted(ROLE_TEAMS)
+    records = []
+    for i in range(count):
+        players = rng.randint(5, 15)
+        records.append(
+            {
+                "seed": None if i % 7 == 0 else f"s:{i}",
+                "players": players,
+                "roles": rng.sample(names, players),
+                "winner": rng.choice(("Good", "Evil")),
+                "nights": rng.randint(1, 6),
+                "executions": rng.randint(0, 5),
+                "controller": rng.choice(("A/B", "C/D")),
+            }
+        )
+    return records
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SimStore(str(tmp_path / "store"))
+    store.append(make_records())
+    return store
+
+
+@pytest.mark.parametrize("by", GROUPINGS)
+def test_numpy_and_loop_aggregates_agree(store, by):
+    pytest.importorskip("numpy")
+    assert store._aggregate_numpy(by) == store._aggregate_loop(by)
+
+
+def test_loop_aggregate_matches_sim_stats(store, monkeypatch):
+    monkeypatch.setattr(sim_store, "np", None)
+    stats = SimStats()
+    for record in make_records():
+        stats.add_record(record)
+    (total,) = store.aggregate().values()
+    assert total["games"] == stats.games
+    assert total["teams"] == stats.team_results
+    assert total["roles"] == stats.role_results
+
+
+def crash_mid_append(store, seeds):
+    # A crash after the columns were written but before meta.json was
+    for name in ("roles.u8",) + tuple(f"{c}.u8" for c in COLUMNS):
+        with open(os.path.join(store.path, name), "ab") as f:
+            f.write(b"\x01" * 20)
+    with open(os.path.join(store.path, "seeds.txt"), "a", encoding="utf-8") as f:
+        f.write(seeds)
+
+
+def store_bytes(path):
+    contents = {}
+    for name in os.listdir(path):
+        with open(os.path.join(path, name), "rb") as f:
+            contents[name] = f.read()
+    return contents
+
+
+def test_reading_never_discards_rows(store):
+    crash_mid_append(store, "torn:1\n")
+    before = store_bytes(store.path)
+
+    reader = SimStore(store.path)
+    assert len(reader) == len(store)
+    assert reader.seeds() == [r["seed"] for r in make_records()]
+    assert store_bytes(store.path) == before
+
+
+@pytest.mark.parametrize("seeds", ["torn:1\ntorn:2\n", "torn:1\ntor", "tor"])
+def test_reopening_discards_uncommitted_rows(store, seeds):
+    committed = len(store)
+    crash_mid_append(store, seeds)
+
+    reopened = SimStore(store.path, repair=True)
+    assert len(reopened) == committed
+    extra = make_records(5, seed=1)
+    reopened.append(extra)
+
+    expected = make_records() + extra
+    assert reopened.seeds() == [r["seed"] for r in expected]
+    assert list(reopened.column("players")) == [r["players"] for r in expected]
+    stats = SimStats()
+    for record in expected:
+        stats.add_record(record)
+    (total,) = reopened.aggregate().values()
+    assert total["teams"] == stats.team_results
+    assert total["roles"] == stats.role_results
@@ -0,0 +1,177 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from good_player_controller import GoodPlayerController
+
+from simulate_games import (
+    MIN_SAMPLES,
+    PairedStats,
+    SimStats,
+    compare_controllers,
+    games_needed,
+    load_records,
+    main,
+    paired_difference,
+    play_game,
+    simulate_games,
+    rare_roles,
+    stratified_estimates,
+    widest_ci,
+)
+
+
+def write_lines(path, *lines):
+    path.write_bytes(b"".join(lines))
+    return path.read_bytes()
+
+
+def record(index):
+    return json.dumps({"index": index}).encode() + b"\n"
+
+
+def test_load_records_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "games.jsonl"
+    content = write_lines(path, record(0), record(1), b'{"ind')
+
+    assert load_records(str(path)) == [{"index": 0}, {"index": 1}]
+    assert path.read_bytes() == content  # reading never rewrites the file
+
+    assert load_records(str(path), repair=True) == [{"index": 0}, {"index": 1}]
+    assert path.read_bytes() == record(0) + record(1)
+
+
+def test_load_records_rejects_a_bad_line_mid_file(tmp_path):
+    path = tmp_path / "games.jsonl"
+    content = write_lines(path, record(0), b"garbage\n", record(2))
+
+    with pytest.raises(ValueError, match=":2:"):
+        load_records(str(path), repair=True)
+    assert path.read_bytes() == content
+
+
+def stats_with(games, roles):
+    stats = SimStats(games=games)
+    stats.team_results = {"Good": games // 2, "Evil": games - games // 2}
+    stats.role_results = {role: list(counts) for role, counts in roles.items()}
+    return stats
+
+
+def test_rare_roles_do_not_hold_up_the_stopping_rule():
+    stats = stats_with(1000, {"Chef": (200, 400), "Baron": (3, 5)})
+    assert rare_roles(stats) == ["Baron"]
+    assert widest_ci(stats) < 0.05
+    assert games_needed(stats, 0.05) < 1000
+
+    assert widest_ci(stats, min_share=0.001) == 1.0  # Baron has too few samples
+    assert widest_ci(stats_with(1000, {"Chef": (10, MIN_SAMPLES - 1)}), min_share=0) == 1.0
+
+
+def test_stratified_estimates_reweight_strata():
+    common = stats_with(10, {"Chef": (4, 8)})
+    rare = stats_with(4, {"Chef": (4, 4)})
+    rare.team_results = {"Good": 4, "Evil": 0}
+    teams, roles = stratified_estimates([(0.75, common), (0.25, rare)])
+
+    assert teams["Good"][0] == pytest.approx(0.75 * 0.5 + 0.25 * 1.0)
+    # Chef is in 0.8 and 1.0 seats per game and wins 0.4 and 1.0 games
+    assert roles["Chef"][0] == pytest.approx((0.75 * 0.4 + 0.25) / (0.75 * 0.8 + 0.25))
+
+
+def test_stratified_intervals_never_collapse():
+    strata = []
+    for _ in range(3):
+        st = stats_with(2, {"Chef": (2, 2)})
+        st.team_results = {"Good": 2, "Evil": 0}
+        strata.append((1 / 3, st))
+    teams, roles = stratified_estimates(strata)
+    assert teams["Good"][1] < 1 and roles["Chef"][1] < 1
+
+    strata[0] = (1 / 3, stats_with(1, {"Chef": (1, 1)}))
+    with pytest.raises(ValueError):
+        stratified_estimates(strata)
+
+
+def test_paired_difference_matches_the_per_game_differences():
+    pairs = [("Good", "Good"), ("Evil", "Good"), ("Good", "Evil"), ("Evil", "Good")]
+    whole, halves = PairedStats(), [PairedStats(), PairedStats()]
+    for i, (winner_a, winner_b) in enumerate(pairs):
+        whole.add_pair(["Chef", "Imp"], winner_a, winner_b)
+        halves[i % 2].add_pair(["Chef", "Imp"], winner_a, winner_b)
+    merged = PairedStats()
+    for half in halves:
+        merged.merge(half)
+    assert merged == whole
+    assert whole.team == whole.roles["Chef"] == [4, 1, 3, 3]
+    assert whole.roles["Imp"] == [4, -1, 3, 3]
+
+    d = [0, 1, -1, 1]
+    mean, lower, upper = paired_difference(whole.team, z=2)
+    sd = (sum((x - 0.25) ** 2 for x in d) / 3) ** 0.5
+    assert mean == pytest.approx(0.25)
+    assert upper - mean == pytest.approx(mean - lower) == pytest.approx(2 * sd / 2)
+    assert paired_difference([0, 0, 0, 0]) == (0, 0, 0)
+
+
+def test_identical_controllers_never_differ():
+    stats = compare_controllers(
+        4, GoodPlayerController, GoodPlayerController, player_count=7, seed="pair"
+    )
+    assert stats.team[0] == 4
+    assert stats.team[3] == 0
+    assert all(entry[3] == 0 for entry in stats.roles.values())
+
+
+def test_telemetry_times_the_whole_game_and_counts_enumerations():
+    telemetry = play_game("telemetry", 7, telemetry=True)["telemetry"]
+    assert telemetry["seconds"] >= sum(telemetry["nights"]) + sum(telemetry["days"])
+    # Every enumeration is made for a query, and queries only filter its worlds
+    assert 0 < len(telemetry["worlds"]) <= len(telemetry["pov_worlds"])
+    assert max(telemetry["pov_worlds"]) <= max(telemetry["worlds"])
+
+
+def test_parallel_runs_count_the_same_games():
+    serial = simulate_games(8, 5, seed="jobs", jobs=1)
+    parallel = simulate_games(8, 5, seed="jobs", jobs=3)
+    assert serial == parallel
+
+
+def test_records_do_not_depend_on_the_hash_seed():
+    script = (
+        "import json, simulate_games; "
+        "print(json.dumps([simulate_games.play_game(f'hash:{i}', 6) for i in range(3)]))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=root,
+            env={**os.environ, "PYTHONHASHSEED": hash_seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for hash_seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        ["--out", "games.jsonl"],
+        ["--store", "store"],
+        ["--telemetry"],
+        ["--precision", "0.02"],
+    ],
+)
+def test_compare_rejects_options_it_would_ignore(monkeypatch, capsys, extra):
+    controller = "good_player_controller:GoodPlayerController"
+    argv = ["simulate_games.py", "10", "--compare", controller, controller, *extra]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit):
+        main()
+    assert f"--compare does not support {extra[0]}" in capsys.readouterr().err
@@ -0,0 +1,72 @@
+import pickle
+
+import pytest
+
+from sweep import (
+    DEFAULT_EVIL,
+    DEFAULT_GOOD,
+    DEFAULT_STORYTELLER,
+    Component,
+    _tasks,
+    grid,
+    parse_players,
+    run_sweep,
+)
+
+
+def broken_storyteller(rng):
+    raise RuntimeError("no storyteller today")
+
+
+def test_component_parse():
+    plain = Component.parse(" game:DumbStorytellerAI ")
+    assert plain == Component("game:DumbStorytellerAI")
+    assert plain.label == "DumbStorytellerAI"
+
+    tuned = Component.parse("my_controllers:Cautious(threshold=0.6, name='a')")
+    assert tuned.params == (("name", "a"), ("threshold", 0.6))
+    assert tuned.label == "Cautious(name='a', threshold=0.6)"
+    assert pickle.loads(pickle.dumps(tuned)) == tuned
+
+    with pytest.raises(ValueError):
+        Component.parse("my_controllers:Cautious(0.6)")
+
+
+def test_parse_players():
+    assert parse_players(["5-7", "10", "6"]) == [5, 6, 7, 10]
+    assert parse_players(["9"]) == [9]
+
+
+def test_tasks_cover_every_game_of_every_cell_once():
+    cells = grid(
+        [5, 7],
+        [Component(DEFAULT_GOOD), Component(DEFAULT_GOOD + "(x=1)")],
+        [Component(DEFAULT_EVIL)],
+        [Component(DEFAULT_STORYTELLER)],
+    )
+    assert len(cells) == 4
+    tasks = _tasks(cells, 10, "s", jobs=1, chunk=3)
+
+    games = sorted((i, index) for i, _, _, indices in tasks for index in indices)
+    assert games == [(i, index) for i in range(4) for index in range(10)]
+    assert all(len(indices) <= 3 for *_, indices in tasks)
+    assert [cell.players for _, cell, _, _ in tasks] == sorted(
+        (cell.players for _, cell, _, _ in tasks), reverse=True
+    )
+
+
+def test_a_failing_cell_does_not_stop_the_sweep():
+    good, evil = Component(DEFAULT_GOOD), Component(DEFAULT_EVIL)
+    storytellers = [
+        Component("test_sweep:broken_storyteller"),
+        Component(DEFAULT_STORYTELLER),
+    ]
+    cells = grid([5], [good], [evil], storytellers)
+    results = run_sweep(cells, 2, seed="sweep")
+
+    stats, _, failures = results[cells[0]]
+    assert stats.games == 0
+    assert [index for index, _ in failures] == [0, 1]
+    assert "no storyteller today" in failures[0][1]
+    stats, _, failures = results[cells[1]]
+    assert stats.games == 2 and failures == []